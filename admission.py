@@ -0,0 +1,306 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+BACKGROUND = "background"
+
+# Lower sorts first: interactive queries are served before batch and background lookups
+PRIORITIES = {INTERACTIVE: 0, BATCH: 1, BACKGROUND: 2}
+
+# Longest a request of each priority may wait for its turn (seconds)
+DEFAULT_MAX_WAIT = {INTERACTIVE: 5.0, BATCH: 60.0, BACKGROUND: 2.0}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request won't be sent to the API in time (or at all)."""
+
+    def __init__(self, message, reason):
+        super().__init__(message)
+        self.reason = reason
+
+
+class _Waiter:
+    __slots__ = ("priority", "deadline", "enqueued", "rejected", "wake")
+
+    def __init__(self, priority, deadline, enqueued):
+        self.priority = priority
+        self.deadline = deadline
+        self.enqueued = enqueued
+        self.rejected = None
+        # Called (with the lock held) to wake a waiter on an event loop; threads use the condition
+        self.wake = None
+
+
+class AdmissionController:
+    """
+    Global rate limit for API calls: a token bucket with a bounded priority queue.
+
+    Tokens are added at `rate` per second, up to `burst`. A caller takes a
+    token at once if one is free and nobody is queued; otherwise it queues by
+    priority (interactive, then batch, then background; FIFO within one) and
+    the head of the queue takes the next token. A caller whose estimated wait
+    exceeds its priority's maximum is rejected at once instead of queueing,
+    and a full queue drops its lowest-priority waiter for a more important
+    newcomer. Rejections raise AdmissionRejected with a message for the user.
+
+    Threads wait with acquire() and coroutines with aacquire(), in the same
+    queue; a coroutine waits on its event loop without holding a thread.
+    """
+
+    def __init__(self, rate, burst=None, max_queue=100, max_wait=None, metrics=None):
+        """
+        Args:
+            rate (float): Requests per second let through on average
+            burst (float): Requests that may be sent at once after a quiet
+                period (default: same as rate, at least 1)
+            max_queue (int): Requests that may wait at once (default: 100)
+            max_wait (dict): Priority -> longest wait in seconds (default: DEFAULT_MAX_WAIT)
+            metrics (Metrics): Records "admission_wait" timings, rejections and the
+                "admission_queue_depth" gauge (default: None)
+        """
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else rate)
+        self.max_queue = max_queue
+        self.max_wait = dict(DEFAULT_MAX_WAIT, **(max_wait or {}))
+        self.metrics = metrics
+
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._queue = []  # heap of (priority rank, sequence, waiter)
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+
+        self.admitted = 0
+        self.peak_queued = 0
+        self.rejected = {}
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+        self._queue_changed()
+
+    def acquire(self, priority=INTERACTIVE):
+        """
+        Wait for permission to send one request.
+
+        Args:
+            priority (str): INTERACTIVE, BATCH or BACKGROUND
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            AdmissionRejected: If the request would wait too long, was dropped
+                from a full queue, or its wait ran past the priority's limit
+        """
+        with self._cond:
+            entry = self._enqueue(priority)
+            if entry is None:
+                return 0.0
+            try:
+                while True:
+                    admitted, seconds = self._poll(entry)
+                    if admitted:
+                        return seconds
+                    self._cond.wait(seconds)
+            finally:
+                self._notify()
+
+    async def aacquire(self, priority=INTERACTIVE):
+        """
+        Wait for permission to send one request without blocking the event loop.
+
+        Like acquire, but the wait happens on the running event loop. If the
+        awaiting task is cancelled while queued, it leaves the queue without
+        taking a token.
+
+        Args:
+            priority (str): INTERACTIVE, BATCH or BACKGROUND
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            AdmissionRejected: As for acquire
+        """
+        # Only async users pay for importing asyncio
+        import asyncio
+
+        with self._cond:
+            entry = self._enqueue(priority)
+            if entry is None:
+                return 0.0
+            loop = asyncio.get_running_loop()
+            wakeup = asyncio.Event()
+            entry[2].wake = lambda: loop.call_soon_threadsafe(wakeup.set)
+        try:
+            while True:
+                with self._cond:
+                    admitted, seconds = self._poll(entry)
+                    if admitted:
+                        return seconds
+                    wakeup.clear()
+                # A timer rather than wait_for, which can swallow a cancellation (Python < 3.12)
+                timer = loop.call_later(seconds, wakeup.set)
+                try:
+                    await wakeup.wait()
+                finally:
+                    timer.cancel()
+        except asyncio.CancelledError:
+            with self._cond:
+                if entry in self._queue:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                    self._queue_changed()
+            raise
+        finally:
+            with self._cond:
+                self._notify()
+
+    def _enqueue(self, priority):
+        """
+        Take a token at once if possible, otherwise queue (call with the lock held).
+
+        Returns:
+            tuple: The queue entry to wait with, or None if the request was admitted
+
+        Raises:
+            AdmissionRejected: If the request would wait too long or the queue is full
+        """
+        rank = PRIORITIES[priority]
+        max_wait = self.max_wait[priority]
+        now = time.monotonic()
+        self._refill(now)
+        if not self._queue and self._tokens >= 1:
+            self._tokens -= 1
+            self._admit(0.0)
+            return None
+
+        # Requests queued ahead of this one, plus itself, minus tokens already there
+        ahead = sum(1 for entry in self._queue if entry[0] <= rank)
+        estimate = max(0.0, (ahead + 1 - self._tokens) / self.rate)
+        if estimate > max_wait:
+            self._reject("over_deadline", priority)
+            raise AdmissionRejected(
+                f"The forecast service is busy: {priority} requests would wait about {estimate:.1f}s "
+                f"(limit {max_wait:g}s). Please try again shortly.", "over_deadline")
+
+        if len(self._queue) >= self.max_queue:
+            worst = max(self._queue)
+            if worst[0] <= rank:
+                self._reject("queue_full", priority)
+                raise AdmissionRejected(
+                    f"The forecast service is busy: {len(self._queue)} requests are already queued. "
+                    "Please try again shortly.", "queue_full")
+            # Make room by dropping the least important, most recent waiter
+            self._queue.remove(worst)
+            heapq.heapify(self._queue)
+            worst[2].rejected = "preempted"
+            self._notify(worst[2])
+
+        waiter = _Waiter(priority, now + max_wait, now)
+        entry = (rank, next(self._sequence), waiter)
+        heapq.heappush(self._queue, entry)
+        self._queue_changed()
+        return entry
+
+    def _poll(self, entry):
+        """
+        Admit a queued request if it is its turn (call with the lock held).
+
+        Returns:
+            tuple: (True, seconds waited) if admitted, otherwise
+                   (False, seconds to wait before polling again)
+
+        Raises:
+            AdmissionRejected: If the request was dropped from the queue or its
+                wait ran past the priority's limit
+        """
+        waiter = entry[2]
+        if waiter.rejected:
+            self._reject(waiter.rejected, waiter.priority)
+            raise AdmissionRejected(
+                "The forecast service is busy with more urgent requests. Please try again shortly.",
+                waiter.rejected)
+
+        now = time.monotonic()
+        self._refill(now)
+        if self._queue[0] is entry and self._tokens >= 1:
+            heapq.heappop(self._queue)
+            self._tokens -= 1
+            self._queue_changed()
+            wait = now - waiter.enqueued
+            self._admit(wait)
+            return True, wait
+
+        if now >= waiter.deadline:
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+            self._queue_changed()
+            self._reject("timeout", waiter.priority)
+            raise AdmissionRejected(
+                f"The forecast service is busy: no slot within {self.max_wait[waiter.priority]:g}s. "
+                "Please try again shortly.", "timeout")
+
+        timeout = waiter.deadline - now
+        if self._queue[0] is entry:
+            timeout = min(timeout, (1 - self._tokens) / self.rate)
+        return False, timeout
+
+    def _notify(self, *dropped):
+        """Wake all waiters (call with the lock held), including `dropped` ones no longer queued."""
+        self._cond.notify_all()
+        for waiter in dropped + tuple(entry[2] for entry in self._queue):
+            if waiter.wake is not None:
+                waiter.wake()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _admit(self, wait):
+        self.admitted += 1
+        self.total_wait += wait
+        self.max_wait_seen = max(self.max_wait_seen, wait)
+        if self.metrics is not None:
+            self.metrics.observe("admission_wait", wait)
+
+    def _reject(self, reason, priority):
+        key = f"{priority}_{reason}"
+        self.rejected[key] = self.rejected.get(key, 0) + 1
+        if self.metrics is not None:
+            self.metrics.increment("admission_rejections")
+
+    def _queue_changed(self):
+        self.peak_queued = max(self.peak_queued, len(self._queue))
+        if self.metrics is not None:
+            self.metrics.set_gauge("admission_queue_depth", len(self._queue))
+
+    def queue_depth(self):
+        """Number of requests waiting, by priority."""
+        with self._cond:
+            depth = {priority: 0 for priority in PRIORITIES}
+            for _, _, waiter in self._queue:
+                depth[waiter.priority] += 1
+            return depth
+
+    def stats(self):
+        """Return limiter counters as a dict."""
+        queued = self.queue_depth()
+        with self._cond:
+            self._refill(time.monotonic())
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2),
+                "queued": sum(queued.values()),
+                "queued_by_priority": queued,
+                "peak_queued": self.peak_queued,
+                "max_queue": self.max_queue,
+                "admitted": self.admitted,
+                "rejected": dict(self.rejected),
+                "mean_wait": round(self.total_wait / self.admitted, 4) if self.admitted else 0.0,
+                "max_wait": round(self.max_wait_seen, 4),
+            }
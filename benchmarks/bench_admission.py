@@ -0,0 +1,216 @@
+"""
+Drive interactive, batch and background forecast calls at the same time
+against a rate-limited stub API, with and without the assistant's admission
+control, and report upstream 429s, answers by source and latency per priority.
+
+With the limiter on, the run fails (exit status 1) if the stub answered any
+request with 429 or an interactive call got anything but API data. A last
+check rejects the circuit breaker's half-open trial request at admission and
+fails unless the breaker still closes once the API is back, and that a
+rejected request admitted before the circuit opened doesn't give back
+another caller's trial.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_admission --api-limit 20 --duration 10
+"""
+import argparse
+import contextlib
+import io
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from admission import BACKGROUND, BATCH, INTERACTIVE, PRIORITIES
+from benchmarks.mock_forecast_server import start_server
+from benchmarks.utils import percentile
+from circuit_breaker import CircuitBreaker
+from inventory_assistant import InventoryAssistant
+
+
+def outcome(response):
+    """How a call was answered: "api", "stale", "mock" or "rejected"."""
+    if "error" in response:
+        return "rejected"
+    if response.get("Stale"):
+        return "stale"
+    if "mock data" in response.get("Note", ""):
+        return "mock"
+    return "api"
+
+
+def run_load(assistant, args):
+    """
+    Run the mixed load for --duration seconds.
+
+    Interactive and background calls arrive open loop (Poisson, at their
+    rates); batch calls come from --batch-workers threads working through a
+    catalog back to back, like a portfolio scan.
+
+    Returns:
+        dict: Priority -> list of (latency, outcome), and "messages": rejection messages
+    """
+    results = {priority: [] for priority in PRIORITIES}
+    messages = []
+    lock = threading.Lock()
+    stop = threading.Event()
+    counter = iter(range(10 ** 9))
+
+    def call(priority):
+        # A new product every call, so every call is a cache miss
+        product_id = f"{priority[0].upper()}{next(counter):06d}"
+        start = time.perf_counter()
+        response = assistant.call_api(product_id, args.days, priority)
+        with lock:
+            results[priority].append((time.perf_counter() - start, outcome(response)))
+            if "error" in response:
+                messages.append(response["error"])
+
+    def batch_worker():
+        while not stop.is_set():
+            call(BATCH)
+
+    def arrivals(priority, rate, executor, seed):
+        rng = random.Random(seed)
+        next_due = time.perf_counter()
+        while not stop.is_set():
+            next_due += rng.expovariate(rate)
+            delay = next_due - time.perf_counter()
+            if delay > 0 and stop.wait(delay):
+                break
+            executor.submit(call, priority)
+
+    with ThreadPoolExecutor(max_workers=64) as executor:
+        threads = [threading.Thread(target=batch_worker) for _ in range(args.batch_workers)]
+        threads.append(threading.Thread(target=arrivals, args=(INTERACTIVE, args.interactive_rate, executor, 1)))
+        threads.append(threading.Thread(target=arrivals, args=(BACKGROUND, args.background_rate, executor, 2)))
+        for thread in threads:
+            thread.start()
+        time.sleep(args.duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return dict(results, messages=messages)
+
+
+def report(results):
+    print(f"    {'priority':<12}{'calls':>7}{'api':>7}{'mock':>7}{'stale':>7}{'rejected':>9}"
+          f"{'p50 ms':>9}{'p99 ms':>9}")
+    for priority in PRIORITIES:
+        calls = results[priority]
+        outcomes = [result for _, result in calls]
+        latencies = [latency for latency, _ in calls]
+        counts = [outcomes.count(kind) for kind in ("api", "mock", "stale", "rejected")]
+        print(f"    {priority:<12}{len(calls):>7}" + "".join(f"{count:>7}" for count in counts[:3])
+              + f"{counts[3]:>9}{percentile(latencies, 50) * 1000:>9.0f}{percentile(latencies, 99) * 1000:>9.0f}")
+
+
+def check_breaker_recovery():
+    """
+    Open the breaker, have its half-open trial rejected by the rate limit, then
+    bring the API back: the next call must reach the API and close the breaker.
+
+    Returns:
+        list: Failure messages (empty if the check passed)
+    """
+    server, url = start_server()
+    assistant = InventoryAssistant(api_url=url, cache_max_entries=0, max_retries=0, breaker_failure_threshold=1,
+                                   breaker_reset_timeout=0.2, rate_limit=1, rate_burst=1,
+                                   admission_max_wait={INTERACTIVE: 0.1})
+    failures = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        server.error_rate = 1.0
+        assistant.call_api("P001")  # 503 opens the circuit and uses the only token
+        time.sleep(0.3)  # past the breaker cool-down, still ~0.7 s short of the next token
+        trial = assistant.call_api("P002")
+        server.error_rate = 0.0
+        if outcome(trial) != "rejected":
+            failures.append(f"the half-open trial was not rejected at admission ({outcome(trial)})")
+        time.sleep(1.0)  # the API is back and a token is free
+        recovered = assistant.call_api("P003")
+    state = assistant.breaker.stats()["state"]
+    if outcome(recovered) != "api" or state != "closed":
+        failures.append(f"breaker did not recover after an admission rejection: "
+                        f"state {state}, answer from {outcome(recovered)}")
+    assistant.close()
+    server.shutdown()
+    return failures
+
+
+def check_trial_ownership():
+    """
+    A request let through while the circuit was closed and rejected at admission
+    after it opened must not give back the half-open trial another caller holds.
+
+    Returns:
+        list: Failure messages (empty if the check passed)
+    """
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    queued = breaker.allow_request()  # closed: waits for admission from here on
+    breaker.record_failure()  # another request fails and opens the circuit
+    trial = breaker.allow_request()
+    breaker.release_trial(queued)  # the queued request is rejected at admission
+    if breaker.allow_request():
+        return ["a rejected request released the half-open trial of another caller"]
+    breaker.release_trial(trial)
+    if not breaker.allow_request():
+        return ["the trial's own caller could not release it"]
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--api-limit", type=float, default=20, help="requests per second the stub allows")
+    parser.add_argument("--rate-limit", type=float, help="assistant rate limit (default: 90%% of --api-limit)")
+    parser.add_argument("--duration", type=float, default=10, help="seconds of load per run")
+    parser.add_argument("--interactive-rate", type=float, default=6, help="interactive calls per second")
+    parser.add_argument("--background-rate", type=float, default=4, help="background calls per second")
+    parser.add_argument("--batch-workers", type=int, default=16, help="threads making batch calls back to back")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--latency", type=float, default=0.02, help="stub server delay per request")
+    args = parser.parse_args()
+    rate_limit = args.rate_limit or args.api_limit * 0.9
+
+    print(f"Stub allows {args.api_limit:g} req/s; load: {args.interactive_rate:g}/s interactive, "
+          f"{args.background_rate:g}/s background, {args.batch_workers} batch workers, {args.duration:g}s\n")
+    failures = []
+    for label, limit in (("no admission control", None), (f"rate_limit={rate_limit:g}/s", rate_limit)):
+        server, url = start_server(latency=args.latency, rate_limit=args.api_limit)
+        assistant = InventoryAssistant(api_url=url, cache_max_entries=0, pool_size=64, max_retries=0,
+                                       enable_metrics=True, rate_limit=limit)
+        # Keep the assistant's "API connection error" messages out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = run_load(assistant, args)
+
+        print(f"  {label}: {server.request_count} upstream requests, {server.throttled_count} answered 429")
+        report(results)
+        if assistant.admission is not None:
+            stats = assistant.admission.stats()
+            wait = assistant.metrics.to_dict()["stages"].get("admission_wait", {})
+            print(f"    admission: {stats['admitted']} admitted, peak queue {stats['peak_queued']}, "
+                  f"mean wait {stats['mean_wait'] * 1000:.0f} ms (p99 <= {(wait.get('p99') or 0) * 1000:g} ms), "
+                  f"rejected {stats['rejected'] or 0}")
+            if results["messages"]:
+                print(f"    e.g. \"{results['messages'][0]}\"")
+            if server.throttled_count:
+                failures.append(f"{server.throttled_count} requests got 429 with the rate limit on")
+            not_api = [result for _, result in results[INTERACTIVE] if result != "api"]
+            if not_api:
+                failures.append(f"{len(not_api)} interactive calls were not answered from the API")
+        assistant.close()
+        server.shutdown()
+        print()
+
+    failures.extend(check_breaker_recovery())
+    failures.extend(check_trial_ownership())
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK: no 429s with the rate limit on, interactive answers from the API, breaker recovers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compare the synchronous InventoryAssistant with AsyncInventoryAssistant on a
+batch of queries against the local mock forecast server.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_async --queries 200 --latency 0.05
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.mock_forecast_server import start_server
+from inventory_assistant import InventoryAssistant
+from inventory_assistant_async import AsyncInventoryAssistant
+
+
+def make_queries(count):
+    # Distinct products so that every query reaches the server
+    return [f"What's the forecast for P{i:05d} for the next 30 days?" for i in range(count)]
+
+
+def run_sync(url, queries):
+    assistant = InventoryAssistant(api_url=url, cache_max_entries=0)
+    for query in queries:
+        assistant.handle_query(query)
+
+
+async def run_async(url, queries, concurrency):
+    async with AsyncInventoryAssistant(api_url=url, max_concurrency=concurrency, cache_max_entries=0) as assistant:
+        await asyncio.gather(*(assistant.ahandle_query(query) for query in queries))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub server delay per request")
+    parser.add_argument("--concurrency", type=int, default=100, help="async in-flight request limit")
+    args = parser.parse_args()
+
+    server, url = start_server(latency=args.latency)
+    queries = make_queries(args.queries)
+
+    print(f"{args.queries} queries, {args.latency * 1000:.0f} ms server latency\n")
+
+    start = time.perf_counter()
+    run_sync(url, queries)
+    sync_elapsed = time.perf_counter() - start
+    print(f"sync  handle_query:  {sync_elapsed:7.2f} s  ({args.queries / sync_elapsed:8.1f} queries/s)")
+
+    start = time.perf_counter()
+    asyncio.run(run_async(url, queries, args.concurrency))
+    async_elapsed = time.perf_counter() - start
+    print(f"async ahandle_query: {async_elapsed:7.2f} s  ({args.queries / async_elapsed:8.1f} queries/s)"
+          f"  concurrency={args.concurrency}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Show request coalescing: many threads (and coroutines) asking for the same
+product and horizon at once against a slow local stub cause one upstream
+request.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_coalescing --callers 50 --latency 0.5
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from benchmarks.mock_forecast_server import start_server
+from inventory_assistant import InventoryAssistant
+from inventory_assistant_async import AsyncInventoryAssistant
+
+
+def run_threads(url, callers, product_id, days):
+    assistant = InventoryAssistant(api_url=url, cache_max_entries=0)
+    barrier = threading.Barrier(callers)
+    results = [None] * callers
+
+    def caller(index):
+        barrier.wait()
+        results[index] = assistant.call_api(product_id, days)
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(result is results[0] for result in results), "callers got different responses"
+    return assistant.in_flight.stats()
+
+
+async def run_coroutines(url, callers, product_id, days):
+    async with AsyncInventoryAssistant(api_url=url, cache_max_entries=0) as assistant:
+        results = await asyncio.gather(*(assistant.acall_api(product_id, days) for _ in range(callers)))
+        assert all(result is results[0] for result in results), "callers got different responses"
+        return assistant.ain_flight.stats()
+
+
+def report(label, server, before, stats, elapsed):
+    upstream = server.request_count - before
+    print(f"{label}: {stats['calls']} calls, {stats['coalesced']} coalesced, "
+          f"{upstream} upstream request(s), {elapsed:.2f} s")
+    assert upstream == 1, f"expected one upstream request, got {upstream}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--callers", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.5, help="stub server delay per request")
+    args = parser.parse_args()
+
+    server, url = start_server(latency=args.latency)
+
+    before = server.request_count
+    start = time.perf_counter()
+    stats = run_threads(url, args.callers, "P001", 30)
+    report("threads   ", server, before, stats, time.perf_counter() - start)
+
+    before = server.request_count
+    start = time.perf_counter()
+    stats = asyncio.run(run_coroutines(url, args.callers, "P002", 30))
+    report("coroutines", server, before, stats, time.perf_counter() - start)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Compare memory use and access times of the API's dict forecast layout with
+CompactForecast (start date plus typed arrays) for long horizons.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_compact_forecast --products 2000 --days 365
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from compact_forecast import CompactForecast
+from forecast_cache import slice_response
+from forecast_result import render_response_markdown
+from mock_forecast import MockForecastGenerator
+
+
+def retained_bytes(build):
+    """Bytes still allocated after build() returns, with its result kept alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] - before, result
+    finally:
+        tracemalloc.stop()
+
+
+def build_dicts(generator, product_ids, days, chunk=500):
+    forecasts = []
+    for i in range(0, len(product_ids), chunk):
+        responses = generator.generate_many(product_ids[i:i + chunk], days)
+        forecasts.extend(response["Forecast"] for response in responses.values())
+    return forecasts
+
+
+def build_compact(generator, product_ids, days, chunk=500):
+    # Converted at ingest from the dict layout, like InventoryAssistant does with API responses
+    forecasts = []
+    for i in range(0, len(product_ids), chunk):
+        responses = generator.generate_many(product_ids[i:i + chunk], days)
+        forecasts.extend(CompactForecast.from_dict(response["Forecast"]) for response in responses.values())
+    return forecasts
+
+
+def timed(func, items, repeat=3):
+    """Best time per item over `repeat` runs, in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--extrapolate", type=int, default=50000, help="report memory for this many SKUs too")
+    args = parser.parse_args()
+
+    generator = MockForecastGenerator(seed=1)
+    product_ids = [f"SKU{i:06d}" for i in range(args.products)]
+
+    dict_bytes, dicts = retained_bytes(lambda: build_dicts(generator, product_ids, args.days))
+    compact_bytes, compacts = retained_bytes(lambda: build_compact(generator, product_ids, args.days))
+    assert all(c == d for c, d in zip(compacts[:50], dicts[:50]))
+
+    print(f"{args.products} products x {args.days} days")
+    for label, total in (("dict layout", dict_bytes), ("CompactForecast", compact_bytes)):
+        per_product = total / args.products
+        print(f"  {label:<16} {total / 2 ** 20:8.1f} MiB  {per_product / 1024:7.1f} KiB/product  "
+              f"~{per_product * args.extrapolate / 2 ** 30:6.2f} GiB for {args.extrapolate} products")
+    print(f"  {dict_bytes / compact_bytes:.1f}x smaller\n")
+
+    sample = list(range(min(200, args.products)))
+    dict_responses = [{"Current Stock": 500, "Reorder Point": 450, "Forecast": dicts[i]} for i in sample]
+    compact_responses = [{"Current Stock": 500, "Reorder Point": 450, "Forecast": compacts[i]} for i in sample]
+    middle = dicts[0] and sorted(dicts[0])[args.days // 2]
+
+    print(f"{'per forecast (us)':<28}{'dict':>10}{'compact':>10}")
+    rows = [
+        ("render markdown", render_response_markdown),
+        ("slice to 7 days", lambda response: slice_response(response, 7)),
+        ("look up one date", lambda response: response["Forecast"][middle]),
+        ("total demand", lambda response: sum(info["forecast"] for info in response["Forecast"].values())
+         if isinstance(response["Forecast"], dict) else response["Forecast"].total()),
+    ]
+    for label, func in rows:
+        print(f"  {label:<26}{timed(func, dict_responses):10.1f}{timed(func, compact_responses):10.1f}")
+
+    convert = timed(CompactForecast.from_dict, [dicts[i] for i in sample])
+    print(f"\n  one-time conversion at ingest: {convert:.1f} us per forecast")
+
+
+if __name__ == "__main__":
+    main()
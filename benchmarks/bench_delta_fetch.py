@@ -0,0 +1,136 @@
+"""
+Replay a generated query log over several simulated days and count the
+forecast days requested from the API with and without the delta-fetch
+timeline, then confirm the counts end to end against the local stub.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_delta_fetch --days 14 --queries-per-day 500
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks.mock_forecast_server import start_server
+from forecast_timeline import ForecastTimeline
+from inventory_assistant import InventoryAssistant
+from mock_forecast import MockForecastGenerator
+
+# Query mixes: weights of week / month / quarter horizons
+MIXES = {
+    "week-heavy": {7: 0.7, 30: 0.2, 90: 0.1},
+    "mixed": {7: 0.4, 30: 0.4, 90: 0.2},
+    "quarter-heavy": {7: 0.1, 30: 0.3, 90: 0.6},
+}
+
+
+def make_log(days, queries_per_day, products, mix, seed=0):
+    """
+    Generate a query log.
+
+    Returns:
+        list: (day offset, seconds into the day, product_id, horizon) tuples, in time order
+    """
+    rng = random.Random(seed)
+    # Zipf-like popularity: product i is asked about with weight 1 / (i + 1)
+    product_ids = [f"P{i:04d}" for i in range(products)]
+    weights = [1 / (i + 1) for i in range(products)]
+    horizons, horizon_weights = zip(*mix.items())
+    log = []
+    for day in range(days):
+        # Office hours, 8:00 to 18:00
+        times = sorted(rng.uniform(8 * 3600, 18 * 3600) for _ in range(queries_per_day))
+        for seconds in times:
+            log.append((day, seconds, rng.choices(product_ids, weights)[0], rng.choices(horizons, horizon_weights)[0]))
+    return log
+
+
+def replay(log, args, delta, partial):
+    """
+    Replay the log against a timeline with simulated dates and clock.
+
+    In every mode an answer cache sits in front, like ForecastCache: an answer
+    is reused for --ttl seconds, also for shorter horizons of the same product.
+    Without delta, every cache miss fetches the full window.
+
+    Returns:
+        tuple: (API requests, forecast days requested from the API)
+    """
+    generator = MockForecastGenerator()
+    timeline = ForecastTimeline(day_ttl=args.day_ttl, summary_ttl=args.ttl)
+    first_day = date.today()
+    cached = {}
+    requests = fetched = 0
+    for day, seconds, product_id, horizon in log:
+        today = first_day + timedelta(days=day)
+        now = day * 86400 + seconds
+        answers = cached.setdefault(product_id, {})
+        if any(h >= horizon and now - t < args.ttl for h, t in answers.items()):
+            continue
+        answers[horizon] = now
+
+        if not delta:
+            requests += 1
+            fetched += horizon
+            continue
+        planned = timeline.plan(product_id, horizon, partial=partial, today=today, now=now)
+        if planned is None:
+            continue
+        start, count = planned
+        timeline.merge(product_id, generator.generate(product_id, count, start=start), fetched_at=now, today=today)
+        requests += 1
+        fetched += count
+    return requests, fetched
+
+
+def run_live(url, server, log, delta, partial):
+    """Replay the first simulated day through the assistant against the stub server."""
+    assistant = InventoryAssistant(api_url=url, delta_fetch=delta, api_supports_start_date=partial,
+                                   enable_metrics=True)
+    before_requests, before_days = server.request_count, server.days_served
+    start = time.perf_counter()
+    for day, seconds, product_id, horizon in log:
+        if day == 0:
+            assistant.call_api(product_id, horizon)
+    elapsed = time.perf_counter() - start
+    assistant.close()
+    return server.request_count - before_requests, server.days_served - before_days, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=14, help="simulated days to replay")
+    parser.add_argument("--queries-per-day", type=int, default=500)
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--ttl", type=float, default=300, help="answer cache / stock numbers TTL in seconds")
+    parser.add_argument("--day-ttl", type=float, default=6 * 3600, help="forecast day TTL in seconds")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub server delay per request")
+    args = parser.parse_args()
+
+    modes = (("full window", False, False), ("delta, days only", True, False), ("delta, start_date", True, True))
+
+    print(f"{args.days} simulated days, {args.queries_per_day} queries/day, {args.products} products\n")
+    for name, mix in MIXES.items():
+        log = make_log(args.days, args.queries_per_day, args.products, mix)
+        print(f"{name} ({', '.join(f'{h}d {w:.0%}' for h, w in mix.items())}):")
+        baseline = None
+        for label, delta, partial in modes:
+            requests, fetched = replay(log, args, delta, partial)
+            baseline = baseline or fetched
+            print(f"  {label:<18} {requests:>6} requests  {fetched:>8} forecast days  "
+                  f"({1 - fetched / baseline:.0%} saved)")
+        print()
+
+    # Same-day check through InventoryAssistant; the stub only honours start_date when told to
+    log = make_log(1, args.queries_per_day, args.products, MIXES["mixed"])
+    print("End to end, first day of the 'mixed' log against the stub server:")
+    for label, delta, partial in modes:
+        server, url = start_server(latency=args.latency, supports_start_date=partial)
+        requests, days_served, elapsed = run_live(url, server, log, delta, partial)
+        server.shutdown()
+        print(f"  {label:<18} {requests:>6} requests  {days_served:>8} forecast days  {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
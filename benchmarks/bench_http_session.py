@@ -0,0 +1,66 @@
+"""
+Compare per-request latency of one-off requests.post calls against the pooled
+keep-alive session used by InventoryAssistant.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_http_session --requests 500
+"""
+import argparse
+import statistics
+import time
+
+import requests
+
+from benchmarks.mock_forecast_server import start_server
+from benchmarks.utils import percentile
+from inventory_assistant import InventoryAssistant
+
+
+def report(label, samples):
+    print(f"{label:<22} p50={percentile(samples, 50) * 1000:7.2f} ms  "
+          f"p99={percentile(samples, 99) * 1000:7.2f} ms  "
+          f"mean={statistics.mean(samples) * 1000:7.2f} ms")
+
+
+def time_requests(send, count):
+    samples = []
+    for i in range(count):
+        start = time.perf_counter()
+        send({"product_id": f"P{i % 50:03d}", "days": 7})
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--url", help="benchmark an existing endpoint instead of the local stub")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub server delay per request")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        server, url = start_server(latency=args.latency)
+
+    def one_off(payload):
+        response = requests.post(url, json=payload, timeout=5)
+        response.raise_for_status()
+        return response.json()
+
+    assistant = InventoryAssistant(api_url=url, cache_max_entries=0)
+
+    def pooled(payload):
+        return assistant.post_forecast(payload).json()
+
+    print(f"Benchmarking {args.requests} requests against {url}\n")
+    report("requests.post (before)", time_requests(one_off, args.requests))
+    report("pooled session (after)", time_requests(pooled, args.requests))
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Overhead of the assistant's instrumentation: cached handle_query calls with
+metrics disabled and enabled, and a sample of the exported metrics.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_metrics --queries 50000
+"""
+import argparse
+import time
+
+from benchmarks.mock_forecast_server import start_server
+from inventory_assistant import InventoryAssistant
+
+
+def run(url, queries, enable_metrics):
+    assistant = InventoryAssistant(api_url=url, enable_metrics=enable_metrics)
+    assistant.handle_query("forecast for P001 next week")  # fill the cache
+    start = time.perf_counter()
+    for i in range(queries):
+        assistant.handle_query("forecast for P001 next week")
+    return (time.perf_counter() - start) / queries, assistant
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=50000)
+    args = parser.parse_args()
+
+    server, url = start_server()
+    disabled, _ = run(url, args.queries, False)
+    enabled, assistant = run(url, args.queries, True)
+    server.shutdown()
+
+    print(f"cached handle_query, metrics disabled: {disabled * 1e6:7.2f} us/query")
+    print(f"cached handle_query, metrics enabled:  {enabled * 1e6:7.2f} us/query "
+          f"(+{(enabled - disabled) * 1e6:.2f} us)\n")
+    print(assistant.metrics.to_prometheus()[:1200])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compare the original per-day mock data loop with MockForecastGenerator for
+90- and 365-day horizons, one product at a time and in bulk.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_mock_forecast --products 2000
+"""
+import argparse
+import time
+
+from mock_forecast import MockForecastGenerator
+
+
+def legacy_mock_data(product_id, days=7):
+    # Original InventoryAssistant.get_mock_data
+    import random
+    from datetime import date, timedelta
+
+    today = date.today()
+    reorder_point = random.randint(450, 550)
+    safety_stock = random.randint(2, 10)
+    current_stock = random.randint(reorder_point - 50, reorder_point + 100)
+
+    forecast = {}
+    base_demand = random.randint(80, 120)
+
+    for i in range(days):
+        forecast_date = (today + timedelta(days=i)).strftime("%Y-%m-%d")
+        daily_forecast = base_demand + random.randint(-20, 20)
+        lower_bound = int(daily_forecast * 0.8)
+        upper_bound = int(daily_forecast * 1.2)
+
+        forecast[forecast_date] = {
+            "forecast": daily_forecast,
+            "lower_bound": lower_bound,
+            "upper_bound": upper_bound
+        }
+
+    warnings = []
+    days_to_reorder = (current_stock - safety_stock) / base_demand
+    if days_to_reorder < days:
+        warnings.append(f"Stock will reach reorder point in approximately {int(days_to_reorder)} days")
+    if current_stock < reorder_point:
+        warnings.append("Current stock is below reorder point")
+
+    return {
+        "Reorder Point": reorder_point,
+        "Safety Stock": safety_stock,
+        "Current Stock": current_stock,
+        "Forecast": forecast,
+        "Warnings": warnings,
+        "Note": "Using mock data for demonstration (API unreachable)"
+    }
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=2000)
+    args = parser.parse_args()
+
+    product_ids = [f"SKU{i:06d}" for i in range(args.products)]
+    generator = MockForecastGenerator(seed=42)
+
+    for days in (90, 365):
+        legacy = timed(lambda: [legacy_mock_data(product_id, days) for product_id in product_ids])
+        single = timed(lambda: [generator.generate(product_id, days) for product_id in product_ids])
+        bulk = timed(lambda: generator.generate_many(product_ids, days))
+        arrays = timed(lambda: generator.generate_arrays(product_ids, days))
+
+        print(f"{args.products} products x {days} days")
+        print(f"  legacy loop:             {legacy:7.3f} s")
+        print(f"  generate (per product):  {single:7.3f} s  ({legacy / single:5.1f}x)")
+        print(f"  generate_many (dicts):   {bulk:7.3f} s  ({legacy / bulk:5.1f}x)")
+        print(f"  generate_arrays (NumPy): {arrays:7.3f} s  ({legacy / arrays:5.1f}x)\n")
+
+
+if __name__ == "__main__":
+    main()
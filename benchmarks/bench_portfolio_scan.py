@@ -0,0 +1,74 @@
+"""
+Throughput of the portfolio reorder scan against the local mock forecast
+server, with the peak memory of the process.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_portfolio_scan --products 20000 --workers 32
+"""
+import argparse
+import csv
+import os
+import resource
+import tempfile
+import time
+
+from benchmarks.mock_forecast_server import start_server
+from inventory_assistant import InventoryAssistant
+from mock_forecast import MockForecastGenerator
+from portfolio_scan import PortfolioScanner, reorder_metrics
+
+
+def write_catalog(path, count):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["product_id", "name"])
+        for i in range(count):
+            writer.writerow([f"SKU{i:06d}", f"Product {i}"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.0, help="stub server delay per request")
+    args = parser.parse_args()
+
+    server, url = start_server(latency=args.latency)
+    workdir = tempfile.mkdtemp()
+    catalog = os.path.join(workdir, "skus.csv")
+    report = os.path.join(workdir, "report.csv")
+    write_catalog(catalog, args.products)
+
+    assistant = InventoryAssistant(api_url=url, pool_size=args.workers)
+    scanner = PortfolioScanner(assistant, days=args.days, workers=args.workers, chunk_size=args.chunk_size)
+    summary = scanner.scan_csv(catalog, report)
+    assistant.close()
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{summary['products']} products x {args.days} days, {args.workers} workers, "
+          f"{args.latency * 1000:.0f} ms server latency")
+    print(f"  {summary['seconds']:.1f} s, {summary['products_per_second']:.0f} products/s, "
+          f"{server.request_count} upstream requests, peak RSS {peak_mb:.0f} MiB")
+    print(f"  status: {summary['status']}  sources: {summary['source']}")
+    with open(report, newline="") as f:
+        top = [row for _, row in zip(range(3), csv.DictReader(f))]
+    for row in top:
+        print(f"  #{row['rank']} {row['product_id']}: {row['status']}, reorder in {row['days_to_reorder']} days, "
+              f"stock-out {row['stockout_date'] or 'beyond horizon'}")
+
+    server.shutdown()
+
+    # Reorder computation alone, without HTTP (the stub shares this process's GIL)
+    responses = list(MockForecastGenerator(seed=1).generate_many(
+        [f"SKU{i:06d}" for i in range(args.chunk_size)], args.days).items())
+    start = time.perf_counter()
+    reorder_metrics(responses, args.days)
+    elapsed = time.perf_counter() - start
+    print(f"  reorder_metrics alone: {len(responses) / elapsed:.0f} products/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Simulate skewed traffic (a few hot SKUs, a long tail) against a slow local
+stub with a short cache TTL, with and without the prefetch scheduler, and
+report user-facing latency and the upstream cost of refreshing.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_prefetch --duration 20 --ttl 5
+"""
+import argparse
+import random
+import time
+
+from benchmarks.mock_forecast_server import start_server
+from benchmarks.utils import format_latencies
+from inventory_assistant import InventoryAssistant
+
+
+def run(url, server, args, prefetch_top_n):
+    assistant = InventoryAssistant(api_url=url, cache_ttl=args.ttl, prefetch_top_n=prefetch_top_n,
+                                   prefetch_interval=args.interval, prefetch_rate_limit=args.rate_limit)
+    rng = random.Random(1)
+    # Zipf-like popularity: product i is asked about with weight 1 / (i + 1)
+    products = [f"P{i:04d}" for i in range(args.products)]
+    weights = [1 / (i + 1) for i in range(args.products)]
+
+    before = server.request_count
+    latencies = []
+    deadline = time.perf_counter() + args.duration
+    while time.perf_counter() < deadline:
+        product_id = rng.choices(products, weights)[0]
+        start = time.perf_counter()
+        assistant.call_api(product_id, 7)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(args.think_time)
+
+    stats = assistant.prefetcher.stats() if assistant.prefetcher else None
+    assistant.close()
+    return latencies, server.request_count - before, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--ttl", type=float, default=5.0, help="cache TTL in seconds")
+    parser.add_argument("--interval", type=float, default=1.0, help="prefetch pass interval")
+    parser.add_argument("--rate-limit", type=float, default=10.0, help="prefetch requests per second")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--products", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.1, help="stub server delay per request")
+    parser.add_argument("--think-time", type=float, default=0.01, help="pause between user queries")
+    args = parser.parse_args()
+
+    server, url = start_server(latency=args.latency)
+
+    for label, top_n in (("no prefetch", 0), (f"prefetch top {args.top_n}", args.top_n)):
+        latencies, upstream, stats = run(url, server, args, top_n)
+        print(f"{label}: {len(latencies)} queries, {upstream} upstream requests")
+        print(f"  latency {format_latencies(latencies)}")
+        if stats:
+            print(f"  {stats['prefetched_hits']} queries served from prefetched data, "
+                  f"{stats['refreshes']} refreshes ({stats['refresh_failures']} failed, "
+                  f"{stats['refresh_seconds']:.1f} s of upstream time)")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
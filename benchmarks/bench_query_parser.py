@@ -0,0 +1,178 @@
+"""
+Micro-benchmark of QueryParser against the original per-call regex extraction
+from InventoryAssistant.handle_query, over a corpus of generated queries.
+
+The original implementation is kept here as the reference; every
+query in the corpus is checked to give the same (product_id, days).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_query_parser --queries 20000
+"""
+import argparse
+import random
+import re
+import time
+
+from query_parser import QueryParser
+
+
+LEGACY_MULTI_PRODUCT_PATTERN = re.compile(r'\b([A-Za-z]+[0-9]{3,}[A-Za-z0-9]*)\b')
+
+
+def legacy_parse(query):
+    # Extract product_id and days from query
+    product_id = None
+    days = 7  # Default days
+
+    import re
+
+    # Look for product_id=X pattern first (most explicit)
+    product_match = re.search(r'product_id[=\s:]+([a-zA-Z0-9]+)', query)
+    if product_match:
+        product_id = product_match.group(1).upper()
+
+    # If not found, try a more comprehensive pattern that can find product IDs in natural language
+    if not product_id:
+        patterns = [
+            r'(?:for|product|item|sku|of|on|about)\s+([A-Za-z][A-Za-z0-9]{2,})',
+            r'(?:[A-Za-z]+[-:]([0-9]{3,}))',
+            r'\b([A-Za-z][0-9]{3,})\b',
+            r'\b([A-Za-z][A-Za-z0-9]{2,})\b'
+        ]
+
+        for pattern in patterns:
+            matches = re.findall(pattern, query)
+            if matches:
+                # Take the first match
+                product_id = matches[0].upper()
+                break
+
+    # If still not found, check if query itself is just a product ID (e.g., "P001")
+    if not product_id and re.match(r'^[a-zA-Z0-9]+$', query.strip()):
+        product_id = query.strip().upper()
+
+    # Look for time periods
+    time_patterns = {
+        'day': 1,
+        'tomorrow': 1,
+        'week': 7,
+        'month': 30,
+        'quarter': 90
+    }
+
+    for pattern, days_value in time_patterns.items():
+        if pattern in query.lower():
+            days = days_value
+            break
+
+    # Check for specific number of days
+    days_match = re.search(r'(\d+)[\s-]*(day|days)', query.lower())
+    if days_match:
+        days = int(days_match.group(1))
+
+    return product_id, days
+
+
+def legacy_handle_query_parse(query):
+    # Parsing work done by handle_query before QueryParser: the single product
+    # extraction above plus the multi-product scan
+    product_ids = []
+    for match in LEGACY_MULTI_PRODUCT_PATTERN.findall(query):
+        if match.upper() not in product_ids:
+            product_ids.append(match.upper())
+    return legacy_parse(query), product_ids
+
+
+TEMPLATES = [
+    "How much should I stock for {pid} next {period}?",
+    "What's the forecast for {pid} for the next {n} days?",
+    "Check inventory status for item {pid}",
+    "Do I need to reorder product {pid} {period}?",
+    "product_id={pid} days={n}",
+    "{pid}",
+    "forecast {pid} {n}-day",
+    "Show me demand of {pid} this {period}",
+    "is {pid} running low on stock today",
+    "stock levels {prefix}-{digits} over the next {n} days please",
+    "what about {pid} and {pid2} for the {period}",
+    "Reorder point on {pid}?",
+    "hello there",
+    "I need numbers about {pid} for a {period}",
+]
+
+PERIODS = ["day", "week", "month", "quarter", "tomorrow", "year"]
+PREFIXES = ["P", "SKU", "A", "ITEM", "X"]
+
+
+def make_corpus(count, seed=42, distinct=None):
+    """
+    Generate `count` queries. With `distinct` set, queries are drawn from a
+    pool of that many distinct strings, like traffic from load-generating bots.
+    """
+    rng = random.Random(seed)
+    if distinct:
+        pool = make_corpus(distinct, seed)
+        return [rng.choice(pool) for _ in range(count)]
+
+    corpus = []
+    for _ in range(count):
+        prefix = rng.choice(PREFIXES)
+        digits = f"{rng.randint(0, 9999):0{rng.randint(3, 5)}d}"
+        pid = prefix + digits
+        if rng.random() < 0.3:
+            pid = pid.lower()
+        corpus.append(rng.choice(TEMPLATES).format(
+            pid=pid,
+            pid2=rng.choice(PREFIXES) + str(rng.randint(100, 999)),
+            prefix=prefix,
+            digits=digits,
+            period=rng.choice(PERIODS),
+            n=rng.randint(1, 365),
+        ))
+    return corpus
+
+
+def throughput(parse, corpus, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for query in corpus:
+            parse(query)
+        best = min(best, time.perf_counter() - start)
+    return len(corpus) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--distinct", type=int, default=500, help="distinct queries in the repeated corpus")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.queries)
+
+    reference_parser = QueryParser(cache_size=0)
+    mismatches = 0
+    for query in corpus:
+        parsed = reference_parser.parse(query)
+        if (parsed.product_id, parsed.days) != legacy_parse(query):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"MISMATCH: {query!r}: {legacy_parse(query)} != {(parsed.product_id, parsed.days)}")
+    print(f"Checked {len(corpus)} queries, {mismatches} mismatches\n")
+
+    repeated = make_corpus(args.queries, distinct=args.distinct)
+    for label, queries in ((f"{len(corpus)} generated queries", corpus),
+                           (f"{len(repeated)} queries drawn from {args.distinct} distinct", repeated)):
+        legacy = throughput(legacy_handle_query_parse, queries, args.rounds)
+        uncached = throughput(QueryParser(cache_size=0).parse, queries, args.rounds)
+        cached = throughput(QueryParser().parse, queries, args.rounds)
+        print(label)
+        print(f"  legacy handle_query parsing:  {legacy:10.0f} queries/s")
+        print(f"  QueryParser (no memo):        {uncached:10.0f} queries/s  ({uncached / legacy:.1f}x)")
+        print(f"  QueryParser (memoized):       {cached:10.0f} queries/s  ({cached / legacy:.1f}x)\n")
+
+
+if __name__ == "__main__":
+    main()
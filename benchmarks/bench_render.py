@@ -0,0 +1,84 @@
+"""
+Compare the original tabulate-based forecast table with the fast renderer in
+forecast_table.py for 7/30/90/365-day responses, and check the output is
+byte-identical.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_render --responses 500
+"""
+import argparse
+import datetime
+import time
+
+from tabulate import tabulate
+
+from forecast_table import render_forecast_table
+from mock_forecast import MockForecastGenerator
+
+
+def legacy_table(forecast_data):
+    # Original table-building code from InventoryAssistant.process_response
+    def format_date(date_str):
+        try:
+            date_obj = datetime.datetime.strptime(date_str, "%Y-%m-%d")
+            return date_obj.strftime("%d %b, %Y")
+        except:
+            return date_str
+
+    forecast_table = []
+    headers = ["Date", "Forecast", "Range"]
+    for date_str in sorted(forecast_data.keys()):
+        forecast_info = forecast_data[date_str]
+        forecast_val = forecast_info.get("forecast", "N/A")
+        lower_bound = forecast_info.get("lower_bound", "N/A")
+        upper_bound = forecast_info.get("upper_bound", "N/A")
+
+        forecast_val = round(forecast_val, 1) if isinstance(forecast_val, (int, float)) else forecast_val
+        lower_bound = round(lower_bound, 1) if isinstance(lower_bound, (int, float)) else lower_bound
+        upper_bound = round(upper_bound, 1) if isinstance(upper_bound, (int, float)) else upper_bound
+
+        range_val = f"{lower_bound}–{upper_bound}" if lower_bound != "N/A" and upper_bound != "N/A" else "N/A"
+        forecast_table.append([format_date(date_str), forecast_val, range_val])
+
+    return tabulate(forecast_table, headers=headers, tablefmt="pipe")
+
+
+def float_forecasts(response):
+    # The real API returns floats such as 99.96; the mock generator returns ints
+    return {
+        date_str: {key: value + 0.37 for key, value in info.items()}
+        for date_str, info in response["Forecast"].items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--responses", type=int, default=500)
+    args = parser.parse_args()
+
+    generator = MockForecastGenerator(seed=7)
+    product_ids = [f"P{i:04d}" for i in range(args.responses)]
+
+    for days in (7, 30, 90, 365):
+        forecasts = [float_forecasts(response) for response in generator.generate_many(product_ids, days).values()]
+
+        for forecast in forecasts[:20]:
+            assert render_forecast_table(forecast) == legacy_table(forecast), "output differs from tabulate"
+
+        start = time.perf_counter()
+        for forecast in forecasts:
+            legacy_table(forecast)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for forecast in forecasts:
+            render_forecast_table(forecast)
+        fast = time.perf_counter() - start
+
+        print(f"{days:3d} days: tabulate {legacy / len(forecasts) * 1000:7.3f} ms/response  "
+              f"fast {fast / len(forecasts) * 1000:7.3f} ms/response  ({legacy / fast:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Measure cold start in fresh interpreters: importing inventory_assistant, the
+command line app's time to its first prompt and to its first answer (against
+the local mock server), and the desktop app's time to a drawn window.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup --runs 10 --think-time 0.5
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.mock_forecast_server import start_server
+from benchmarks.utils import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = b"Your query: "
+QUERY = b"What's the forecast for P001 for the next 30 days?\n"
+
+GUI_SCRIPT = """
+import time
+start = time.perf_counter()
+import tkinter as tk
+from inventory_assistant_gui import InventoryAssistantGUI
+root = tk.Tk()
+app = InventoryAssistantGUI(root)
+root.update()
+print(time.perf_counter() - start, flush=True)
+root.destroy()
+"""
+
+
+def time_command(args, env=None):
+    """Wall-clock seconds for a command to run to completion."""
+    start = time.perf_counter()
+    subprocess.run(args, cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def read_until(stream, marker):
+    """Read a pipe until `marker` has been written to it."""
+    data = b""
+    while not data.endswith(marker):
+        chunk = os.read(stream.fileno(), 65536)
+        if not chunk:
+            raise RuntimeError(f"process exited before writing {marker!r}: {data[-200:]!r}")
+        data += chunk
+
+
+def time_cli(url, think_time):
+    """
+    Start the command line app, wait for its prompt, ask one query and wait for the answer.
+
+    Returns:
+        tuple: (seconds to first prompt, seconds to first answer) from process start
+    """
+    env = dict(os.environ, INVENTORY_API_URL=url)
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-u", "inventory_assistant.py"], cwd=ROOT, env=env,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    try:
+        read_until(process.stdout, PROMPT)
+        first_prompt = time.perf_counter() - start
+        # The user reads the greeting and types; the warm-up runs meanwhile
+        time.sleep(think_time)
+        asked = time.perf_counter()
+        process.stdin.write(QUERY)
+        process.stdin.flush()
+        read_until(process.stdout, PROMPT)
+        first_answer = time.perf_counter() - asked
+        process.stdin.write(b"exit\n")
+        process.stdin.flush()
+        process.wait(timeout=10)
+    finally:
+        process.kill()
+    return first_prompt, first_answer
+
+
+def time_gui():
+    """Seconds from interpreter start to a drawn window, or None without a display."""
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        return None
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", GUI_SCRIPT], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return time.perf_counter() - start
+
+
+def measure(runs, think_time=0.0, latency=0.05):
+    """
+    Cold-start timings over `runs` fresh processes each.
+
+    Returns:
+        dict: Scenario name -> list of seconds ("gui/window" only with a display)
+    """
+    server, url = start_server(latency=latency)
+    samples = {"python": [], "import": [], "cli/first_prompt": [], "cli/first_answer": [], "gui/window": []}
+    try:
+        for _ in range(runs):
+            samples["python"].append(time_command([sys.executable, "-c", "pass"]))
+            samples["import"].append(time_command([sys.executable, "-c", "import inventory_assistant"]))
+            first_prompt, first_answer = time_cli(url, think_time)
+            samples["cli/first_prompt"].append(first_prompt)
+            samples["cli/first_answer"].append(first_answer)
+            window = time_gui()
+            if window is not None:
+                samples["gui/window"].append(window)
+    finally:
+        server.shutdown()
+    return {name: values for name, values in samples.items() if values}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="seconds between the first prompt and sending the query")
+    parser.add_argument("--latency", type=float, default=0.05, help="mock server delay per request")
+    args = parser.parse_args()
+
+    samples = measure(args.runs, args.think_time, args.latency)
+    print(f"{args.runs} cold starts each (milliseconds, including interpreter start-up):")
+    for name, values in samples.items():
+        print(f"  {name:<18} p50 {percentile(values, 50) * 1000:8.1f}  max {max(values) * 1000:8.1f}")
+    print("  (cli/first_answer is measured from sending the query)")
+    if "gui/window" not in samples:
+        print("  gui/window         skipped (no display)")
+
+
+if __name__ == "__main__":
+    main()
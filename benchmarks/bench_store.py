@@ -0,0 +1,66 @@
+"""
+Compare first-query latency after a cold start (empty cache) with a warm
+start from the on-disk forecast store, and show stored forecasts being
+served while the API is unreachable.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_store --products 500 --latency 0.3
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.mock_forecast_server import start_server
+from inventory_assistant import InventoryAssistant
+
+
+QUERY = "What's the forecast for P0000 for the next 30 days?"
+
+
+def first_query(assistant):
+    start = time.perf_counter()
+    assistant.handle_query(QUERY)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=500, help="forecasts saved before the restart")
+    parser.add_argument("--latency", type=float, default=0.3, help="stub server delay per request")
+    args = parser.parse_args()
+
+    server, url = start_server(latency=0)
+    store_path = os.path.join(tempfile.mkdtemp(), "forecasts.db")
+
+    # Populate the store as a previous run of the app would
+    assistant = InventoryAssistant(api_url=url, store_path=store_path, batch_workers=32)
+    start = time.perf_counter()
+    assistant.fetch_batch([f"P{i:04d}" for i in range(args.products)], 30)
+    print(f"saved {len(assistant.store)} forecasts in {time.perf_counter() - start:.2f} s "
+          f"({os.path.getsize(store_path) / 1024:.0f} KiB)")
+    assistant.store.close()
+
+    server.latency = args.latency
+    cold = first_query(InventoryAssistant(api_url=url))
+
+    start = time.perf_counter()
+    assistant = InventoryAssistant(api_url=url, store_path=store_path)
+    startup = time.perf_counter() - start
+    warm = first_query(assistant)
+
+    print(f"cold start first query: {cold * 1000:8.2f} ms")
+    print(f"warm start first query: {warm * 1000:8.2f} ms  "
+          f"(loading {len(assistant.cache)} cached forecasts took {startup * 1000:.1f} ms)")
+    server.shutdown()
+
+    # Offline: the API is unreachable and the cache has expired
+    assistant = InventoryAssistant(api_url="http://127.0.0.1:9/forecast", store_path=store_path,
+                                   cache_max_entries=0, max_retries=0)
+    response = assistant.call_api("P0001", 7)
+    print(f"offline: {response['Note']} ({len(response['Forecast'])} days)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Per-interaction script time of the Streamlit app (inventory_assistant_web.py)
+with 10-, 100- and 1000-message conversation histories, using Streamlit's
+AppTest harness against the local mock forecast server.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_web_history --interactions 5
+
+To compare with another version of the app, pass its path, e.g.
+
+    git show <commit>:inventory_assistant_web.py > /tmp/old_web.py
+    python -m benchmarks.bench_web_history --app /tmp/old_web.py
+"""
+import argparse
+import os
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.mock_forecast_server import start_server
+
+
+def make_history(messages):
+    answer = "📊 **Stock Status: Current stock (520 units) is above reorder point.**\n\n" + "\n".join(
+        f"| 0{i % 9 + 1} Oct, 2026 | {100 + i} | {80 + i}–{120 + i} |" for i in range(30))
+    history = []
+    for i in range(messages // 2):
+        history.append({"role": "user", "content": f"What's the forecast for P{i:03d} next month?"})
+        history.append({"role": "assistant", "content": answer})
+    return history
+
+
+def time_interactions(app_path, messages, interactions):
+    at = AppTest.from_file(os.path.abspath(app_path), default_timeout=30)
+    at.session_state["chat_history"] = make_history(messages)
+    at.run()
+
+    timings = []
+    for i in range(interactions):
+        # The same query each time: the first one fetches, later ones may be served from caches
+        at.text_input[0].input(f"Forecast for P{i % 3:03d} next week")
+        button = next(b for b in at.button if b.label == "Send")
+        start = time.perf_counter()
+        button.click().run()
+        timings.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    return timings, len(at.markdown)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--app", default="inventory_assistant_web.py", help="Streamlit script to measure")
+    parser.add_argument("--interactions", type=int, default=5, help="queries sent per history size")
+    args = parser.parse_args()
+
+    server, url = start_server()
+    os.environ["INVENTORY_API_URL"] = url
+
+    print(f"{args.app}: script time per interaction")
+    for messages in (10, 100, 1000):
+        timings, markdown_elements = time_interactions(args.app, messages, args.interactions)
+        print(f"  {messages:5d} messages: median {statistics.median(timings) * 1000:8.1f} ms  "
+              f"max {max(timings) * 1000:8.1f} ms  ({markdown_elements} markdown elements)")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Load test for inventory_assistant_server: client threads send POST /query
+requests against a server that uses the local mock forecast backend.
+
+Run from the repository root:
+
+    python -m benchmarks.load_test_server --clients 32 --duration 10
+    python -m benchmarks.load_test_server --clients 64 --workers 8 --idle-clients 16
+
+More clients than workers (and idle keep-alive connections) checks that a
+connection only holds a worker while a request is being answered.
+"""
+import argparse
+import random
+import threading
+import time
+
+import requests
+
+from benchmarks.mock_forecast_server import start_server
+from benchmarks.utils import format_latencies
+from inventory_assistant import InventoryAssistant
+from inventory_assistant_server import InventoryAPIServer
+
+
+QUERIES = [
+    "How much should I stock for {pid} next week?",
+    "What's the forecast for {pid} for the next 30 days?",
+    "Check inventory status for item {pid}",
+    "Do I need to reorder product {pid} tomorrow?",
+]
+
+
+def client(url, products, deadline, latencies, errors, seed):
+    rng = random.Random(seed)
+    session = requests.Session()
+    while time.perf_counter() < deadline:
+        query = rng.choice(QUERIES).format(pid=f"P{rng.randrange(products):04d}")
+        start = time.perf_counter()
+        try:
+            response = session.post(url, json={"query": query}, timeout=30)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+        except requests.exceptions.RequestException:
+            errors.append(1)
+
+
+def idle_client(url, stop):
+    """Send one request, then keep the connection open without using it."""
+    session = requests.Session()
+    session.get(url, timeout=30)
+    stop.wait()
+    session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32, help="concurrent client threads")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--workers", type=int, default=32, help="server worker threads")
+    parser.add_argument("--idle-clients", type=int, default=0,
+                        help="extra keep-alive connections left idle during the run")
+    parser.add_argument("--products", type=int, default=200, help="distinct product IDs queried")
+    parser.add_argument("--latency", type=float, default=0.05, help="mock forecast backend delay")
+    parser.add_argument("--url", help="load test an already running server (base URL)")
+    args = parser.parse_args()
+
+    backend = server = None
+    base_url = args.url
+    if base_url is None:
+        backend, backend_url = start_server(latency=args.latency)
+        assistant = InventoryAssistant(api_url=backend_url, pool_size=args.workers, enable_metrics=True)
+        server = InventoryAPIServer(("127.0.0.1", 0), assistant, workers=args.workers)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    stop_idle = threading.Event()
+    idle_threads = [threading.Thread(target=idle_client, args=(f"{base_url}/health", stop_idle))
+                    for _ in range(args.idle_clients)]
+    for thread in idle_threads:
+        thread.start()
+    time.sleep(0.2 if idle_threads else 0)
+
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(target=client, args=(f"{base_url}/query", args.products, deadline, latencies, errors, i))
+        for i in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop_idle.set()
+    for thread in idle_threads:
+        thread.join()
+
+    print(f"{args.clients} clients ({args.idle_clients} idle), {args.workers} workers, "
+          f"{args.duration:.0f} s, {args.products} products")
+    print(f"  {len(latencies)} requests, {len(errors)} errors, {len(latencies) / elapsed:.1f} requests/s")
+    if latencies:
+        print(f"  latency {format_latencies(latencies)}")
+
+    metrics = requests.get(f"{base_url}/metrics", timeout=5).json()
+    print(f"  cache {metrics['cache']}")
+    for stage, summary in sorted(metrics["assistant"]["stages"].items()):
+        print(f"  stage {stage:<7} {summary}")
+    if backend is not None:
+        print(f"  upstream forecast requests: {backend.request_count}")
+        server.shutdown()
+        server.server_close()
+        backend.shutdown()
+
+
+if __name__ == "__main__":
+    main()
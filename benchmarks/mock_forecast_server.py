@@ -0,0 +1,152 @@
+"""
+Local stand-in for the Inventory Forecast API used by the benchmarks.
+
+Serves POST /forecast with responses shaped like the real API so that the
+assistant can be measured without depending on the Render deployment.
+"""
+import json
+import random
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from inventory_assistant import InventoryAssistant
+
+
+class MockForecastHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so that clients can keep connections alive between requests
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+
+        server = self.server
+        days = int(payload.get("days", 7))
+        with server.lock:
+            server.request_count += 1
+            throttled = server.rate_limit and not server.take_token()
+            if throttled:
+                server.throttled_count += 1
+            else:
+                server.days_served += days
+            fail = server.error_rate and server.random.random() < server.error_rate
+
+        if server.latency and not throttled:
+            time.sleep(server.latency)
+
+        if throttled:
+            # Rejected before any work, like an API gateway's rate limiter
+            status = 429
+            body = b'{"error": "Too many requests"}'
+        elif fail:
+            with server.lock:
+                server.error_count += 1
+            status = 503
+            body = b'{"error": "Service temporarily unavailable"}'
+        else:
+            product_id = payload.get("product_id", "P001")
+            if server.supports_start_date and payload.get("start_date"):
+                # Stock numbers are as of today; the forecast starts at start_date
+                skip = max(0, (date.fromisoformat(payload["start_date"]) - date.today()).days)
+                data = server.generator.mock_generator.generate(product_id, skip + days)
+                data["Forecast"] = dict(list(data["Forecast"].items())[skip:])
+            else:
+                data = server.generator.mock_generator.generate(product_id, days)
+            if server.payload_bytes:
+                # Pad to roughly the requested size, like a response with extra metadata
+                data["Metadata"] = "x" * max(0, server.payload_bytes - len(json.dumps(data)) - 16)
+            status = 200
+            body = json.dumps(data).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+
+class MockForecastServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Benchmarks open many connections at once; the default backlog of 5 drops SYNs
+    request_queue_size = 256
+
+    def take_token(self):
+        """Token bucket for rate_limit (call with the lock held): False if the request is over it."""
+        now = time.monotonic()
+        self.tokens = min(self.rate_limit, self.tokens + (now - self.tokens_updated) * self.rate_limit)
+        self.tokens_updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+def start_server(host="127.0.0.1", port=0, latency=0.0, error_rate=0.0, payload_bytes=0, seed=0,
+                 supports_start_date=False, rate_limit=None):
+    """
+    Start the mock forecast server in a background thread.
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind (0 picks a free port)
+        latency (float): Seconds to sleep before answering each request
+        error_rate (float): Fraction of requests answered with 503 (default: 0)
+        payload_bytes (int): Pad successful responses to about this many bytes (default: 0)
+        seed (int): Seed for choosing which requests fail (default: 0)
+        supports_start_date (bool): Honour a "start_date" field in requests (default: False)
+        rate_limit (float): Answer requests beyond this many per second (bursts of up to
+            one second's worth) with 429 at once, None for no limit (default: None)
+
+    Returns:
+        tuple: (server, url) where url points at the /forecast endpoint
+    """
+    server = MockForecastServer((host, port), MockForecastHandler)
+    server.latency = latency
+    server.error_rate = error_rate
+    server.payload_bytes = payload_bytes
+    server.supports_start_date = supports_start_date
+    server.rate_limit = rate_limit
+    server.tokens = rate_limit or 0
+    server.tokens_updated = time.monotonic()
+    server.random = random.Random(seed)
+    server.lock = threading.Lock()
+    server.request_count = 0
+    server.error_count = 0
+    server.throttled_count = 0
+    # Forecast days asked for over all requests
+    server.days_served = 0
+    server.generator = InventoryAssistant(cache_max_entries=0)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    url = f"http://{server.server_address[0]}:{server.server_address[1]}/forecast"
+    return server, url
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the mock Inventory Forecast API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of delay per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="pad responses to about this size")
+    parser.add_argument("--rate-limit", type=float, help="answer requests over this many per second with 429")
+    args = parser.parse_args()
+
+    server, url = start_server(port=args.port, latency=args.latency, error_rate=args.error_rate,
+                               payload_bytes=args.payload_bytes, rate_limit=args.rate_limit)
+    print(f"Mock forecast API listening on {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,250 @@
+"""
+Replay a log of user queries through InventoryAssistant.handle_query against
+the local mock forecast server, and report throughput, latency percentiles,
+cache hit rate and upstream calls, to size instances before deploying.
+
+Run from the repository root:
+
+    python -m benchmarks.replay_queries queries.jsonl --pacing original
+    python -m benchmarks.replay_queries queries.jsonl --pacing accelerated --speed 60
+    python -m benchmarks.replay_queries queries.jsonl --pacing fixed --rate 50
+    python -m benchmarks.replay_queries --synthetic 2000 --pacing fixed --rate 100
+
+Accepted logs:
+
+- JSON Lines, one {"timestamp": ..., "query": ...} object per line, as
+  written by the API server's --query-log option
+- A JSON list of chat messages ({"role": "user", "content": ..., "timestamp": ...}),
+  such as an exported Streamlit chat_history; assistant messages are skipped
+- CSV with "timestamp" and "query" columns
+- Plain text, one query per line (no timestamps, so --pacing fixed only)
+
+Timestamps are Unix seconds or ISO 8601 strings.
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from benchmarks.bench_query_parser import make_corpus
+from benchmarks.mock_forecast_server import start_server
+from benchmarks.utils import format_latencies, percentile
+from inventory_assistant import InventoryAssistant
+
+
+def parse_timestamp(value):
+    """Unix seconds from a number or an ISO 8601 string, or None."""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+def record_query(record):
+    """The query of a log record, or None for records that aren't user queries."""
+    if "query" in record:
+        return record["query"]
+    if record.get("role", "user") == "user":
+        return record.get("content")
+    return None
+
+
+def load_log(path):
+    """
+    Read a query log.
+
+    Args:
+        path (str): Log file (JSON Lines, JSON list, CSV or plain text)
+
+    Returns:
+        list: (timestamp or None, query) tuples in log order
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+
+    stripped = text.lstrip()
+    if path.endswith(".csv"):
+        records = list(csv.DictReader(io.StringIO(text)))
+    elif stripped.startswith("["):
+        records = json.loads(text)
+    elif stripped.startswith("{"):
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        return [(None, line.strip()) for line in text.splitlines() if line.strip()]
+
+    entries = []
+    for record in records:
+        query = record_query(record)
+        if query and query.strip():
+            entries.append((parse_timestamp(record.get("timestamp")), query))
+    return entries
+
+
+def synthetic_log(count, rate, seed=0):
+    """`count` generated queries with Poisson arrivals at `rate` per second."""
+    rng = random.Random(seed)
+    # Drawn from a smaller pool so that queries repeat, like real traffic
+    queries = make_corpus(count, seed=seed, distinct=max(1, count // 4))
+    entries = []
+    now = 0.0
+    for query in queries:
+        now += rng.expovariate(rate)
+        entries.append((now, query))
+    return entries
+
+
+def schedule(entries, pacing, speed=1.0, rate=10.0):
+    """
+    Send times of the queries, in seconds from the start of the replay.
+
+    Args:
+        entries (list): (timestamp, query) tuples
+        pacing (str): "original" keeps the recorded gaps, "accelerated" divides
+            them by `speed`, "fixed" sends `rate` queries per second
+        speed (float): Speed-up for "accelerated"
+        rate (float): Queries per second for "fixed"
+
+    Returns:
+        list: Offsets in seconds, one per entry
+
+    Raises:
+        ValueError: If the pacing needs timestamps the log doesn't have
+    """
+    if pacing == "fixed":
+        return [i / rate for i in range(len(entries))]
+
+    if any(timestamp is None for timestamp, _ in entries):
+        raise ValueError("the log has entries without timestamps; use --pacing fixed")
+    first = min(timestamp for timestamp, _ in entries)
+    scale = speed if pacing == "accelerated" else 1.0
+    return [(timestamp - first) / scale for timestamp, _ in entries]
+
+
+def replay(assistant, entries, offsets, workers):
+    """
+    Send the queries at their offsets (open loop: a slow answer doesn't delay
+    the next query) and time them.
+
+    Returns:
+        dict: "latencies" (send time to answer, including waiting for a worker),
+              "service" (time inside handle_query), "errors" and "elapsed"
+    """
+    latencies = []
+    service = []
+    errors = []
+    lock = threading.Lock()
+
+    def run(query, due):
+        start = time.perf_counter()
+        try:
+            assistant.handle_query(query)
+        except Exception as e:
+            with lock:
+                errors.append(f"{type(e).__name__}: {e}")
+        end = time.perf_counter()
+        with lock:
+            latencies.append(end - due)
+            service.append(end - start)
+
+    order = sorted(range(len(entries)), key=offsets.__getitem__)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for i in order:
+            due = started + offsets[i]
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(run, entries[i][1], due)
+    return {"latencies": latencies, "service": service, "errors": errors,
+            "elapsed": time.perf_counter() - started}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("log", nargs="?", help="query log to replay")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="replay N generated queries instead of a log")
+    parser.add_argument("--pacing", choices=("original", "accelerated", "fixed"), default="original")
+    parser.add_argument("--speed", type=float, default=10.0, help="speed-up for --pacing accelerated")
+    parser.add_argument("--rate", type=float, default=10.0, help="queries per second for --pacing fixed "
+                                                                  "(and arrival rate of --synthetic)")
+    parser.add_argument("--limit", type=int, help="replay only the first N queries")
+    parser.add_argument("--workers", type=int, default=16, help="queries answered at the same time")
+    parser.add_argument("--cache-ttl", type=float, default=300,
+                        help="forecast cache TTL in log time (divided by --speed when accelerated)")
+    parser.add_argument("--latency", type=float, default=0.05, help="mock server delay per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of mock requests failing with 503")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        entries = synthetic_log(args.synthetic, args.rate)
+    elif args.log:
+        entries = load_log(args.log)
+    else:
+        parser.error("give a log file or --synthetic N")
+    entries = entries[:args.limit] if args.limit else entries
+    if not entries:
+        parser.error("no queries to replay")
+    try:
+        offsets = schedule(entries, args.pacing, args.speed, args.rate)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Keep hit rates representative when the log is replayed faster than it was recorded
+    cache_ttl = args.cache_ttl / args.speed if args.pacing == "accelerated" else args.cache_ttl
+    server, url = start_server(latency=args.latency, error_rate=args.error_rate)
+    assistant = InventoryAssistant(api_url=url, cache_ttl=cache_ttl, pool_size=args.workers,
+                                   batch_workers=args.workers, enable_metrics=True)
+
+    print(f"Replaying {len(entries)} queries over {max(offsets):.1f}s ({args.pacing} pacing), "
+          f"{args.workers} workers, mock latency {args.latency * 1000:.0f} ms")
+    # Keep the assistant's "API connection error" messages out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = replay(assistant, entries, offsets, args.workers)
+    cache = assistant.cache.stats()
+    counters = assistant.metrics.to_dict()["counters"]
+    coalesced = assistant.in_flight.stats()
+    assistant.close()
+    server.shutdown()
+
+    latencies = result["latencies"]
+    lookups = cache["hits"] + cache["misses"]
+    report = {
+        "queries": len(latencies),
+        "elapsed_seconds": round(result["elapsed"], 3),
+        "throughput_qps": round(len(latencies) / result["elapsed"], 1),
+        "latency_ms": {f"p{pct}": round(percentile(latencies, pct) * 1000, 2) for pct in (50, 90, 99)},
+        "service_ms": {f"p{pct}": round(percentile(result["service"], pct) * 1000, 2) for pct in (50, 90, 99)},
+        "cache_hit_rate": round(cache["hits"] / lookups, 3) if lookups else None,
+        "upstream_requests": server.request_count,
+        "upstream_errors": server.error_count,
+        "coalesced": coalesced,
+        "counters": counters,
+        "errors": len(result["errors"]),
+    }
+
+    print(f"  throughput  {report['throughput_qps']} queries/s over {report['elapsed_seconds']}s")
+    print(f"  latency     {format_latencies(latencies)}")
+    print(f"  service     {format_latencies(result['service'])}")
+    print(f"  cache       {cache['hits']} hits / {lookups} lookups ({report['cache_hit_rate'] or 0:.1%})")
+    print(f"  upstream    {server.request_count} requests, {server.error_count} failed, "
+          f"{counters.get('mock_fallbacks', 0)} answered with mock data")
+    if result["errors"]:
+        print(f"  errors      {len(result['errors'])}, first: {result['errors'][0]}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Reproducible benchmark suite: parse-only, render-only and end-to-end
+scenarios against the local mock forecast server, plus cold start, written
+as JSON so that runs can be compared to spot regressions.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks --output baseline.json
+    python -m benchmarks.run_benchmarks --output current.json --compare baseline.json
+
+With --compare, scenarios whose throughput dropped (or median latency rose) by
+more than --threshold are listed and the exit status is 1.
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_query_parser import make_corpus
+from benchmarks.bench_startup import measure as measure_startup
+from benchmarks.mock_forecast_server import start_server
+from benchmarks.utils import percentile
+from forecast_result import render_response_markdown
+from inventory_assistant import InventoryAssistant
+from mock_forecast import MockForecastGenerator
+from query_parser import QueryParser
+
+
+HORIZONS = (7, 30, 90)
+CONCURRENCY = (1, 8, 32)
+
+
+def summarize(latencies, elapsed, **extra):
+    """Throughput and latency percentiles (milliseconds) for a scenario."""
+    result = {
+        "operations": len(latencies),
+        "ops_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 4),
+    }
+    result.update(extra)
+    return result
+
+
+def timed_calls(func, items, repeat):
+    """Time func over items `repeat` times and keep the fastest run, to damp noise."""
+    best = None
+    for _ in range(repeat):
+        latencies = []
+        start = time.perf_counter()
+        for item in items:
+            call_start = time.perf_counter()
+            func(item)
+            latencies.append(time.perf_counter() - call_start)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[1]:
+            best = latencies, elapsed
+    return best
+
+
+def bench_parse(args):
+    # Distinct queries with a fresh parser, so the per-query memo never hits
+    corpus = make_corpus(args.parse_queries, seed=args.seed)
+    parser = QueryParser(cache_size=0)
+    latencies, elapsed = timed_calls(parser.parse, corpus, args.repeat)
+    return {"parse": summarize(latencies, elapsed)}
+
+
+def bench_render(args):
+    generator = MockForecastGenerator(seed=args.seed)
+    results = {}
+    for days in HORIZONS:
+        responses = list(generator.generate_many([f"P{i:04d}" for i in range(args.render_responses)], days).values())
+        latencies, elapsed = timed_calls(render_response_markdown, responses, args.repeat)
+        results[f"render/d{days}"] = summarize(latencies, elapsed)
+    return results
+
+
+def bench_end_to_end(args, url, server):
+    results = {}
+    for days in HORIZONS:
+        for concurrency in CONCURRENCY:
+            # Caching and retries are off so that every query reaches the server once
+            assistant = InventoryAssistant(api_url=url, cache_max_entries=0, max_retries=0,
+                                           pool_size=concurrency, breaker_failure_threshold=10 ** 9)
+            queries = [f"forecast for P{i:05d} for the next {days} days" for i in range(args.e2e_queries)]
+            before = server.request_count
+
+            def call(query):
+                start = time.perf_counter()
+                assistant.handle_query(query)
+                return time.perf_counter() - start
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                latencies = list(executor.map(call, queries))
+            elapsed = time.perf_counter() - start
+            assistant.close()
+
+            results[f"e2e/d{days}/c{concurrency}"] = summarize(
+                latencies, elapsed, upstream_requests=server.request_count - before)
+    return results
+
+
+def bench_startup(args):
+    # Each sample is a fresh interpreter, so there is nothing to repeat
+    results = {}
+    for name, samples in measure_startup(args.startup_runs, latency=args.latency).items():
+        results[f"startup/{name}"] = summarize(samples, sum(samples))
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, threshold):
+    """
+    Compare two result files.
+
+    Returns:
+        list: (scenario, metric, baseline value, current value, change) for regressions
+    """
+    regressions = []
+    for scenario, result in current["results"].items():
+        previous = baseline["results"].get(scenario)
+        if previous is None:
+            continue
+        change = result["ops_per_sec"] / previous["ops_per_sec"] - 1 if previous["ops_per_sec"] else 0.0
+        if change < -threshold:
+            regressions.append((scenario, "ops_per_sec", previous["ops_per_sec"], result["ops_per_sec"], change))
+        # p50 rather than p99: tail latency of sub-millisecond scenarios is dominated by noise
+        change = result["p50_ms"] / previous["p50_ms"] - 1 if previous["p50_ms"] else 0.0
+        if change > threshold:
+            regressions.append((scenario, "p50_ms", previous["p50_ms"], result["p50_ms"], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", default="parse,render,e2e,startup", help="comma-separated subset to run")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="relative change flagged as a regression")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each parse/render scenario (fastest is kept)")
+    parser.add_argument("--parse-queries", type=int, default=20000)
+    parser.add_argument("--render-responses", type=int, default=500)
+    parser.add_argument("--e2e-queries", type=int, default=200)
+    parser.add_argument("--startup-runs", type=int, default=5, help="fresh processes per cold-start scenario")
+    parser.add_argument("--latency", type=float, default=0.01, help="mock server delay per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of mock requests failing with 503")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="pad mock responses to about this size")
+    args = parser.parse_args()
+
+    scenarios = set(args.scenarios.split(","))
+    results = {}
+    if "parse" in scenarios:
+        results.update(bench_parse(args))
+    if "render" in scenarios:
+        results.update(bench_render(args))
+    if "e2e" in scenarios:
+        server, url = start_server(latency=args.latency, error_rate=args.error_rate,
+                                   payload_bytes=args.payload_bytes, seed=args.seed)
+        # Keep the assistant's "API connection error" messages out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            results.update(bench_end_to_end(args, url, server))
+        server.shutdown()
+    if "startup" in scenarios:
+        results.update(bench_startup(args))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": vars(args),
+        },
+        "results": results,
+    }
+
+    for scenario, result in results.items():
+        print(f"{scenario:<26} {result['ops_per_sec']:>10.1f} ops/s  "
+              f"p50 {result['p50_ms']:>9.4f} ms  p99 {result['p99_ms']:>9.4f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        print(f"\nCompared with {args.compare} (commit {baseline['meta'].get('commit')}):")
+        if not regressions:
+            print(f"  no regressions beyond {args.threshold:.0%}")
+        for scenario, metric, before, after, change in regressions:
+            print(f"  REGRESSION {scenario} {metric}: {before} -> {after} ({change:+.0%})")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""Small helpers shared by the benchmark scripts."""
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def format_latencies(samples):
+    """p50/p90/p99/max of latencies in seconds, formatted in milliseconds."""
+    return "  ".join(
+        f"{label}={value * 1000:7.2f} ms"
+        for label, value in (
+            ("p50", percentile(samples, 50)),
+            ("p90", percentile(samples, 90)),
+            ("p99", percentile(samples, 99)),
+            ("max", max(samples)),
+        )
+    )
@@ -11,11 +11,15 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 app_name = "Inventory Assistant"
 script_path = os.path.join(script_dir, "inventory_assistant_gui.py")
 
+# --onefile unpacks the whole bundle to a temporary folder on every start;
+# "python build_app.py --onedir" builds a folder that starts without that step
+bundle_mode = "--onedir" if "--onedir" in sys.argv[1:] else "--onefile"
+
 # Run PyInstaller
 PyInstaller.__main__.run([
     script_path,
     "--name=%s" % app_name,
-    "--onefile",
+    bundle_mode,
     "--windowed",
     "--add-data=%s:." % os.path.join(script_dir, "inventory_assistant.py"),
     "--icon=%s" % os.path.join(script_dir, "icon.ico") if os.path.exists(os.path.join(script_dir, "icon.ico")) else ""
@@ -0,0 +1,111 @@
+import threading
+import time
+
+
+class _Trial:
+    """allow_request() result for the half-open trial request; truthy like True."""
+
+    __slots__ = ()
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for calls to the forecast API.
+
+    closed:    requests go through; consecutive failures are counted
+    open:      requests are rejected immediately until the cool-down passes
+    half_open: one trial request is let through; success closes the circuit,
+               failure opens it again
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30, on_state_change=None):
+        """
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds to stay open before allowing a trial request
+            on_state_change (callable): Optional callback(old_state, new_state)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_state_change = on_state_change
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self.transitions = {}
+        self._opened_at = 0.0
+        self._trial = None  # the _Trial handed out while a trial request is in flight
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """
+        Check whether a request may be sent to the API.
+
+        Returns:
+            False if the caller should fail fast, otherwise a true value: True,
+            or for the half-open trial request a token to pass to release_trial
+            if the request isn't sent after all
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._transition(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN and self._trial is None:
+                self._trial = _Trial()
+                return self._trial
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        """Record a successful API call."""
+        with self._lock:
+            self.failures = 0
+            self._trial = None
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self):
+        """Record a failed API call."""
+        with self._lock:
+            self.failures += 1
+            self._trial = None
+            if self.state == self.HALF_OPEN or (
+                    self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                self._transition(self.OPEN)
+
+    def release_trial(self, allowed):
+        """
+        Give back a half-open trial request that was never sent (e.g. turned
+        away by the rate limit), so the next caller can make the trial.
+
+        Args:
+            allowed: What allow_request returned for the request; nothing is
+                given back unless it is the trial still in flight
+        """
+        with self._lock:
+            if allowed is self._trial:
+                self._trial = None
+
+    def stats(self):
+        """Return the breaker state and counters as a dict."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "rejected": self.rejected,
+                "transitions": dict(self.transitions),
+            }
+
+    def _transition(self, new_state):
+        old_state = self.state
+        self.state = new_state
+        key = f"{old_state}->{new_state}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        if self.on_state_change is not None:
+            self.on_state_change(old_state, new_state)
@@ -0,0 +1,208 @@
+from collections.abc import Mapping
+from datetime import date, timedelta
+from functools import lru_cache
+
+
+# Forecast values that fit are kept as int32 (4 bytes a day instead of a boxed int)
+_INT32_MIN, _INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+@lru_cache(maxsize=256)
+def _date_strings(start_ordinal, days):
+    """ISO dates of a window, shared by all forecasts with the same start and length."""
+    return tuple(date.fromordinal(ordinal).isoformat() for ordinal in range(start_ordinal, start_ordinal + days))
+
+
+@lru_cache(maxsize=4096)
+def _ordinal(date_str):
+    """Ordinal of a "YYYY-MM-DD" string, or None if it isn't one."""
+    try:
+        parsed = date.fromisoformat(date_str)
+    except (TypeError, ValueError):
+        return None
+    # fromisoformat also accepts forms like "20240101"; keys are "YYYY-MM-DD" only
+    return parsed.toordinal() if parsed.isoformat() == date_str else None
+
+
+def _typed_array(values):
+    """
+    Values as an int32/int64 array if they are all ints, float64 if they are
+    all floats, else None (mixed columns render differently, e.g. "9" vs "9.0").
+    """
+    # NumPy is imported with the first forecast rather than at startup
+    import numpy as np
+
+    if all(type(value) is int for value in values):
+        array = np.array(values, dtype=np.int64)
+        if array.size and _INT32_MIN <= array.min() and array.max() <= _INT32_MAX:
+            array = array.astype(np.int32)
+        return array
+    if all(type(value) is float for value in values):
+        return np.array(values, dtype=np.float64)
+    return None
+
+
+class CompactForecast(Mapping):
+    """
+    Forecast days stored as a start date and three typed arrays.
+
+    The API's "Forecast" is a dict of "YYYY-MM-DD" -> {"forecast",
+    "lower_bound", "upper_bound"}: a string key, a dict and three boxed numbers
+    per day. This keeps the same days in contiguous NumPy arrays (int32 when
+    the values are whole numbers) and still behaves like the dict, so code that
+    iterates, indexes or compares "Forecast" keeps working. Dates are in order,
+    a date is found by arithmetic instead of hashing, and head()/window()
+    return views that share the arrays.
+
+    Instances are treated as immutable.
+    """
+
+    __slots__ = ("start", "forecast", "lower_bound", "upper_bound")
+
+    def __init__(self, start, forecast, lower_bound, upper_bound):
+        """
+        Args:
+            start (date): Date of the first value
+            forecast (numpy.ndarray): Forecast demand per day
+            lower_bound (numpy.ndarray): Lower bound per day, same length
+            upper_bound (numpy.ndarray): Upper bound per day, same length
+        """
+        self.start = start
+        self.forecast = forecast
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+
+    @classmethod
+    def from_dict(cls, forecast_data):
+        """
+        Convert the API's dict layout.
+
+        Returns:
+            CompactForecast: The same days, or None if they can't be stored
+                             compactly (gaps between dates, missing or
+                             non-numeric values, invalid dates)
+        """
+        if not forecast_data:
+            return None
+        dates = sorted(forecast_data)
+        try:
+            start = date.fromisoformat(dates[0])
+        except (TypeError, ValueError):
+            return None
+        if dates != list(_date_strings(start.toordinal(), len(dates))):
+            return None
+
+        infos = [forecast_data[date_str] for date_str in dates]
+        if not all(isinstance(info, dict) for info in infos):
+            return None
+        arrays = [_typed_array([info.get(field) for info in infos])
+                  for field in ("forecast", "lower_bound", "upper_bound")]
+        if any(array is None for array in arrays):
+            return None
+        return cls(start, *arrays)
+
+    def __len__(self):
+        return len(self.forecast)
+
+    def __iter__(self):
+        return iter(self.dates())
+
+    def __contains__(self, date_str):
+        return self.index(date_str) is not None
+
+    def __getitem__(self, date_str):
+        index = self.index(date_str)
+        if index is None:
+            raise KeyError(date_str)
+        return {
+            "forecast": self.forecast[index].item(),
+            "lower_bound": self.lower_bound[index].item(),
+            "upper_bound": self.upper_bound[index].item(),
+        }
+
+    def __repr__(self):
+        return f"<CompactForecast {self.start.isoformat()} +{len(self)}d {self.forecast.dtype}>"
+
+    def __reduce__(self):
+        return (CompactForecast, (self.start, self.forecast, self.lower_bound, self.upper_bound))
+
+    @property
+    def end(self):
+        """The day after the last value."""
+        return self.start + timedelta(days=len(self))
+
+    def dates(self):
+        """Forecast dates as "YYYY-MM-DD" strings, in order."""
+        return _date_strings(self.start.toordinal(), len(self))
+
+    def index(self, date_str):
+        """
+        Position of a date.
+
+        Returns:
+            int: Index into the arrays, or None if the date isn't covered
+        """
+        ordinal = _ordinal(date_str) if isinstance(date_str, str) else None
+        if ordinal is None:
+            return None
+        offset = ordinal - self.start.toordinal()
+        return offset if 0 <= offset < len(self) else None
+
+    def head(self, days):
+        """The first `days` days, sharing this forecast's arrays."""
+        if days >= len(self):
+            return self
+        return CompactForecast(self.start, self.forecast[:days], self.lower_bound[:days], self.upper_bound[:days])
+
+    def window(self, start, days):
+        """
+        Up to `days` days from date `start`, sharing this forecast's arrays.
+
+        Returns:
+            CompactForecast: The covered part of the window (possibly empty)
+        """
+        first = min(max(start.toordinal() - self.start.toordinal(), 0), len(self))
+        last = min(max(start.toordinal() + days - self.start.toordinal(), first), len(self))
+        return CompactForecast(self.start + timedelta(days=first), self.forecast[first:last],
+                               self.lower_bound[first:last], self.upper_bound[first:last])
+
+    def total(self):
+        """Sum of the forecast values (added in order, like sum() over the dict)."""
+        return sum(self.forecast.tolist())
+
+    def to_dict(self):
+        """The API's dict layout."""
+        return {
+            date_str: {"forecast": value, "lower_bound": lower, "upper_bound": upper}
+            for date_str, value, lower, upper in zip(
+                self.dates(), self.forecast.tolist(), self.lower_bound.tolist(), self.upper_bound.tolist())
+        }
+
+    def nbytes(self):
+        """Bytes used by the arrays."""
+        return self.forecast.nbytes + self.lower_bound.nbytes + self.upper_bound.nbytes
+
+
+def compact_response(response):
+    """
+    Return the response with its "Forecast" converted to a CompactForecast.
+
+    The response is returned unchanged if it has no forecast, already holds a
+    compact one, or its forecast can't be converted.
+    """
+    forecast = response.get("Forecast")
+    if not forecast or isinstance(forecast, CompactForecast):
+        return response
+    compact = CompactForecast.from_dict(forecast)
+    if compact is None:
+        return response
+    response = dict(response)
+    response["Forecast"] = compact
+    return response
+
+
+def json_default(value):
+    """json.dumps `default` hook that writes a CompactForecast in the dict layout."""
+    if isinstance(value, CompactForecast):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
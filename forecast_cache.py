@@ -0,0 +1,201 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from compact_forecast import CompactForecast
+
+
+# The one API warning that depends on the horizon: it is only given when the
+# reorder point is reached within the forecast window
+_REORDER_WARNING = re.compile(r"reorder point in approximately (-?\d+) days")
+
+class ForecastCache:
+    """
+    Bounded in-process cache for forecast API responses.
+
+    Entries are keyed by (product_id, days), expire after a fixed TTL and are
+    evicted in least-recently-used order once the cache is full. A request for
+    a shorter horizon can be answered from a cached longer forecast of the same
+    product by slicing its "Forecast" dict.
+    """
+
+    def __init__(self, ttl=300, max_entries=1024):
+        """
+        Args:
+            ttl (float): Seconds an entry stays fresh
+            max_entries (int): Maximum number of cached responses (0 disables caching)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._horizons = {}  # product_id -> set of cached days
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, product_id, days):
+        """
+        Look up a fresh response for a product and horizon.
+
+        Args:
+            product_id (str): The product ID
+            days (int): Number of forecast days requested
+
+        Returns:
+            dict: Cached (or sliced) response, or None on a miss
+        """
+        with self._lock:
+            found = self._lookup(product_id, days, self.ttl)
+            if found is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return found[0]
+
+    def get_stale(self, product_id, days):
+        """
+        Look up the last known response regardless of age.
+
+        Expired entries stay in the cache until they are evicted, so they can
+        still be served when the API is unavailable. Counters are not updated.
+
+        Args:
+            product_id (str): The product ID
+            days (int): Number of forecast days requested
+
+        Returns:
+            tuple: (response, age in seconds), or None if nothing is cached
+        """
+        with self._lock:
+            return self._lookup(product_id, days, float("inf"))
+
+    def _lookup(self, product_id, days, max_age):
+        now = time.monotonic()
+        key = (product_id, days)
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[1] < max_age:
+            self._entries.move_to_end(key)
+            return entry[0], now - entry[1]
+
+        # Fall back to the shortest longer horizon for this product
+        for cached_days in sorted(self._horizons.get(product_id, ())):
+            if cached_days <= days:
+                continue
+            longer_key = (product_id, cached_days)
+            response, stored_at = self._entries[longer_key]
+            if now - stored_at < max_age:
+                self._entries.move_to_end(longer_key)
+                return slice_response(response, days), now - stored_at
+
+        return None
+
+    def age(self, product_id, days):
+        """
+        Seconds since the entry for exactly this product and horizon was
+        stored, or None if there is none. Counters and LRU order are untouched.
+        """
+        with self._lock:
+            entry = self._entries.get((product_id, days))
+            if entry is None:
+                return None
+            return time.monotonic() - entry[1]
+
+    def put(self, product_id, days, response, age=0):
+        """
+        Store a response, evicting the least recently used entries if needed.
+
+        Args:
+            product_id (str): The product ID
+            days (int): Number of forecast days in the response
+            response (dict): API response to cache
+            age (float): Seconds since the response was fetched (default: 0)
+        """
+        if self.max_entries <= 0:
+            return
+        key = (product_id, days)
+        with self._lock:
+            self._entries[key] = (response, time.monotonic() - age)
+            self._entries.move_to_end(key)
+            self._horizons.setdefault(product_id, set()).add(days)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all cached entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._horizons.clear()
+
+    def stats(self):
+        """Return cache counters as a dict."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key):
+        del self._entries[key]
+        product_id, days = key
+        horizons = self._horizons.get(product_id)
+        if horizons is not None:
+            horizons.discard(days)
+            if not horizons:
+                del self._horizons[product_id]
+
+
+def slice_response(response, days):
+    """
+    Return a copy of a forecast response limited to the first `days` dates.
+
+    Args:
+        response (dict): API response with a "Forecast" dict keyed by date,
+            or a CompactForecast
+        days (int): Number of forecast days to keep
+
+    Returns:
+        dict: Shallow copy of the response with a truncated "Forecast"
+              (a CompactForecast is sliced without copying its arrays) and
+              without warnings about days past the new horizon
+    """
+    forecast = response.get("Forecast")
+    sliced = dict(response)
+    if isinstance(forecast, CompactForecast):
+        sliced["Forecast"] = forecast.head(days)
+    elif forecast:
+        sliced["Forecast"] = {date_str: forecast[date_str] for date_str in sorted(forecast)[:days]}
+    if response.get("Warnings"):
+        sliced["Warnings"] = slice_warnings(response["Warnings"], days)
+    return sliced
+
+
+def slice_warnings(warnings, days):
+    """
+    Keep the warnings a `days`-day forecast would have: the API only warns that
+    stock will reach the reorder point in N days if N falls within the horizon.
+
+    Args:
+        warnings (list): "Warnings" of a response for a longer horizon
+        days (int): Number of forecast days
+
+    Returns:
+        list: The warnings that apply to `days` days
+    """
+    kept = []
+    for warning in warnings:
+        match = _REORDER_WARNING.search(warning)
+        if match is None or int(match.group(1)) < days:
+            kept.append(warning)
+    return kept
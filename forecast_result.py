@@ -0,0 +1,427 @@
+import json
+
+from compact_forecast import CompactForecast
+from forecast_table import forecast_columns, render_forecast_table
+
+
+# Labels for the batch summary table
+STATUS_LABELS = {
+    "order_now": "🚨 Order now",
+    "order_soon": "⚠️ Order soon",
+    "ok": "✅ OK",
+    None: "N/A"
+}
+
+# Recommendation wording for ForecastResult.to_compact
+COMPACT_LABELS = {
+    "order_now": "order now",
+    "order_soon": "order soon",
+    "ok": "ok",
+    None: "unknown"
+}
+
+
+def reorder_status(current_stock, reorder_point):
+    """
+    Classify how urgently a product needs to be reordered.
+
+    Args:
+        current_stock (int): Units currently in stock, or "Unknown"
+        reorder_point (int): Stock level at which to reorder, or None
+
+    Returns:
+        str: "order_now", "order_soon", "ok", or None if the numbers are missing
+    """
+    if current_stock == "Unknown" or current_stock is None or reorder_point is None:
+        return None
+    if current_stock <= reorder_point:
+        return "order_now"
+    if current_stock <= reorder_point * 1.2:
+        return "order_soon"
+    return "ok"
+
+
+def render_response_markdown(response):
+    """
+    Render an API response as the user-friendly markdown answer.
+
+    Args:
+        response (dict): API response in JSON format
+
+    Returns:
+        str: Formatted user-friendly response
+    """
+    if "error" in response:
+        return f"❌ {response['error']}"
+
+    # Extract key information
+    reorder_point = response.get("Reorder Point")
+    safety_stock = response.get("Safety Stock")
+    current_stock = response.get("Current Stock", "Unknown")
+    forecast_data = response.get("Forecast", {})
+    plot_url = response.get("Plot URL", None)
+    warnings = response.get("Warnings", [])
+    mock_note = response.get("Note", None)
+
+    # Create a summary response
+    output = []
+
+    # Main insight
+    if current_stock != "Unknown" and reorder_point is not None:
+        if current_stock <= reorder_point:
+            output.append(f"📉 **Stock Alert: Current stock ({current_stock} units) is at or below reorder point!**")
+        else:
+            output.append(f"📊 **Stock Status: Current stock ({current_stock} units) is above reorder point.**")
+    else:
+        output.append("📊 **Inventory Forecast Summary:**")
+
+    # Key numbers
+    output.append("\n**Key Inventory Numbers:**")
+    if reorder_point is not None:
+        output.append(f"➡️ Reorder Point: **{reorder_point} units** (place order when stock drops to this level)")
+    if safety_stock is not None:
+        output.append(f"➡️ Safety Stock: **{safety_stock} units** (minimum buffer to maintain)")
+    if current_stock != "Unknown":
+        output.append(f"➡️ Current Stock: **{current_stock} units**")
+
+    # Forecast data
+    if forecast_data:
+        output.append("\n**Demand Forecast:**")
+        output.append(render_forecast_table(forecast_data))
+
+    # Priority alerts/warnings
+    if warnings:
+        output.append("\n⚠️ **Priority Alerts:**")
+        for warning in warnings:
+            output.append(f"- {warning}")
+
+    # Actionable advice
+    output.append("\n**Recommendations:**")
+    status = reorder_status(current_stock, reorder_point)
+    if status is not None:
+        if status == "order_now":
+            output.append("🚨 **Place an order immediately** to avoid stockouts.")
+        elif status == "order_soon":
+            output.append("⚠️ **Consider placing an order soon** as stock is getting close to reorder point.")
+        else:
+            output.append("✅ Stock levels look good. No immediate action required.")
+    else:
+        if reorder_point is not None:
+            output.append(f"📝 Monitor stock levels and place orders when they drop below {reorder_point} units.")
+
+    # If forecast chart is available
+    if plot_url:
+        output.append(f"\n📈 A forecast chart is available at: {plot_url}")
+
+    # Add mock data note if present
+    if mock_note:
+        output.append(f"\n🔍 Note: {mock_note}")
+
+    return "\n".join(output)
+
+
+def render_batch_markdown(responses, days):
+    """
+    Summarize API responses for several products in one markdown table.
+
+    Args:
+        responses (dict): Product ID -> API response
+        days (int): Number of forecast days in each response
+
+    Returns:
+        str: Formatted summary with per-product reorder status
+    """
+    output = [f"📊 **Inventory Summary for {len(responses)} products (next {days} days):**\n"]
+
+    headers = ["Product", "Current Stock", "Reorder Point", "Safety Stock", "Forecast Demand", "Status"]
+    table = []
+    alerts = []
+    order_now = []
+    order_soon = []
+    mock_products = []
+    stale_products = []
+
+    for product_id, response in responses.items():
+        if "error" in response:
+            table.append([product_id, "N/A", "N/A", "N/A", "N/A", f"❌ {response['error']}"])
+            continue
+
+        reorder_point = response.get("Reorder Point")
+        current_stock = response.get("Current Stock", "Unknown")
+        forecast_data = response.get("Forecast", {})
+        if isinstance(forecast_data, CompactForecast):
+            demand = forecast_data.total()
+        else:
+            demand = sum(
+                info.get("forecast", 0) for info in forecast_data.values()
+                if isinstance(info.get("forecast"), (int, float))
+            )
+
+        status = reorder_status(current_stock, reorder_point)
+        if status == "order_now":
+            order_now.append(product_id)
+        elif status == "order_soon":
+            order_soon.append(product_id)
+
+        table.append([
+            product_id,
+            current_stock if current_stock != "Unknown" else "N/A",
+            reorder_point if reorder_point is not None else "N/A",
+            response.get("Safety Stock", "N/A"),
+            round(demand, 1) if forecast_data else "N/A",
+            STATUS_LABELS[status]
+        ])
+
+        for warning in response.get("Warnings", []):
+            alerts.append(f"- {product_id}: {warning}")
+        if response.get("Stale"):
+            stale_products.append(product_id)
+        elif response.get("Note"):
+            mock_products.append(product_id)
+
+    from tabulate import tabulate  # imported on first use to keep startup fast
+    output.append(tabulate(table, headers=headers, tablefmt="pipe"))
+
+    if alerts:
+        output.append("\n⚠️ **Priority Alerts:**")
+        output.extend(alerts)
+
+    output.append("\n**Recommendations:**")
+    if order_now:
+        output.append(f"🚨 **Place orders immediately** for: {', '.join(order_now)}")
+    if order_soon:
+        output.append(f"⚠️ **Consider ordering soon** for: {', '.join(order_soon)}")
+    if not order_now and not order_soon:
+        output.append("✅ Stock levels look good. No immediate action required.")
+
+    if stale_products:
+        output.append(f"\n🔍 Note: Showing the last known forecast for {', '.join(stale_products)} (API unavailable)")
+    if mock_products:
+        output.append(f"\n🔍 Note: Using mock data for {', '.join(mock_products)} (API unreachable)")
+
+    return "\n".join(output)
+
+
+class ForecastResult:
+    """
+    Structured answer to a single-product query.
+
+    Holds the inventory numbers, forecast series, warnings and reorder
+    recommendation. Forecast arrays and the markdown, JSON and compact
+    renderings are only built when they are first asked for, so machine
+    clients that read the attributes skip string formatting entirely.
+    """
+
+    __slots__ = ("product_id", "days", "reorder_point", "safety_stock", "current_stock",
+                 "warnings", "plot_url", "note", "stale", "error",
+                 "_response", "_series", "_markdown")
+
+    def __init__(self, product_id=None, days=None, response=None, error=None):
+        """
+        Args:
+            product_id (str): The product ID the answer is about
+            days (int): Number of forecast days requested
+            response (dict): API (or fallback) response to wrap
+            error (str): Message to show instead of a forecast
+        """
+        response = response or {}
+        self.product_id = product_id
+        self.days = days
+        self.reorder_point = response.get("Reorder Point")
+        self.safety_stock = response.get("Safety Stock")
+        current_stock = response.get("Current Stock")
+        self.current_stock = None if current_stock == "Unknown" else current_stock
+        self.warnings = response.get("Warnings", [])
+        self.plot_url = response.get("Plot URL")
+        self.note = response.get("Note")
+        self.stale = bool(response.get("Stale"))
+        self.error = error or response.get("error")
+
+        self._response = response
+        self._series = None
+        self._markdown = None
+
+    def __str__(self):
+        return self.to_markdown()
+
+    def __repr__(self):
+        return f"<ForecastResult {self.to_compact()}>"
+
+    @property
+    def recommendation(self):
+        """Reorder status: "order_now", "order_soon", "ok", or None if unknown."""
+        current_stock = "Unknown" if self.current_stock is None else self.current_stock
+        return reorder_status(current_stock, self.reorder_point)
+
+    def _get_series(self):
+        if self._series is None:
+            forecast_data = self._response.get("Forecast") or {}
+            if isinstance(forecast_data, CompactForecast):
+                dates, forecast, lower_bound, upper_bound = forecast_columns(forecast_data)
+                self._series = (list(dates), forecast, lower_bound, upper_bound)
+                return self._series
+            dates = sorted(forecast_data)
+            self._series = (
+                dates,
+                [forecast_data[date_str].get("forecast") for date_str in dates],
+                [forecast_data[date_str].get("lower_bound") for date_str in dates],
+                [forecast_data[date_str].get("upper_bound") for date_str in dates],
+            )
+        return self._series
+
+    @property
+    def dates(self):
+        """Forecast dates as "YYYY-MM-DD" strings, in order."""
+        return self._get_series()[0]
+
+    @property
+    def forecast(self):
+        """Forecast demand per date."""
+        return self._get_series()[1]
+
+    @property
+    def lower_bound(self):
+        """Lower bound of the forecast per date."""
+        return self._get_series()[2]
+
+    @property
+    def upper_bound(self):
+        """Upper bound of the forecast per date."""
+        return self._get_series()[3]
+
+    def render(self, fmt="markdown"):
+        """
+        Render the result in the given format.
+
+        Args:
+            fmt (str): "markdown", "json" or "compact"
+
+        Returns:
+            str: Rendered result
+        """
+        if fmt == "markdown":
+            return self.to_markdown()
+        if fmt == "json":
+            return self.to_json()
+        if fmt == "compact":
+            return self.to_compact()
+        raise ValueError(f"Unknown output format: {fmt}")
+
+    def to_markdown(self):
+        """The same markdown answer InventoryAssistant.process_response produces."""
+        if self._markdown is None:
+            if self._response:
+                self._markdown = render_response_markdown(self._response)
+            else:
+                self._markdown = self.error or ""
+        return self._markdown
+
+    def to_dict(self):
+        """JSON-serializable dict of the result."""
+        if self.error:
+            return {"product_id": self.product_id, "days": self.days, "error": self.error}
+        dates, forecast, lower_bound, upper_bound = self._get_series()
+        return {
+            "product_id": self.product_id,
+            "days": self.days,
+            "reorder_point": self.reorder_point,
+            "safety_stock": self.safety_stock,
+            "current_stock": self.current_stock,
+            "recommendation": self.recommendation,
+            "forecast": [
+                {"date": date_str, "forecast": value, "lower_bound": lower, "upper_bound": upper}
+                for date_str, value, lower, upper in zip(dates, forecast, lower_bound, upper_bound)
+            ],
+            "warnings": list(self.warnings),
+            "plot_url": self.plot_url,
+            "note": self.note,
+            "stale": self.stale,
+        }
+
+    def to_json(self, **kwargs):
+        """
+        Serialize the result as JSON.
+
+        Args:
+            **kwargs: Options passed on to json.dumps
+
+        Returns:
+            str: JSON document
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_compact(self):
+        """One-line summary, e.g. "P001 7d: stock 525, reorder point 527, demand 712 -> order now"."""
+        if self.error:
+            return f"{self.product_id or '?'}: error: {self.error}"
+        demand = sum(value for value in self.forecast if isinstance(value, (int, float)))
+        parts = [
+            f"stock {self.current_stock if self.current_stock is not None else 'N/A'}",
+            f"reorder point {self.reorder_point if self.reorder_point is not None else 'N/A'}",
+            f"demand {round(demand, 1)}",
+        ]
+        line = f"{self.product_id} {self.days}d: {', '.join(parts)} -> {COMPACT_LABELS[self.recommendation]}"
+        if self.stale:
+            line += " (stale)"
+        elif self.note:
+            line += " (mock)"
+        return line
+
+
+class BatchForecastResult:
+    """
+    Structured answer to a multi-product query: one ForecastResult per
+    product, rendered together only when asked for.
+    """
+
+    __slots__ = ("days", "results", "_responses", "_markdown")
+
+    def __init__(self, responses, days):
+        """
+        Args:
+            responses (dict): Product ID -> API (or fallback) response
+            days (int): Number of forecast days requested
+        """
+        self.days = days
+        self.results = [ForecastResult(product_id, days, response) for product_id, response in responses.items()]
+        self._responses = responses
+        self._markdown = None
+
+    def __str__(self):
+        return self.to_markdown()
+
+    def render(self, fmt="markdown"):
+        """
+        Render the result in the given format.
+
+        Args:
+            fmt (str): "markdown", "json" or "compact"
+
+        Returns:
+            str: Rendered result
+        """
+        if fmt == "markdown":
+            return self.to_markdown()
+        if fmt == "json":
+            return self.to_json()
+        if fmt == "compact":
+            return self.to_compact()
+        raise ValueError(f"Unknown output format: {fmt}")
+
+    def to_markdown(self):
+        """The same summary InventoryAssistant.process_batch_response produces."""
+        if self._markdown is None:
+            self._markdown = render_batch_markdown(self._responses, self.days)
+        return self._markdown
+
+    def to_dict(self):
+        """JSON-serializable dict of the result."""
+        return {"days": self.days, "products": [result.to_dict() for result in self.results]}
+
+    def to_json(self, **kwargs):
+        """Serialize the result as JSON (kwargs are passed on to json.dumps)."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_compact(self):
+        """One line per product."""
+        return "\n".join(result.to_compact() for result in self.results)
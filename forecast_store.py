@@ -0,0 +1,162 @@
+import json
+import sqlite3
+import threading
+import time
+from datetime import date
+
+from compact_forecast import compact_response, json_default
+from forecast_cache import slice_response
+
+
+class ForecastStore:
+    """
+    On-disk SQLite store for forecast API responses.
+
+    Responses are kept per (product_id, days, fetch_date), so a restarted
+    process can warm its cache and still show real (if stale) forecasts when
+    the API is unreachable. Old rows are removed by compact(). Forecasts are
+    written in the API's JSON layout and read back as CompactForecast.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS forecasts (
+            product_id TEXT NOT NULL,
+            days INTEGER NOT NULL,
+            fetch_date TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            response TEXT NOT NULL,
+            PRIMARY KEY (product_id, days, fetch_date)
+        )
+    """
+
+    def __init__(self, path, max_age_days=7, keep_per_key=1):
+        """
+        Args:
+            path (str): SQLite database file (created if missing)
+            max_age_days (float): Rows older than this are removed on compaction (default: 7)
+            keep_per_key (int): Fetch dates kept per product and horizon (default: 1)
+        """
+        self.path = path
+        self.max_age_days = max_age_days
+        self.keep_per_key = keep_per_key
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(self.SCHEMA)
+
+        self.writes = 0
+        self.reads = 0
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def put(self, product_id, days, response, fetched_at=None):
+        """
+        Save a response, replacing one fetched earlier the same day.
+
+        Args:
+            product_id (str): The product ID
+            days (int): Number of forecast days in the response
+            response (dict): API response (JSON serializable apart from a CompactForecast)
+            fetched_at (float): Unix time of the fetch (default: now)
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        fetch_date = date.fromtimestamp(fetched_at).isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO forecasts VALUES (?, ?, ?, ?, ?)",
+                (product_id, days, fetch_date, fetched_at, json.dumps(response, default=json_default)),
+            )
+            self.writes += 1
+
+    def latest(self, product_id, days):
+        """
+        Most recent stored response covering at least `days` days.
+
+        Args:
+            product_id (str): The product ID
+            days (int): Number of forecast days requested
+
+        Returns:
+            tuple: (response, age in seconds), or None if nothing is stored
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT days, fetched_at, response FROM forecasts"
+                " WHERE product_id = ? AND days >= ?"
+                " ORDER BY fetched_at DESC, days ASC LIMIT 1",
+                (product_id, days),
+            ).fetchone()
+            self.reads += 1
+        if row is None:
+            return None
+
+        stored_days, fetched_at, payload = row
+        response = compact_response(json.loads(payload))
+        if stored_days > days:
+            response = slice_response(response, days)
+        return response, max(0.0, time.time() - fetched_at)
+
+    def recent(self, limit=None):
+        """
+        Newest stored response for each product and horizon, oldest first.
+
+        Args:
+            limit (int): Return at most this many of the newest entries
+
+        Returns:
+            list: (product_id, days, response, age in seconds) tuples
+        """
+        query = (
+            "SELECT product_id, days, MAX(fetched_at), response FROM forecasts"
+            " GROUP BY product_id, days ORDER BY MAX(fetched_at) DESC"
+        )
+        params = ()
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (limit,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        now = time.time()
+        return [
+            (product_id, days, compact_response(json.loads(payload)), max(0.0, now - fetched_at))
+            for product_id, days, fetched_at, payload in reversed(rows)
+        ]
+
+    def compact(self):
+        """
+        Remove rows older than max_age_days and all but the newest
+        keep_per_key fetch dates of each product and horizon.
+
+        Returns:
+            int: Number of rows removed
+        """
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._lock, self._conn:
+            removed = self._conn.execute("DELETE FROM forecasts WHERE fetched_at < ?", (cutoff,)).rowcount
+            removed += self._conn.execute(
+                "DELETE FROM forecasts WHERE rowid IN ("
+                " SELECT rowid FROM (SELECT rowid, ROW_NUMBER() OVER ("
+                "  PARTITION BY product_id, days ORDER BY fetched_at DESC) AS rank FROM forecasts)"
+                " WHERE rank > ?)",
+                (self.keep_per_key,),
+            ).rowcount
+        return removed
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM forecasts").fetchone()[0]
+
+    def stats(self):
+        """Return store counters as a dict."""
+        return {
+            "path": self.path,
+            "rows": len(self),
+            "reads": self.reads,
+            "writes": self.writes,
+        }
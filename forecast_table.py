@@ -0,0 +1,199 @@
+import datetime
+import math
+from functools import lru_cache
+
+from compact_forecast import CompactForecast
+
+
+HEADERS = ["Date", "Forecast", "Range"]
+
+# tabulate pads every header by 2 characters when computing column widths
+MIN_PADDING = 2
+
+
+@lru_cache(maxsize=4096)
+def format_forecast_date(date_str):
+    """
+    Format a "YYYY-MM-DD" date string as "04 Oct, 2023".
+
+    Returns:
+        str: Formatted date, or None if the string isn't a valid date
+    """
+    try:
+        return datetime.datetime.strptime(date_str, "%Y-%m-%d").strftime("%d %b, %Y")
+    except (TypeError, ValueError):
+        return None
+
+
+def forecast_columns(forecast_data):
+    """
+    Dates and values of a forecast in chronological order.
+
+    A CompactForecast is read straight from its arrays; for the dict layout
+    the dates are sorted and missing values are "N/A".
+
+    Args:
+        forecast_data (dict): Date string -> {"forecast", "lower_bound", "upper_bound"},
+            or a CompactForecast
+
+    Returns:
+        tuple: (dates, forecast values, lower bounds, upper bounds) as lists
+    """
+    if isinstance(forecast_data, CompactForecast):
+        return (forecast_data.dates(), forecast_data.forecast.tolist(),
+                forecast_data.lower_bound.tolist(), forecast_data.upper_bound.tolist())
+    dates = sorted(forecast_data)
+    infos = [forecast_data[date_str] for date_str in dates]
+    return (dates,
+            [info.get("forecast", "N/A") for info in infos],
+            [info.get("lower_bound", "N/A") for info in infos],
+            [info.get("upper_bound", "N/A") for info in infos])
+
+
+def forecast_rows(forecast_data):
+    """
+    Build the [date, forecast, range] rows shown in the forecast table.
+
+    Args:
+        forecast_data (dict): Date string -> {"forecast", "lower_bound", "upper_bound"},
+            or a CompactForecast
+
+    Returns:
+        list: Rows sorted chronologically
+    """
+    rows = []
+    for date_str, forecast_val, lower_bound, upper_bound in zip(*forecast_columns(forecast_data)):
+        forecast_val = round(forecast_val, 1) if isinstance(forecast_val, (int, float)) else forecast_val
+        lower_bound = round(lower_bound, 1) if isinstance(lower_bound, (int, float)) else lower_bound
+        upper_bound = round(upper_bound, 1) if isinstance(upper_bound, (int, float)) else upper_bound
+
+        range_val = f"{lower_bound}–{upper_bound}" if lower_bound != "N/A" and upper_bound != "N/A" else "N/A"
+        formatted_date = format_forecast_date(date_str) or date_str
+
+        rows.append([formatted_date, forecast_val, range_val])
+    return rows
+
+
+def iter_forecast_table(forecast_data):
+    """
+    Yield the lines of the forecast table as a markdown pipe table.
+
+    The output is byte-identical to tabulate(..., tablefmt="pipe") for the
+    rows built by forecast_rows. Cell strings and column widths are computed
+    in one pass, then lines are produced one at a time. Tables with values
+    this fast path doesn't handle (non-numeric forecasts, unparseable dates,
+    non-finite numbers) are rendered by tabulate instead.
+
+    Args:
+        forecast_data (dict): Date string -> {"forecast", "lower_bound", "upper_bound"},
+            or a CompactForecast
+
+    Yields:
+        str: Header, separator and one line per date
+    """
+    cells = _fast_cells(forecast_data)
+    if cells is None:
+        # Only unusual tables need tabulate, so it's imported on first use
+        from tabulate import tabulate
+        yield from tabulate(forecast_rows(forecast_data), headers=HEADERS, tablefmt="pipe").split("\n")
+        return
+
+    dates, values, ranges, any_float = cells
+
+    if any_float:
+        # Decimal alignment: pad so that the decimal points line up
+        after = [_afterpoint(value) for value in values]
+        max_after = max(after)
+        values = [value + " " * (max_after - count) for value, count in zip(values, after)]
+
+    date_width = max(len(HEADERS[0]) + MIN_PADDING, max(map(len, dates)))
+    value_width = max(len(HEADERS[1]) + MIN_PADDING, max(map(len, values)))
+    range_width = max(len(HEADERS[2]) + MIN_PADDING, max(map(len, ranges)))
+
+    yield f"| {HEADERS[0]:<{date_width}} | {HEADERS[1]:>{value_width}} | {HEADERS[2]:<{range_width}} |"
+    yield f"|:{'-' * (date_width + 1)}|{'-' * (value_width + 1)}:|:{'-' * (range_width + 1)}|"
+    for date_cell, value, range_val in zip(dates, values, ranges):
+        yield f"| {date_cell:<{date_width}} | {value:>{value_width}} | {range_val:<{range_width}} |"
+
+
+def render_forecast_table(forecast_data):
+    """
+    Render the forecast table as a markdown pipe table.
+
+    Args:
+        forecast_data (dict): Date string -> {"forecast", "lower_bound", "upper_bound"},
+            or a CompactForecast
+
+    Returns:
+        str: The table, identical to the tabulate pipe output
+    """
+    return "\n".join(iter_forecast_table(forecast_data))
+
+
+def _fast_cells(forecast_data):
+    """
+    Cell strings for the fast path, or None if tabulate is needed.
+
+    Returns:
+        tuple: (dates, values, ranges, any_float)
+    """
+    if isinstance(forecast_data, CompactForecast) and len(forecast_data) and all(
+            array.dtype.kind == "i"
+            for array in (forecast_data.forecast, forecast_data.lower_bound, forecast_data.upper_bound)):
+        # Whole numbers need no rounding or type checks, and the dates of a window are formatted once
+        dates = _formatted_dates(forecast_data.start.toordinal(), len(forecast_data))
+        values = list(map(str, forecast_data.forecast.tolist()))
+        ranges = [f"{lower}–{upper}" for lower, upper in
+                  zip(forecast_data.lower_bound.tolist(), forecast_data.upper_bound.tolist())]
+        return dates, values, ranges, False
+
+    dates = []
+    values = []
+    ranges = []
+    any_float = False
+
+    for date_str, forecast_val, lower_bound, upper_bound in zip(*forecast_columns(forecast_data)):
+        formatted_date = format_forecast_date(date_str)
+        if formatted_date is None or type(forecast_val) not in (int, float):
+            return None
+
+        if type(forecast_val) is float:
+            if not math.isfinite(forecast_val):
+                return None
+            any_float = True
+
+        if lower_bound != "N/A" and upper_bound != "N/A":
+            if type(lower_bound) not in (int, float) or type(upper_bound) not in (int, float):
+                return None
+            ranges.append(f"{round(lower_bound, 1)}–{round(upper_bound, 1)}")
+        else:
+            ranges.append("N/A")
+
+        dates.append(formatted_date)
+        values.append(round(forecast_val, 1))
+
+    if not dates:
+        return None
+
+    if any_float:
+        # tabulate formats a column containing any float with the "g" format
+        values = [format(float(value), "g") for value in values]
+    else:
+        values = [str(value) for value in values]
+
+    return dates, values, ranges, any_float
+
+
+@lru_cache(maxsize=256)
+def _formatted_dates(start_ordinal, days):
+    """Table date cells for a window of `days` days starting at a date ordinal."""
+    start = datetime.date.fromordinal(start_ordinal)
+    return tuple((start + datetime.timedelta(days=offset)).strftime("%d %b, %Y") for offset in range(days))
+
+
+def _afterpoint(value):
+    """Number of characters after the decimal point (or exponent), -1 if none."""
+    pos = value.rfind(".")
+    if pos < 0:
+        pos = value.rfind("e")
+    return len(value) - pos - 1 if pos >= 0 else -1
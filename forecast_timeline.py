@@ -0,0 +1,232 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+
+import numpy as np
+
+from compact_forecast import CompactForecast
+from forecast_cache import slice_warnings
+
+
+# Response fields other than "Forecast" that describe the product as of the fetch
+SUMMARY_FIELDS = ("Reorder Point", "Safety Stock", "Current Stock", "Warnings", "Plot URL")
+
+
+class ForecastTimeline:
+    """
+    Per-product forecast days collected from API responses, keyed by date.
+
+    Overlapping windows share days: a 90-day forecast fetched yesterday still
+    covers 89 of today's 90 days, and a 7-day query after a 30-day one needs
+    no request at all. Each day expires `day_ttl` seconds after it was
+    fetched; the stock numbers (current stock, reorder point, ...) expire
+    after `summary_ttl`, since they change faster than the forecast itself.
+    Days before today are dropped.
+
+    The warnings and plot link depend on the horizon, so they are only used
+    for windows that end no later than the response they came from; a longer
+    window, or stale stock numbers, needs a request for the whole window.
+
+    Each product's days are kept as one CompactForecast over a contiguous date
+    range, with the fetch time of every day in a parallel array.
+    """
+
+    def __init__(self, day_ttl=6 * 3600, summary_ttl=300, max_products=1024):
+        """
+        Args:
+            day_ttl (float): Seconds a fetched forecast day stays valid (default: 6 hours)
+            summary_ttl (float): Seconds the stock numbers stay valid (default: 300)
+            max_products (int): Products kept, least recently used dropped first (default: 1024)
+        """
+        self.day_ttl = day_ttl
+        self.summary_ttl = summary_ttl
+        self.max_products = max_products
+        # product_id -> {"forecast": CompactForecast or None, "fetched_at": array of fetch times
+        #                per day, "summary": (dict, fetched_at, day after the last forecast date)}
+        self._products = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.days_requested = 0
+        self.days_fetched = 0
+
+    def missing(self, product_id, days, today=None, now=None):
+        """
+        Find what has to be fetched to answer a `days`-day query.
+
+        Args:
+            product_id (str): The product ID
+            days (int): Number of forecast days requested
+            today (date): First day of the window (default: today)
+            now (float): Current time.time() (default: now)
+
+        Returns:
+            tuple: (first date, number of days) to fetch, (today, days) if only the
+                   stock numbers are out of date or the warnings were fetched for
+                   a shorter window, or None if nothing is missing
+        """
+        today = today or date.today()
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._products.get(product_id)
+            forecast = entry and entry["forecast"]
+            if not forecast or forecast.start > today:
+                return today, days
+
+            first = today.toordinal() - forecast.start.toordinal()
+            covered = max(0, min(days, len(forecast) - first))
+            expired = np.flatnonzero(now - entry["fetched_at"][first:first + covered] >= self.day_ttl)
+            offset = int(expired[0]) if expired.size else covered
+            if offset < days:
+                # Fetch from the first missing day to the end of the window
+                return today + timedelta(days=offset), days - offset
+
+            _, summary_at, summary_end = entry["summary"]
+            if now - summary_at >= self.summary_ttl or summary_end < today + timedelta(days=days):
+                return today, days
+            return None
+
+    def plan(self, product_id, days, partial=False, today=None, now=None):
+        """
+        Decide which request answers a `days`-day query.
+
+        Args:
+            product_id (str): The product ID
+            days (int): Number of forecast days requested
+            partial (bool): The API can start a forecast at a later date, so only
+                the missing tail of the window is requested (default: False)
+            today (date): First day of the window (default: today)
+            now (float): Current time.time() (default: now)
+
+        Returns:
+            tuple: (first date, number of days) to request, or None if the stored
+                   days already answer the query
+        """
+        today = today or date.today()
+        gap = self.missing(product_id, days, today, now)
+        if gap is None or gap[0] == today or partial:
+            return gap
+        # Without a start date the API always forecasts from today
+        return today, days
+
+    def merge(self, product_id, response, fetched_at=None, today=None):
+        """
+        Add the days and stock numbers of an API response.
+
+        Args:
+            product_id (str): The product ID
+            response (dict): API response with a "Forecast" dict keyed by date,
+                or a CompactForecast
+            fetched_at (float): time.time() of the fetch (default: now)
+            today (date): Days before this date are dropped (default: today)
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        today = today or date.today()
+        forecast = response.get("Forecast")
+        if forecast and not isinstance(forecast, CompactForecast):
+            # Days that can't be stored compactly aren't kept; they are fetched every time
+            # (InventoryAssistant.merge_fetch adds them to the answer as a dict)
+            forecast = CompactForecast.from_dict(forecast)
+        with self._lock:
+            entry = self._products.get(product_id)
+            if entry is None:
+                entry = self._products[product_id] = {"forecast": None, "fetched_at": None,
+                                                      "summary": ({}, 0.0, today)}
+            self._products.move_to_end(product_id)
+
+            if forecast:
+                entry["forecast"], entry["fetched_at"] = _combine(
+                    entry["forecast"], entry["fetched_at"], forecast, fetched_at)
+            if entry["forecast"]:
+                # Drop days before today
+                stored = entry["forecast"]
+                first = min(max(today.toordinal() - stored.start.toordinal(), 0), len(stored))
+                if first:
+                    entry["forecast"] = stored.window(stored.start + timedelta(days=first), len(stored) - first)
+                    entry["fetched_at"] = entry["fetched_at"][first:]
+
+            # A forecast that couldn't be stored counts as covering no days, so its
+            # warnings are never used for another window
+            entry["summary"] = ({field: response[field] for field in SUMMARY_FIELDS if field in response},
+                                fetched_at, forecast.end if forecast else today)
+
+            while len(self._products) > self.max_products:
+                self._products.popitem(last=False)
+
+    def build(self, product_id, days, today=None):
+        """
+        Assemble a response for a `days`-day window from stored days.
+
+        Call after missing() returned None (or after merging what it asked for).
+
+        Returns:
+            dict: Response shaped like the API's, with a CompactForecast sharing the
+                  stored arrays and only the warnings that apply to the window,
+                  or None if the product is unknown
+        """
+        today = today or date.today()
+        with self._lock:
+            entry = self._products.get(product_id)
+            if entry is None:
+                return None
+            summary, _, summary_end = entry["summary"]
+            response = dict(summary)
+            if response.get("Warnings") and today + timedelta(days=days) < summary_end:
+                response["Warnings"] = slice_warnings(response["Warnings"], days)
+            forecast = entry["forecast"]
+            response["Forecast"] = forecast.window(today, days) if forecast else {}
+            return response
+
+    def record_fetch(self, days_requested, days_fetched):
+        """Count forecast days asked for by callers vs. fetched from the API."""
+        with self._lock:
+            self.days_requested += days_requested
+            self.days_fetched += days_fetched
+
+    def clear(self):
+        """Drop all stored days (counters are kept)."""
+        with self._lock:
+            self._products.clear()
+
+    def stats(self):
+        """Return timeline counters as a dict."""
+        with self._lock:
+            return {
+                "products": len(self._products),
+                "days_requested": self.days_requested,
+                "days_fetched": self.days_fetched,
+                "days_saved": self.days_requested - self.days_fetched,
+            }
+
+
+def _combine(stored, stored_at, new, fetched_at):
+    """
+    Overlay newly fetched days on the stored ones.
+
+    Returns:
+        tuple: (CompactForecast, fetch time per day). If the two ranges neither
+               overlap nor touch, or hold different value types, only the new
+               days are kept, so the range stays contiguous.
+    """
+    new_at = np.full(len(new), fetched_at)
+    if (not stored or new.start > stored.end or stored.start > new.end
+            or stored.forecast.dtype != new.forecast.dtype
+            or stored.lower_bound.dtype != new.lower_bound.dtype
+            or stored.upper_bound.dtype != new.upper_bound.dtype):
+        return new, new_at
+
+    start = min(stored.start, new.start)
+    length = max(stored.end, new.end).toordinal() - start.toordinal()
+    stored_offset = stored.start.toordinal() - start.toordinal()
+    new_offset = new.start.toordinal() - start.toordinal()
+
+    arrays = []
+    for field in ("forecast", "lower_bound", "upper_bound"):
+        array = np.empty(length, dtype=getattr(new, field).dtype)
+        array[stored_offset:stored_offset + len(stored)] = getattr(stored, field)
+        array[new_offset:new_offset + len(new)] = getattr(new, field)
+        arrays.append(array)
+    times = np.empty(length)
+    times[stored_offset:stored_offset + len(stored)] = stored_at
+    times[new_offset:new_offset + len(new)] = new_at
+    return CompactForecast(start, *arrays), times
@@ -1,8 +1,23 @@
-import requests
+import importlib
 import json
+import os
 import datetime
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
-from tabulate import tabulate
+from admission import INTERACTIVE, AdmissionController, AdmissionRejected
+from circuit_breaker import CircuitBreaker
+from compact_forecast import CompactForecast, compact_response
+from forecast_cache import ForecastCache
+from forecast_result import (BatchForecastResult, ForecastResult, render_batch_markdown,
+                             render_response_markdown)
+from forecast_table import format_forecast_date
+from metrics import Metrics
+from query_parser import QueryParser
+from single_flight import SingleFlight
+
 
 class InventoryAssistant:
     """
@@ -10,40 +25,498 @@ class InventoryAssistant:
     to provide inventory predictions and recommendations.
     """
     
-    def __init__(self):
-        self.api_url = "https://model-ai-inventory.onrender.com/forecast"
+    # HTTP statuses worth retrying (gateway errors while the Render instance wakes up)
+    RETRY_STATUSES = (502, 503, 504)
+    
+    MISSING_PRODUCT_MESSAGE = "I need a product ID to check inventory forecast. Please specify a product ID (e.g., P001)."
+    
+    DEFAULT_API_URL = "https://model-ai-inventory.onrender.com/forecast"
+    
+    # Imported in the background by warm_up instead of at startup
+    WARM_UP_MODULES = ("requests", "numpy", "tabulate")
+    
+    def __init__(self, api_url=None, cache_ttl=300, cache_max_entries=1024, pool_size=10,
+                 max_retries=2, backoff_factor=0.2, connect_timeout=3.05, read_timeout=5,
+                 batch_workers=8, breaker_failure_threshold=5, breaker_reset_timeout=30,
+                 mock_seed=0, store_path=None, store_max_age_days=7, prefetch_top_n=0,
+                 prefetch_interval=30, prefetch_rate_limit=2, enable_metrics=False, delta_fetch=False,
+                 forecast_day_ttl=6 * 3600, api_supports_start_date=False, rate_limit=None, rate_burst=None,
+                 admission_queue_size=100, admission_max_wait=None):
+        """
+        Args:
+            api_url (str): Forecast API endpoint (default: the Render deployment)
+            cache_ttl (float): Seconds a cached forecast stays fresh (default: 300)
+            cache_max_entries (int): Maximum cached forecasts, 0 disables caching (default: 1024)
+            pool_size (int): Maximum pooled keep-alive connections to the API (default: 10)
+            max_retries (int): Retries after a failed connection or gateway error (default: 2)
+            backoff_factor (float): Base delay in seconds between retries (default: 0.2)
+            connect_timeout (float): Seconds to wait for a connection (default: 3.05)
+            read_timeout (float): Seconds to wait for the API response (default: 5)
+            batch_workers (int): Maximum concurrent API calls for multi-product queries (default: 8)
+            breaker_failure_threshold (int): Consecutive API failures before failing fast (default: 5)
+            breaker_reset_timeout (float): Seconds to fail fast before trying the API again (default: 30)
+            mock_seed (int): Seed for the mock data used when the API is unreachable (default: 0)
+            store_path (str): SQLite file to persist forecasts in, None disables it (default: None)
+            store_max_age_days (float): Days stored forecasts are kept (default: 7)
+            prefetch_top_n (int): Most queried products refreshed in the background
+                before their cache entries expire, 0 disables it (default: 0)
+            prefetch_interval (float): Seconds between background refresh passes (default: 30)
+            prefetch_rate_limit (float): Maximum background API requests per second (default: 2)
+            enable_metrics (bool): Record stage timings and counters in self.metrics (default: False)
+            delta_fetch (bool): Keep a per-product timeline of forecast days and only
+                request days that are missing or expired (default: False)
+            forecast_day_ttl (float): Seconds a fetched forecast day stays valid with delta_fetch
+                (default: 6 hours)
+            api_supports_start_date (bool): The API accepts a "start_date" field, so delta_fetch
+                can request just the missing date range (default: False)
+            rate_limit (float): Maximum API requests per second across all callers; requests
+                over the limit queue by priority, None disables it (default: None)
+            rate_burst (float): API requests allowed at once after a quiet period
+                (default: same as rate_limit)
+            admission_queue_size (int): Requests that may wait for the rate limit at once (default: 100)
+            admission_max_wait (dict): Priority -> longest wait in seconds before a request is
+                rejected (default: admission.DEFAULT_MAX_WAIT)
+        """
+        self.api_url = api_url or self.DEFAULT_API_URL
         self.today = date.today()
+        self.cache = ForecastCache(ttl=cache_ttl, max_entries=cache_max_entries)
+        
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = (connect_timeout, read_timeout)
+        # The HTTP session and mock generator are created on first use (see warm_up),
+        # so that requests and NumPy aren't imported before the first prompt
+        self.pool_size = pool_size
+        self._session = None
+        self._mock_generator = None
+        self._lazy_lock = threading.Lock()
+        self.mock_seed = mock_seed
+        self.batch_workers = batch_workers
+        self.parser = QueryParser()
+        self.breaker = CircuitBreaker(failure_threshold=breaker_failure_threshold,
+                                      reset_timeout=breaker_reset_timeout)
+        self.in_flight = SingleFlight()
+        self.metrics = Metrics(enabled=enable_metrics)
+        
+        self.admission = None
+        if rate_limit:
+            self.admission = AdmissionController(rate_limit, burst=rate_burst, max_queue=admission_queue_size,
+                                                 max_wait=admission_max_wait, metrics=self.metrics)
+        
+        self.timeline = None
+        if delta_fetch:
+            from forecast_timeline import ForecastTimeline
+            self.timeline = ForecastTimeline(day_ttl=forecast_day_ttl, summary_ttl=cache_ttl,
+                                             max_products=max(cache_max_entries, 1))
+        self.api_supports_start_date = api_supports_start_date
+        
+        self.store = None
+        if store_path:
+            from forecast_store import ForecastStore
+            self.store = ForecastStore(store_path, max_age_days=store_max_age_days)
+            self.store.compact()
+            self.warm_cache()
+        
+        self.prefetcher = None
+        if prefetch_top_n > 0:
+            from prefetch import PrefetchScheduler
+            self.prefetcher = PrefetchScheduler(self, top_n=prefetch_top_n, interval=prefetch_interval,
+                                                rate_limit=prefetch_rate_limit)
+            self.prefetcher.start()
+    
+    def warm_cache(self):
+        """
+        Load the newest stored forecasts into the in-memory cache.
+        
+        Entries keep their original fetch time, so only recent ones are
+        served as fresh; older ones are used as stale fallback data.
+        
+        Returns:
+            int: Number of forecasts loaded
+        """
+        entries = self.store.recent(limit=self.cache.max_entries)
+        for product_id, days, response, age in entries:
+            self.cache.put(product_id, days, response, age=age)
+        return len(entries)
+    
+    def close(self):
+        """Stop background refreshes and close the HTTP session and forecast store."""
+        if self.prefetcher is not None:
+            self.prefetcher.stop()
+            self.prefetcher = None
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        if self._session is not None:
+            self._session.close()
+    
+    @property
+    def session(self):
+        """The requests.Session for API calls, created on first use."""
+        if self._session is None:
+            with self._lazy_lock:
+                if self._session is None:
+                    self._session = self.create_session(self.pool_size)
+        return self._session
+    
+    @property
+    def mock_generator(self):
+        """The MockForecastGenerator for fallback data, created on first use."""
+        if self._mock_generator is None:
+            with self._lazy_lock:
+                if self._mock_generator is None:
+                    from mock_forecast import MockForecastGenerator
+                    self._mock_generator = MockForecastGenerator(seed=self.mock_seed)
+        return self._mock_generator
+    
+    def warm_up(self, connect=True):
+        """
+        Do the work the first query would otherwise wait for: import the HTTP
+        and numeric libraries, create the session and mock generator and, with
+        `connect`, open a connection to the API (which also wakes up a
+        sleeping free-tier deployment). Errors are ignored.
+        
+        Args:
+            connect (bool): Send a HEAD request to the API (default: True)
+        """
+        for module in self.WARM_UP_MODULES:
+            importlib.import_module(module)
+        self.mock_generator
+        session = self.session
+        if connect:
+            import requests
+            try:
+                session.head(self.api_url, timeout=self.timeout).close()
+            except requests.exceptions.RequestException:
+                pass
+    
+    def start_warm_up(self, connect=True):
+        """
+        Run warm_up on a background thread.
+        
+        Returns:
+            threading.Thread: The started (daemon) thread
+        """
+        thread = threading.Thread(target=self.warm_up, args=(connect,), name="assistant-warm-up", daemon=True)
+        thread.start()
+        return thread
+    
+    def create_session(self, pool_size):
+        """
+        Create a long-lived HTTP session with a keep-alive connection pool.
+        
+        Args:
+            pool_size (int): Maximum number of pooled connections per host
+            
+        Returns:
+            requests.Session: Session used for all API calls
+        """
+        import requests
+        session = requests.Session()
+        # Retries are handled in post_forecast so they can use jittered backoff
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def backoff_delay(self, attempt):
+        """Exponential backoff with jitter for the given retry attempt (0-based)."""
+        delay = self.backoff_factor * (2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+    
+    def post_forecast(self, payload, priority=INTERACTIVE):
+        """
+        POST a forecast request, retrying connection failures and gateway errors.
+        
+        Read timeouts are not retried: the API is already slow, and retrying
+        would multiply the time the user waits before falling back to mock data.
+        With a rate_limit every attempt, retries included, waits for admission.
+        
+        Args:
+            payload (dict): JSON body for the forecast endpoint
+            priority (str): Admission priority, INTERACTIVE, BATCH or BACKGROUND
+                (default: INTERACTIVE)
+            
+        Returns:
+            requests.Response: Successful API response
+            
+        Raises:
+            AdmissionRejected: If the rate limit won't let the request through in time
+        """
+        import requests
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            if self.admission is not None:
+                self.admission.acquire(priority)
+            self.metrics.increment("api_requests")
+            try:
+                response = self.session.post(self.api_url, json=payload, timeout=self.timeout)
+            except requests.exceptions.ConnectionError:  # includes ConnectTimeout
+                if last_attempt:
+                    raise
+            else:
+                if response.status_code not in self.RETRY_STATUSES or last_attempt:
+                    response.raise_for_status()  # Raise an exception for HTTP errors
+                    return response
+                response.close()
+            time.sleep(self.backoff_delay(attempt))
     
-    def call_api(self, product_id, days=7):
+    def call_api(self, product_id, days=7, priority=INTERACTIVE):
         """
         Call the Inventory Forecast API with parameters.
         
+        Responses are served from the forecast cache when a fresh entry for the
+        same product covers the requested horizon. Concurrent callers asking for
+        the same product, horizon and priority share a single API request. While the
+        circuit breaker is open the API is not called at all and fallback data
+        is returned at once.
+        
         Args:
             product_id (str): The product ID to get forecast for
             days (int): Number of days to forecast (default: 7)
+            priority (str): Admission priority when a rate_limit is set (default: INTERACTIVE)
             
         Returns:
             dict: JSON response from the API
         """
-        payload = {
-            "product_id": product_id,
-            "days": days
-        }
+        with self.metrics.stage("cache"):
+            cached = self.cache.get(product_id, days)
+        self.metrics.increment("cache_hits" if cached is not None else "cache_misses")
+        if self.prefetcher is not None:
+            self.prefetcher.record(product_id, days, cached is not None)
+        if cached is not None:
+            return cached
+        
+        # Priority is part of the key: a chat query must not wait in the queue of a batch lookup
+        return self.in_flight.do((product_id, days, priority), self.load_forecast, product_id, days, priority)
+    
+    def load_forecast(self, product_id, days, priority=INTERACTIVE):
+        """Fetch and cache a forecast after a cache miss, with fallback on failure."""
+        data = self.timeline_forecast(product_id, days)
+        if data is not None:
+            return data
+        
+        allowed = self.breaker.allow_request()
+        if not allowed:
+            self.metrics.increment("breaker_rejections")
+            return self.get_fallback_data(product_id, days)
         
+        import requests
         try:
-            # Try to use API with timeout to prevent long hanging connections
-            response = requests.post(self.api_url, json=payload, timeout=5)
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            return response.json()
+            data = self.fetch_forecast(product_id, days, priority)
         except requests.exceptions.RequestException as e:
-            print(f"API connection error: {str(e)}")
+            return self.handle_api_error(product_id, days, e)
+        except AdmissionRejected as e:
+            return self.handle_admission_rejected(product_id, days, e, allowed)
+        
+        if self.prefetcher is not None:
+            self.prefetcher.forget_prefetched(product_id)
+        return self.store_forecast(product_id, days, data)
+    
+    def fetch_forecast(self, product_id, days, priority=INTERACTIVE):
+        """
+        Request a forecast from the API, bypassing the cache.
+        
+        Args:
+            product_id (str): The product ID to get forecast for
+            days (int): Number of days to forecast
+            priority (str): Admission priority when a rate_limit is set (default: INTERACTIVE)
+            
+        Returns:
+            dict: Decoded JSON response
+            
+        Raises:
+            requests.exceptions.RequestException: If the API call fails
+            AdmissionRejected: If the rate limit won't let the request through in time
+        """
+        payload, fetch_days = self.plan_fetch(product_id, days)
+        if payload is None:
+            return self.timeline.build(product_id, days)
+        
+        # Pooled session with connect/read timeouts to prevent long hanging connections
+        with self.metrics.stage("http"):
+            response = self.post_forecast(payload, priority)
+        with self.metrics.stage("decode"):
+            data = response.json()
+        return self.merge_fetch(product_id, days, data, fetch_days)
+    
+    def plan_fetch(self, product_id, days):
+        """
+        Decide what to request from the API for a `days`-day forecast.
+        
+        Without delta_fetch this is always the full window. With it, only the
+        days missing from the timeline are requested: from the first missing
+        day with a "start_date" if the API supports it, otherwise the whole
+        window. The whole window is also requested when only the stock
+        numbers are out of date, since the warnings depend on the horizon.
+        
+        Returns:
+            tuple: (payload, number of days requested), or (None, 0) if the
+                   timeline already covers the window
+        """
+        if self.timeline is None:
+            return {"product_id": product_id, "days": days}, days
+        
+        today = date.today()
+        planned = self.timeline.plan(product_id, days, partial=self.api_supports_start_date, today=today)
+        if planned is None:
+            self.record_days_fetched(days, 0)
+            return None, 0
+        
+        start, count = planned
+        payload = {"product_id": product_id, "days": count}
+        if start != today:
+            payload["start_date"] = start.isoformat()
+        return payload, count
+    
+    def merge_fetch(self, product_id, days, data, fetch_days):
+        """
+        Take in a decoded API response: convert its forecast to a CompactForecast
+        and, with delta_fetch, merge the (partial) response into the timeline.
+        
+        Forecasts that can't be stored compactly (mixed int/float values, gaps
+        between dates) aren't kept in the timeline; their days are laid over the
+        stored ones as a plain dict instead, so the answer still shows them.
+        
+        Returns:
+            dict: Response for the full `days`-day window
+        """
+        if "error" in data:
+            return data
+        data = compact_response(data)
+        if self.timeline is None:
+            return data
+        self.timeline.merge(product_id, data)
+        self.record_days_fetched(days, fetch_days)
+        response = self.timeline.build(product_id, days)
+        forecast = data.get("Forecast")
+        if forecast and not isinstance(forecast, CompactForecast):
+            stored = response["Forecast"]
+            response["Forecast"] = dict(stored.to_dict() if stored else {}, **forecast)
+        return response
+    
+    def timeline_forecast(self, product_id, days):
+        """
+        Answer from the delta_fetch timeline without calling the API.
+        
+        Returns:
+            dict: Forecast built from stored days (also cached), or None if delta_fetch
+                  is off or some of the window still has to be fetched
+        """
+        if self.timeline is None or self.timeline.missing(product_id, days) is not None:
+            return None
+        data = self.timeline.build(product_id, days)
+        self.record_days_fetched(days, 0)
+        self.cache.put(product_id, days, data)
+        return data
+    
+    def record_days_fetched(self, days_requested, days_fetched):
+        self.timeline.record_fetch(days_requested, days_fetched)
+        self.metrics.increment("forecast_days_fetched", days_fetched)
+        self.metrics.increment("forecast_days_saved", max(days_requested - days_fetched, 0))
+    
+    def store_forecast(self, product_id, days, data):
+        """Cache a successful API response and return it."""
+        self.breaker.record_success()
+        # Only real API responses are cached, mock data is regenerated each time
+        if "error" not in data:
+            self.cache.put(product_id, days, data)
+            if self.store is not None:
+                self.store.put(product_id, days, data)
+        return data
+    
+    def handle_api_error(self, product_id, days, error):
+        """Report a failed API call and return fallback data instead."""
+        print(f"API connection error: {str(error)}")
+        self.metrics.increment("api_errors")
+        self.record_api_error(error)
+        return self.get_fallback_data(product_id, days)
+    
+    def record_api_error(self, error):
+        """
+        Report a failed API call to the circuit breaker. Client errors (4xx)
+        mean the API is up, so they don't count towards opening the circuit;
+        server errors, timeouts and connection errors do.
+        """
+        status = getattr(error, "status", None) or getattr(getattr(error, "response", None), "status_code", None)
+        if status is not None and status < 500:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+    
+    def handle_admission_rejected(self, product_id, days, error, allowed=True):
+        """
+        Answer a request the rate limit turned away: the last good response if
+        there is one, otherwise the reason, so the user can try again instead of
+        being shown mock numbers. The API wasn't called, so the circuit breaker
+        only gets back the trial request if `allowed` (from allow_request) was it.
+        """
+        self.breaker.release_trial(allowed)
+        stale = self.get_stale_data(product_id, days, reason="API busy")
+        if stale is not None:
+            return stale
+        return {"error": str(error)}
+    
+    def get_stale_data(self, product_id, days, reason="API unavailable"):
+        """
+        The last good response for the product from the cache or the on-disk
+        store, marked as stale.
+        
+        Args:
+            product_id (str): The product ID
+            days (int): Number of forecast days requested
+            reason (str): Why the API wasn't used, shown in the note
+            
+        Returns:
+            dict: Stale API response, or None if there is none
+        """
+        stale = self.cache.get_stale(product_id, days)
+        if stale is None and self.store is not None:
+            stale = self.store.latest(product_id, days)
+        if stale is None:
+            return None
+        
+        self.metrics.increment("stale_fallbacks")
+        response, age = stale
+        response = dict(response)
+        response["Stale"] = True
+        response["Note"] = f"Showing the last known forecast from {self.format_age(age)} ago ({reason})"
+        return response
+    
+    def get_fallback_data(self, product_id, days):
+        """
+        Data to show when the API can't be used: the last good response for the
+        product from the cache or the on-disk store (marked as stale), otherwise
+        mock data.
+        
+        Args:
+            product_id (str): The product ID
+            days (int): Number of forecast days requested
+            
+        Returns:
+            dict: Stale API response or mock response
+        """
+        stale = self.get_stale_data(product_id, days)
+        if stale is None:
             # If API is unreachable, use mock data for demonstration
+            self.metrics.increment("mock_fallbacks")
             return self.get_mock_data(product_id, days)
-            
+        return stale
+    
+    def format_age(self, seconds):
+        """Format an age in seconds as "5 min", "3 h" or "2 days"."""
+        if seconds < 3600:
+            return f"{int(seconds // 60)} min"
+        if seconds < 86400:
+            return f"{int(seconds // 3600)} h"
+        return f"{int(seconds // 86400)} days"
+    
     def get_mock_data(self, product_id, days=7):
         """
         Generate mock data for demonstration when API is unreachable.
         
+        The data is deterministic for a given product, date and `mock_seed`.
+        
         Args:
             product_id (str): The product ID for the mock data
             days (int): Number of days to generate mock forecast
@@ -51,47 +524,7 @@ class InventoryAssistant:
         Returns:
             dict: Mock API response
         """
-        import random
-        from datetime import date, timedelta
-        
-        # Generate realistic-looking mock data
-        today = date.today()
-        reorder_point = random.randint(450, 550)
-        safety_stock = random.randint(2, 10)
-        current_stock = random.randint(reorder_point - 50, reorder_point + 100)
-        
-        # Generate forecast data
-        forecast = {}
-        base_demand = random.randint(80, 120)
-        
-        for i in range(days):
-            forecast_date = (today + timedelta(days=i)).strftime("%Y-%m-%d")
-            daily_forecast = base_demand + random.randint(-20, 20)
-            lower_bound = int(daily_forecast * 0.8)
-            upper_bound = int(daily_forecast * 1.2)
-            
-            forecast[forecast_date] = {
-                "forecast": daily_forecast,
-                "lower_bound": lower_bound,
-                "upper_bound": upper_bound
-            }
-        
-        # Generate warnings based on stock levels
-        warnings = []
-        days_to_reorder = (current_stock - safety_stock) / base_demand
-        if days_to_reorder < days:
-            warnings.append(f"Stock will reach reorder point in approximately {int(days_to_reorder)} days")
-        if current_stock < reorder_point:
-            warnings.append("Current stock is below reorder point")
-        
-        # Create mock response
-        mock_response = {
-            "Reorder Point": reorder_point,
-            "Safety Stock": safety_stock,
-            "Current Stock": current_stock,
-            "Forecast": forecast,
-            "Warnings": warnings
-        }
+        mock_response = self.mock_generator.generate(product_id, days, compact=True)
         
         # Add a note that this is mock data
         mock_response["Note"] = "Using mock data for demonstration (API unreachable)"
@@ -100,11 +533,7 @@ class InventoryAssistant:
     
     def format_date(self, date_str):
         """Format date string to a more readable format"""
-        try:
-            date_obj = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-            return date_obj.strftime("%d %b, %Y")
-        except:
-            return date_str
+        return format_forecast_date(date_str) or date_str
     
     def process_response(self, response):
         """
@@ -116,174 +545,150 @@ class InventoryAssistant:
         Returns:
             str: Formatted user-friendly response
         """
-        if "error" in response:
-            return f"❌ {response['error']}"
-        
-        # Extract key information
-        reorder_point = response.get("Reorder Point")
-        safety_stock = response.get("Safety Stock")
-        current_stock = response.get("Current Stock", "Unknown")
-        forecast_data = response.get("Forecast", {})
-        plot_url = response.get("Plot URL", None)
-        warnings = response.get("Warnings", [])
-        mock_note = response.get("Note", None)
-        
-        # Create a summary response
-        output = []
-        
-        # Main insight
-        if current_stock != "Unknown" and reorder_point is not None:
-            if current_stock <= reorder_point:
-                output.append(f"📉 **Stock Alert: Current stock ({current_stock} units) is at or below reorder point!**")
-            else:
-                output.append(f"📊 **Stock Status: Current stock ({current_stock} units) is above reorder point.**")
-        else:
-            output.append("📊 **Inventory Forecast Summary:**")
-        
-        # Key numbers
-        output.append("\n**Key Inventory Numbers:**")
-        if reorder_point is not None:
-            output.append(f"➡️ Reorder Point: **{reorder_point} units** (place order when stock drops to this level)")
-        if safety_stock is not None:
-            output.append(f"➡️ Safety Stock: **{safety_stock} units** (minimum buffer to maintain)")
-        if current_stock != "Unknown":
-            output.append(f"➡️ Current Stock: **{current_stock} units**")
-        
-        # Forecast data
-        if forecast_data:
-            output.append("\n**Demand Forecast:**")
-            forecast_table = []
-            headers = ["Date", "Forecast", "Range"]
+        with self.metrics.stage("render"):
+            return render_response_markdown(response)
+    
+    def parse_query(self, query):
+        """
+        Extract the product ID and forecast horizon from a user query.
+        
+        Args:
+            query (str): User query about inventory
             
-            # Sort dates chronologically
-            sorted_dates = sorted(forecast_data.keys())
+        Returns:
+            tuple: (product_id, days) where product_id is None if not found
+        """
+        parsed = self.parser.parse(query)
+        return parsed.product_id, parsed.days
+    
+    def handle_query(self, query, as_result=False):
+        """
+        Process user query and return appropriate response.
+        
+        Args:
+            query (str): User query about inventory
+            as_result (bool): Return a ForecastResult/BatchForecastResult instead of
+                markdown, so callers can read the numbers or pick a format (default: False)
             
-            for date_str in sorted_dates:
-                forecast_info = forecast_data[date_str]
-                forecast_val = forecast_info.get("forecast", "N/A")
-                lower_bound = forecast_info.get("lower_bound", "N/A")
-                upper_bound = forecast_info.get("upper_bound", "N/A")
-                
-                forecast_val = round(forecast_val, 1) if isinstance(forecast_val, (int, float)) else forecast_val
-                lower_bound = round(lower_bound, 1) if isinstance(lower_bound, (int, float)) else lower_bound
-                upper_bound = round(upper_bound, 1) if isinstance(upper_bound, (int, float)) else upper_bound
-                
-                range_val = f"{lower_bound}–{upper_bound}" if lower_bound != "N/A" and upper_bound != "N/A" else "N/A"
-                formatted_date = self.format_date(date_str)
-                
-                forecast_table.append([formatted_date, forecast_val, range_val])
+        Returns:
+            str: Formatted response to user query (or a result object, see as_result)
+        """
+        with self.metrics.stage("query"):
+            with self.metrics.stage("parse"):
+                parsed = self.parser.parse(query)
+        
+            # Several product IDs in one query are answered with a combined summary
+            if len(parsed.product_ids) > 1:
+                return self.handle_batch(parsed.product_ids, parsed.days, as_result=as_result)
+        
+            # If no product ID found, ask for it
+            if not parsed.product_id:
+                if as_result:
+                    return ForecastResult(days=parsed.days, error=self.MISSING_PRODUCT_MESSAGE)
+                return self.MISSING_PRODUCT_MESSAGE
+        
+            # Call API and format response
+            response = self.call_api(parsed.product_id, parsed.days)
+            if as_result:
+                return ForecastResult(parsed.product_id, parsed.days, response)
+            return self.process_response(response)
+    
+    def find_product_ids(self, query):
+        """
+        Find all product IDs mentioned in a query.
+        
+        Args:
+            query (str): User query about inventory
             
-            output.append(tabulate(forecast_table, headers=headers, tablefmt="pipe"))
-        
-        # Priority alerts/warnings
-        if warnings:
-            output.append("\n⚠️ **Priority Alerts:**")
-            for warning in warnings:
-                output.append(f"- {warning}")
-        
-        # Actionable advice
-        output.append("\n**Recommendations:**")
-        if current_stock != "Unknown" and reorder_point is not None:
-            if current_stock <= reorder_point:
-                output.append("🚨 **Place an order immediately** to avoid stockouts.")
-            elif current_stock <= reorder_point * 1.2:
-                output.append("⚠️ **Consider placing an order soon** as stock is getting close to reorder point.")
-            else:
-                output.append("✅ Stock levels look good. No immediate action required.")
-        else:
-            if reorder_point is not None:
-                output.append(f"📝 Monitor stock levels and place orders when they drop below {reorder_point} units.")
+        Returns:
+            list: Distinct upper-cased product IDs in order of appearance
+        """
+        return self.parser.find_product_ids(query)
+    
+    def handle_batch(self, product_ids, days=7, as_result=False, priority=INTERACTIVE):
+        """
+        Fetch forecasts for several products concurrently and summarize them.
         
-        # If forecast chart is available
-        if plot_url:
-            output.append(f"\n📈 A forecast chart is available at: {plot_url}")
+        Args:
+            product_ids (list): Product IDs to check
+            days (int): Number of days to forecast (default: 7)
+            as_result (bool): Return a BatchForecastResult instead of markdown (default: False)
+            priority (str): Admission priority when a rate_limit is set (default: INTERACTIVE)
             
-        # Add mock data note if present
-        if mock_note:
-            output.append(f"\n🔍 Note: {mock_note}")
+        Returns:
+            str: Combined summary table with reorder status per product
+        """
+        if not product_ids:
+            if as_result:
+                return ForecastResult(days=days, error=self.MISSING_PRODUCT_MESSAGE)
+            return self.MISSING_PRODUCT_MESSAGE
         
-        return "\n".join(output)
+        responses = self.fetch_batch(product_ids, days, priority)
+        if as_result:
+            return BatchForecastResult(responses, days)
+        return self.process_batch_response(responses, days)
     
-    def handle_query(self, query):
+    def fetch_batch(self, product_ids, days=7, priority=INTERACTIVE):
         """
-        Process user query and return appropriate response.
+        Call the API for several products on a bounded thread pool.
         
         Args:
-            query (str): User query about inventory
+            product_ids (list): Product IDs to fetch
+            days (int): Number of days to forecast (default: 7)
+            priority (str): Admission priority when a rate_limit is set (default: INTERACTIVE)
             
         Returns:
-            str: Formatted response to user query
-        """
-        # Extract product_id and days from query
-        product_id = None
-        days = 7  # Default days
-        
-        import re
-        
-        # Look for product_id=X pattern first (most explicit)
-        product_match = re.search(r'product_id[=\s:]+([a-zA-Z0-9]+)', query)
-        if product_match:
-            product_id = product_match.group(1).upper()
-        
-        # If not found, try a more comprehensive pattern that can find product IDs in natural language
-        if not product_id:
-            # Match product IDs that follow patterns like P001, SKU123, etc. in natural language
-            # This will find product IDs that are:
-            # 1. Preceded by "for", "product", "item", "sku", etc.
-            # 2. Standalone with a letter followed by numbers (P001, A123, etc.)
-            patterns = [
-                # Product followed by ID - e.g., "product P001", "for P001", "of P001"
-                r'(?:for|product|item|sku|of|on|about)\s+([A-Za-z][A-Za-z0-9]{2,})',
-                # IDs with prefixes - e.g., "P-001", "SKU-123"
-                r'(?:[A-Za-z]+[-:]([0-9]{3,}))',
-                # Standard product IDs - e.g., "P001", "SKU123"
-                r'\b([A-Za-z][0-9]{3,})\b',
-                # Any alphanumeric string that looks like a product ID
-                r'\b([A-Za-z][A-Za-z0-9]{2,})\b'
-            ]
+            dict: Product ID -> API response, in the order given
+        """
+        workers = max(1, min(self.batch_workers, len(product_ids)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            responses = list(executor.map(lambda product_id: self.call_api(product_id, days, priority),
+                                           product_ids))
+        return dict(zip(product_ids, responses))
+    
+    def iter_batch(self, product_ids, days=7, priority=INTERACTIVE):
+        """
+        Call the API for several products and yield each response as it arrives.
+        
+        Closing the generator early cancels the calls that haven't started yet.
+        
+        Args:
+            product_ids (list): Product IDs to fetch
+            days (int): Number of days to forecast (default: 7)
+            priority (str): Admission priority when a rate_limit is set (default: INTERACTIVE)
+            
+        Yields:
+            tuple: (product_id, API response) in completion order
+        """
+        workers = max(1, min(self.batch_workers, len(product_ids)))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {executor.submit(self.call_api, product_id, days, priority): product_id for product_id in product_ids}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def process_batch_response(self, responses, days):
+        """
+        Summarize API responses for several products in one table.
+        
+        Args:
+            responses (dict): Product ID -> API response
+            days (int): Number of forecast days in each response
             
-            for pattern in patterns:
-                matches = re.findall(pattern, query)
-                if matches:
-                    # Take the first match
-                    product_id = matches[0].upper()
-                    break
-                
-        # If still not found, check if query itself is just a product ID (e.g., "P001")
-        if not product_id and re.match(r'^[a-zA-Z0-9]+$', query.strip()):
-            product_id = query.strip().upper()
-        
-        # Look for time periods
-        time_patterns = {
-            'day': 1,
-            'tomorrow': 1,
-            'week': 7,
-            'month': 30,
-            'quarter': 90
-        }
-        
-        for pattern, days_value in time_patterns.items():
-            if pattern in query.lower():
-                days = days_value
-                break
-        
-        # Check for specific number of days
-        days_match = re.search(r'(\d+)[\s-]*(day|days)', query.lower())
-        if days_match:
-            days = int(days_match.group(1))
-        
-        # If no product ID found, ask for it
-        if not product_id:
-            return "I need a product ID to check inventory forecast. Please specify a product ID (e.g., P001)."
-        
-        # Call API and format response
-        response = self.call_api(product_id, days)
-        return self.process_response(response)
+        Returns:
+            str: Formatted summary with per-product reorder status
+        """
+        with self.metrics.stage("render"):
+            return render_batch_markdown(responses, days)
 
 
 # Main function to handle user interaction
 def main():
-    assistant = InventoryAssistant()
+    assistant = InventoryAssistant(api_url=os.environ.get("INVENTORY_API_URL"))
+    # Libraries are imported and the API connection opened while the user types
+    assistant.start_warm_up()
     print("👋 Hello! I'm your AI Inventory Assistant.")
     print("Ask me about inventory levels, forecasts, or stock recommendations.")
     print("Type 'exit' or 'quit' to end the conversation.\n")
@@ -0,0 +1,204 @@
+import asyncio
+import json
+
+import aiohttp
+
+from admission import INTERACTIVE, AdmissionRejected
+from forecast_result import BatchForecastResult, ForecastResult
+from inventory_assistant import InventoryAssistant
+from single_flight import AsyncSingleFlight
+
+
+class AsyncInventoryAssistant(InventoryAssistant):
+    """
+    Asyncio variant of InventoryAssistant built on aiohttp.
+
+    Query parsing, caching, mock fallback and response formatting are shared
+    with the synchronous assistant; only the HTTP call is non-blocking. The
+    number of in-flight forecast requests is bounded by `max_concurrency`.
+
+    Use it as an async context manager, or call `aclose()` when done:
+
+        async with AsyncInventoryAssistant() as assistant:
+            print(await assistant.ahandle_query("Forecast for P001 next week"))
+    """
+
+    def __init__(self, max_concurrency=100, **kwargs):
+        """
+        Args:
+            max_concurrency (int): Maximum in-flight API requests (default: 100)
+            **kwargs: Options passed on to InventoryAssistant
+        """
+        super().__init__(**kwargs)
+        self.max_concurrency = max_concurrency
+        self.ain_flight = AsyncSingleFlight()
+        self._semaphore = None
+        self._http = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the underlying aiohttp session and release shared resources."""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        self.close()
+
+    def _get_http(self):
+        # The aiohttp session and semaphore must be created inside the running event loop
+        if self._http is None:
+            connect_timeout, read_timeout = self.timeout
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=aiohttp.ClientTimeout(connect=connect_timeout, sock_read=read_timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._http
+
+    async def acall_api(self, product_id, days=7, priority=INTERACTIVE):
+        """
+        Async version of call_api.
+
+        Args:
+            product_id (str): The product ID to get forecast for
+            days (int): Number of days to forecast (default: 7)
+            priority (str): Admission priority when a rate_limit is set (default: INTERACTIVE)
+
+        Returns:
+            dict: JSON response from the API
+        """
+        with self.metrics.stage("cache"):
+            cached = self.cache.get(product_id, days)
+        self.metrics.increment("cache_hits" if cached is not None else "cache_misses")
+        if self.prefetcher is not None:
+            self.prefetcher.record(product_id, days, cached is not None)
+        if cached is not None:
+            return cached
+
+        return await self.ain_flight.do((product_id, days, priority), self.aload_forecast, product_id, days,
+                                         priority)
+
+    async def aload_forecast(self, product_id, days, priority=INTERACTIVE):
+        """Async version of load_forecast."""
+        data = self.timeline_forecast(product_id, days)
+        if data is not None:
+            return data
+
+        allowed = self.breaker.allow_request()
+        if not allowed:
+            self.metrics.increment("breaker_rejections")
+            return self.get_fallback_data(product_id, days)
+
+        try:
+            data = await self.afetch_forecast(product_id, days, priority)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            return self.handle_api_error(product_id, days, e)
+        except AdmissionRejected as e:
+            return self.handle_admission_rejected(product_id, days, e, allowed)
+
+        if self.prefetcher is not None:
+            self.prefetcher.forget_prefetched(product_id)
+        return self.store_forecast(product_id, days, data)
+
+    async def afetch_forecast(self, product_id, days, priority=INTERACTIVE):
+        """
+        Request a forecast from the API, bypassing the cache.
+
+        Connection failures and gateway errors are retried like in
+        post_forecast. Timeouts are not retried.
+
+        Args:
+            product_id (str): The product ID to get forecast for
+            days (int): Number of days to forecast
+            priority (str): Admission priority when a rate_limit is set (default: INTERACTIVE)
+
+        Returns:
+            dict: Decoded JSON response
+        """
+        payload, fetch_days = self.plan_fetch(product_id, days)
+        if payload is None:
+            return self.timeline.build(product_id, days)
+
+        http = self._get_http()
+        async with self._semaphore:
+            with self.metrics.stage("http"):
+                body = await self._apost_forecast(http, payload, priority)
+        with self.metrics.stage("decode"):
+            data = json.loads(body)
+        return self.merge_fetch(product_id, days, data, fetch_days)
+
+    async def _apost_forecast(self, http, payload, priority):
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            if self.admission is not None:
+                # Same queue as synchronous callers, but waited for on the event loop
+                await self.admission.aacquire(priority)
+            self.metrics.increment("api_requests")
+            try:
+                async with http.post(self.api_url, json=payload) as response:
+                    if response.status not in self.RETRY_STATUSES or last_attempt:
+                        response.raise_for_status()  # Raise an exception for HTTP errors
+                        return await response.read()
+            except aiohttp.ServerTimeoutError:
+                raise
+            except aiohttp.ClientConnectionError:
+                if last_attempt:
+                    raise
+            await asyncio.sleep(self.backoff_delay(attempt))
+
+    async def ahandle_query(self, query, as_result=False):
+        """
+        Async version of handle_query.
+
+        Args:
+            query (str): User query about inventory
+            as_result (bool): Return a ForecastResult/BatchForecastResult instead of markdown
+
+        Returns:
+            str: Formatted response to user query (or a result object, see as_result)
+        """
+        with self.metrics.stage("query"):
+            with self.metrics.stage("parse"):
+                parsed = self.parser.parse(query)
+
+            # Several product IDs in one query are answered with a combined summary
+            if len(parsed.product_ids) > 1:
+                return await self.ahandle_batch(parsed.product_ids, parsed.days, as_result=as_result)
+
+            # If no product ID found, ask for it
+            if not parsed.product_id:
+                if as_result:
+                    return ForecastResult(days=parsed.days, error=self.MISSING_PRODUCT_MESSAGE)
+                return self.MISSING_PRODUCT_MESSAGE
+
+            response = await self.acall_api(parsed.product_id, parsed.days)
+            if as_result:
+                return ForecastResult(parsed.product_id, parsed.days, response)
+            return self.process_response(response)
+
+    async def ahandle_batch(self, product_ids, days=7, as_result=False):
+        """
+        Async version of handle_batch. Concurrency is bounded by max_concurrency.
+
+        Args:
+            product_ids (list): Product IDs to check
+            days (int): Number of days to forecast (default: 7)
+            as_result (bool): Return a BatchForecastResult instead of markdown
+
+        Returns:
+            str: Combined summary table with reorder status per product
+        """
+        if not product_ids:
+            if as_result:
+                return ForecastResult(days=days, error=self.MISSING_PRODUCT_MESSAGE)
+            return self.MISSING_PRODUCT_MESSAGE
+
+        responses = await asyncio.gather(*(self.acall_api(product_id, days) for product_id in product_ids))
+        responses = dict(zip(product_ids, responses))
+        if as_result:
+            return BatchForecastResult(responses, days)
+        return self.process_batch_response(responses, days)
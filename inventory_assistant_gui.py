@@ -1,16 +1,59 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext
+import itertools
+import queue
 import threading
+import time
+from forecast_result import ForecastResult
 from inventory_assistant import InventoryAssistant
 
+
+class QueryJob:
+    """A query waiting for or being processed by a worker."""
+    
+    def __init__(self, job_id, query, timeout):
+        self.id = job_id
+        self.query = query
+        self.deadline = time.monotonic() + timeout
+        self.cancelled = threading.Event()
+        self.finished = False
+        # Text marks around the job's answer in the chat display
+        self.start_mark = f"job{job_id}_start"
+        self.end_mark = f"job{job_id}_end"
+        self.cancel_tag = f"job{job_id}_cancel"
+
+
 class InventoryAssistantGUI:
-    def __init__(self, root):
+    # How often the UI thread collects results from the workers (ms)
+    POLL_INTERVAL = 50
+    
+    def __init__(self, root, workers=4, timeout=30):
+        """
+        Args:
+            root (tk.Tk): Main window
+            workers (int): Queries processed at the same time (default: 4)
+            timeout (float): Seconds before a query is given up on (default: 30)
+        """
         self.root = root
         self.root.title("Inventory Assistant")
         self.root.geometry("800x600")
         self.root.configure(bg="#f0f0f0")
         
         self.assistant = InventoryAssistant()
+        self.timeout = timeout
+        
+        # Workers take jobs from requests and put UI updates on results;
+        # only the Tk thread touches widgets, from poll_results
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.jobs = {}
+        self.job_ids = itertools.count(1)
+        self.workers = [
+            threading.Thread(target=self.worker_loop, name=f"query-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self.workers:
+            worker.start()
         
         # Configure style
         style = ttk.Style()
@@ -19,6 +62,9 @@ class InventoryAssistantGUI:
         style.configure("TLabel", background="#f0f0f0", font=("Arial", 12))
         
         self.create_widgets()
+        self.root.after(self.POLL_INTERVAL, self.poll_results)
+        # Runs once the window is up, so heavy imports and the first connection don't delay it
+        self.root.after_idle(self.assistant.start_warm_up)
     
     def create_widgets(self):
         # Main frame
@@ -35,6 +81,10 @@ class InventoryAssistantGUI:
         
         self.chat_display = scrolledtext.ScrolledText(chat_frame, wrap=tk.WORD, font=("Arial", 11))
         self.chat_display.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        self.chat_display.tag_configure("user_tag", foreground="#007bff", font=("Arial", 11, "bold"))
+        self.chat_display.tag_configure("assistant_tag", foreground="#28a745", font=("Arial", 11, "bold"))
+        self.chat_display.tag_configure("pending_tag", foreground="#6c757d", font=("Arial", 11, "italic"))
+        self.chat_display.tag_configure("cancel_tag", foreground="#dc3545", underline=True)
         self.chat_display.config(state=tk.DISABLED)
         
         # Input area
@@ -51,6 +101,9 @@ class InventoryAssistantGUI:
         send_button = ttk.Button(input_frame, text="Send", command=self.process_query)
         send_button.pack(side=tk.RIGHT, pady=(0, 10))
         
+        self.status_label = ttk.Label(main_frame, text="", font=("Arial", 9))
+        self.status_label.pack(anchor=tk.W)
+        
         # Sample queries section
         samples_frame = ttk.Frame(main_frame)
         samples_frame.pack(fill=tk.X, expand=False, pady=(10, 0))
@@ -67,7 +120,7 @@ class InventoryAssistantGUI:
         
         for query in sample_queries:
             query_button = ttk.Button(
-                samples_frame, 
+                samples_frame,
                 text=query,
                 command=lambda q=query: self.use_sample_query(q)
             )
@@ -90,9 +143,6 @@ class InventoryAssistantGUI:
         else:
             self.chat_display.insert(tk.END, "\n" + message + "\n")
         
-        self.chat_display.tag_configure("user_tag", foreground="#007bff", font=("Arial", 11, "bold"))
-        self.chat_display.tag_configure("assistant_tag", foreground="#28a745", font=("Arial", 11, "bold"))
-        
         self.chat_display.config(state=tk.DISABLED)
         self.chat_display.see(tk.END)
     
@@ -104,23 +154,126 @@ class InventoryAssistantGUI:
         self.update_chat(query, "user")
         self.input_field.delete(0, tk.END)
         
-        # Disable input during processing
-        self.input_field.config(state=tk.DISABLED)
+        # The input stays enabled: further queries wait in the queue
+        job = QueryJob(next(self.job_ids), query, self.timeout)
+        self.jobs[job.id] = job
+        self.add_answer_block(job)
+        self.requests.put(job)
+        self.update_status()
+    
+    def add_answer_block(self, job):
+        """Add the job's answer area, a placeholder with a cancel link until it's answered."""
+        display = self.chat_display
+        display.config(state=tk.NORMAL)
+        display.insert(tk.END, "\n\nAssistant: ", "assistant_tag")
+        # The trailing newline keeps the marks clear of text appended at the end later
+        display.insert(tk.END, "\n")
+        display.mark_set(job.start_mark, "end-2c")
+        display.mark_gravity(job.start_mark, tk.LEFT)
+        display.mark_set(job.end_mark, "end-2c")
+        display.mark_gravity(job.end_mark, tk.RIGHT)
+        
+        display.insert(job.end_mark, "⏳ Working on it...\n", "pending_tag")
+        display.insert(job.end_mark, "[cancel]", ("cancel_tag", job.cancel_tag))
+        display.tag_bind(job.cancel_tag, "<Button-1>", lambda event, job_id=job.id: self.cancel_query(job_id))
+        display.tag_bind(job.cancel_tag, "<Enter>", lambda event: display.config(cursor="hand2"))
+        display.tag_bind(job.cancel_tag, "<Leave>", lambda event: display.config(cursor=""))
+        display.config(state=tk.DISABLED)
+        display.see(tk.END)
+    
+    def set_answer(self, job, message, tag=None):
+        """Replace the job's answer area with a message."""
+        display = self.chat_display
+        display.config(state=tk.NORMAL)
+        display.delete(job.start_mark, job.end_mark)
+        display.insert(job.start_mark, message, tag or ())
+        display.config(state=tk.DISABLED)
+    
+    def append_answer_row(self, job, row):
+        """Add a line to the job's answer area, above the cancel link while it's pending."""
+        display = self.chat_display
+        display.config(state=tk.NORMAL)
+        ranges = display.tag_ranges(job.cancel_tag)
+        index = ranges[0] if ranges else job.end_mark
+        display.insert(index, row + "\n")
+        display.config(state=tk.DISABLED)
+        display.see(job.end_mark)
+    
+    def finish_job(self, job, message, tag=None):
+        if job.finished:
+            return
+        job.finished = True
+        self.jobs.pop(job.id, None)
+        self.chat_display.tag_unbind(job.cancel_tag, "<Button-1>")
+        self.set_answer(job, message, tag)
+        self.update_status()
+    
+    def cancel_query(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        job.cancelled.set()
+        self.finish_job(job, "🚫 Cancelled.", "pending_tag")
+    
+    def update_status(self):
+        pending = len(self.jobs)
+        text = f"Processing {pending} quer{'y' if pending == 1 else 'ies'}..." if pending else ""
+        self.status_label.config(text=text)
+    
+    def worker_loop(self):
+        while True:
+            job = self.requests.get()
+            if job.cancelled.is_set():
+                continue
+            try:
+                self.answer_query(job)
+            except Exception as e:
+                self.results.put(("done", job, f"❌ Error processing your query: {str(e)}"))
+    
+    def answer_query(self, job):
+        """Runs on a worker thread: answer the query, streaming multi-product rows."""
+        parsed = self.assistant.parser.parse(job.query)
+        if len(parsed.product_ids) <= 1:
+            self.results.put(("done", job, self.assistant.handle_query(job.query)))
+            return
+        
+        self.results.put(("row", job, f"Checking {len(parsed.product_ids)} products (next {parsed.days} days):"))
+        responses = {}
+        batch = self.assistant.iter_batch(parsed.product_ids, parsed.days)
+        try:
+            for product_id, response in batch:
+                if job.cancelled.is_set():
+                    return
+                responses[product_id] = response
+                row = ForecastResult(product_id, parsed.days, response).to_compact()
+                self.results.put(("row", job, f"  • {row}"))
+        finally:
+            batch.close()
         
-        # Process query in a separate thread to keep UI responsive
-        thread = threading.Thread(target=self.process_query_thread, args=(query,))
-        thread.daemon = True
-        thread.start()
+        # The final summary lists the products in the order they were asked for
+        ordered = {product_id: responses[product_id] for product_id in parsed.product_ids}
+        self.results.put(("done", job, self.assistant.process_batch_response(ordered, parsed.days)))
     
-    def process_query_thread(self, query):
+    def poll_results(self):
+        """Apply worker results and time out slow queries; runs on the Tk thread."""
         try:
-            response = self.assistant.handle_query(query)
-        except Exception as e:
-            response = f"❌ Error processing your query: {str(e)}"
+            while True:
+                kind, job, message = self.results.get_nowait()
+                if job.finished:
+                    continue  # cancelled or timed out while the worker was busy
+                if kind == "row":
+                    self.append_answer_row(job, message)
+                else:
+                    self.finish_job(job, message)
+        except queue.Empty:
+            pass
+        
+        now = time.monotonic()
+        for job in [job for job in self.jobs.values() if now > job.deadline]:
+            job.cancelled.set()
+            self.finish_job(job, f"⏱️ No answer after {self.timeout:g} seconds. Please try again.", "pending_tag")
         
-        # Update UI in the main thread
-        self.root.after(0, lambda: self.update_chat(response, "assistant"))
-        self.root.after(0, lambda: self.input_field.config(state=tk.NORMAL))
+        self.root.after(self.POLL_INTERVAL, self.poll_results)
     
     def use_sample_query(self, query):
         self.input_field.delete(0, tk.END)
@@ -133,4 +286,4 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,371 @@
+import argparse
+import json
+import os
+import selectors
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from admission import BATCH
+from inventory_assistant import InventoryAssistant
+
+
+class BadRequest(ValueError):
+    """A request the server refuses, with the HTTP status to answer it with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class InventoryRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API for programmatic clients:
+
+    POST /query   {"query": "...", "format": "json" | "markdown" | "compact"}
+    POST /batch   {"product_ids": ["P001", ...], "days": 7, "format": ...}
+    GET  /metrics cache, circuit breaker, request counters and stage timings
+                  (?format=prometheus for the Prometheus text format)
+    GET  /health  liveness check
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    # Seconds to wait for a client in the middle of a request
+    timeout = 30
+
+    MAX_BODY_BYTES = 64 * 1024
+    # Longest forecast horizon a request may ask for
+    MAX_DAYS = 365
+    FORMATS = ("json", "markdown", "compact")
+
+    def handle(self):
+        # Answer the requests the client has already sent, then hand the connection back
+        # to the server, which waits for the next one without holding a worker
+        self.handle_one_request()
+        while not self.close_connection and self.request_pending():
+            self.handle_one_request()
+
+    def request_pending(self):
+        """True if (part of) another request has already arrived on the connection."""
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def do_GET(self):
+        self.respond(self.handle_get)
+
+    def do_POST(self):
+        self.respond(self.handle_post)
+
+    def respond(self, handler):
+        """Run a request handler, answering 500 instead of dropping the connection if it fails."""
+        try:
+            handler()
+        except Exception:
+            self.server.handle_error(self.request, self.client_address)
+            # Part of a response may already have been sent, so don't reuse the connection
+            self.close_connection = True
+            self.send_json(500, {"error": "Internal server error"})
+
+    def handle_get(self):
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        elif url.path == "/metrics":
+            if parse_qs(url.query).get("format") == ["prometheus"]:
+                self.send_text(200, self.server.assistant.metrics.to_prometheus(),
+                               "text/plain; version=0.0.4; charset=utf-8")
+            else:
+                self.send_json(200, self.server.metrics())
+        else:
+            self.send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def handle_post(self):
+        if self.path not in ("/query", "/batch"):
+            self.send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+
+        try:
+            body = self.read_json()
+        except BadRequest as e:
+            self.send_json(e.status, {"error": str(e)})
+            return
+
+        fmt = body.get("format", "json")
+        if fmt not in self.FORMATS:
+            self.send_json(400, {"error": f"format must be one of: {', '.join(self.FORMATS)}"})
+            return
+
+        assistant = self.server.assistant
+        if self.path == "/query":
+            query = body.get("query")
+            if not isinstance(query, str) or not query.strip():
+                self.send_json(400, {"error": "'query' must be a non-empty string"})
+                return
+            # Parsing is memoized, so handle_query doesn't parse the query again
+            days = assistant.parser.parse(query).days
+            if not 1 <= days <= self.MAX_DAYS:
+                self.send_json(400, {"error": f"Forecasts cover 1 to {self.MAX_DAYS} days, not {days}"})
+                return
+            self.server.log_query(query)
+            result = assistant.handle_query(query, as_result=True)
+        else:
+            product_ids = body.get("product_ids")
+            days = body.get("days", 7)
+            if not isinstance(product_ids, list) or not product_ids or not all(isinstance(p, str) for p in product_ids):
+                self.send_json(400, {"error": "'product_ids' must be a non-empty list of strings"})
+                return
+            if not isinstance(days, int) or isinstance(days, bool) or not 1 <= days <= self.MAX_DAYS:
+                self.send_json(400, {"error": f"'days' must be an integer from 1 to {self.MAX_DAYS}"})
+                return
+            # Bulk lookups yield to chat queries when the forecast API is rate limited
+            result = assistant.handle_batch([p.upper() for p in product_ids], days, as_result=True, priority=BATCH)
+
+        with assistant.metrics.stage("render"):
+            if fmt == "json":
+                data = result.to_dict()
+            else:
+                data = {"format": fmt, "response": result.render(fmt)}
+        self.send_json(200, data)
+
+    def read_json(self):
+        """
+        Read and decode the JSON object in the request body.
+
+        Raises:
+            BadRequest: If the body is missing its length, too large or not a JSON object
+        """
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > self.MAX_BODY_BYTES:
+            # The body isn't read, so the connection can't be used for another request
+            self.close_connection = True
+            if length < 0:
+                raise BadRequest("Invalid Content-Length")
+            raise BadRequest("Request body too large", status=413)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise BadRequest("Request body must be valid JSON")
+        if not isinstance(body, dict):
+            raise BadRequest("Request body must be a JSON object")
+        return body
+
+    def send_json(self, status, data):
+        self.send_text(status, json.dumps(data), "application/json")
+
+    def send_text(self, status, text, content_type):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.record_request(urlsplit(self.path).path, status)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class InventoryAPIServer(HTTPServer):
+    """
+    HTTP server that handles requests on a fixed pool of worker threads.
+
+    All workers share one InventoryAssistant, so the forecast cache, circuit
+    breaker and HTTP connection pool are shared across requests. A worker
+    answers one request (or the requests already sent on the connection) at a
+    time; idle keep-alive connections wait in a selector thread until the
+    client sends again, so they don't tie up workers.
+    """
+
+    # Accept bursts of new connections instead of dropping SYNs (default backlog is 5)
+    request_queue_size = 128
+    # Seconds an idle keep-alive connection is kept open
+    keep_alive_timeout = 30
+
+    def __init__(self, address, assistant, workers=16, verbose=False, query_log=None):
+        """
+        Args:
+            address (tuple): (host, port) to bind
+            assistant (InventoryAssistant): Assistant shared by all requests
+            workers (int): Number of worker threads (default: 16)
+            verbose (bool): Log every request to stderr (default: False)
+            query_log (str): Append each /query as a JSON line with its timestamp to this
+                file, for replaying with benchmarks/replay_queries.py (default: None)
+        """
+        super().__init__(address, InventoryRequestHandler)
+        self.assistant = assistant
+        self.workers = workers
+        self.verbose = verbose
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inventory-api")
+        self.started_at = time.time()
+        self.request_counts = {}
+        self._counts_lock = threading.Lock()
+        self.query_log = open(query_log, "a", encoding="utf-8") if query_log else None
+        self._log_lock = threading.Lock()
+
+        self._idle = selectors.DefaultSelector()
+        self._parked = []
+        self._parked_lock = threading.Lock()
+        self._closing = False
+        # Writing to the wake socket interrupts select() when a connection is parked
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._idle.register(self._wake_r, selectors.EVENT_READ)
+        self._idle_thread = threading.Thread(target=self._watch_idle, name="inventory-api-idle", daemon=True)
+        self._idle_thread.start()
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_worker, request, client_address)
+
+    def process_request_worker(self, request, client_address):
+        keep_alive = False
+        try:
+            handler = self.RequestHandlerClass(request, client_address, self)
+            keep_alive = not handler.close_connection
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            if keep_alive:
+                self.park(request, client_address)
+            else:
+                self.shutdown_request(request)
+
+    def park(self, request, client_address):
+        """Wait for the next request on a keep-alive connection in the selector thread."""
+        with self._parked_lock:
+            if self._closing:
+                self.shutdown_request(request)
+                return
+            self._parked.append((request, client_address))
+        self._wake_w.send(b"x")
+
+    def _watch_idle(self):
+        while True:
+            with self._parked_lock:
+                if self._closing:
+                    break
+                parked, self._parked = self._parked, []
+            now = time.monotonic()
+            for request, client_address in parked:
+                self._idle.register(request, selectors.EVENT_READ, (client_address, now))
+
+            for key, _ in self._idle.select(timeout=1.0):
+                if key.fileobj is self._wake_r:
+                    try:
+                        self._wake_r.recv(4096)
+                    except BlockingIOError:
+                        pass
+                    continue
+                self._idle.unregister(key.fileobj)
+                self.executor.submit(self.process_request_worker, key.fileobj, key.data[0])
+
+            expired = [key for key in self._idle.get_map().values()
+                       if key.fileobj is not self._wake_r and now - key.data[1] > self.keep_alive_timeout]
+            for key in expired:
+                self._idle.unregister(key.fileobj)
+                self.shutdown_request(key.fileobj)
+
+        for key in list(self._idle.get_map().values()):
+            if key.fileobj is not self._wake_r:
+                self.shutdown_request(key.fileobj)
+        self._idle.close()
+
+    def server_close(self):
+        super().server_close()
+        with self._parked_lock:
+            self._closing = True
+            for request, _ in self._parked:
+                self.shutdown_request(request)
+            self._parked = []
+        self._wake_w.send(b"x")
+        self._idle_thread.join()
+        self._wake_r.close()
+        self._wake_w.close()
+        self.executor.shutdown(wait=False)
+        if self.query_log is not None:
+            self.query_log.close()
+
+    def log_query(self, query):
+        if self.query_log is None:
+            return
+        line = json.dumps({"timestamp": time.time(), "query": query})
+        with self._log_lock:
+            self.query_log.write(line + "\n")
+            self.query_log.flush()
+
+    def record_request(self, path, status):
+        if path not in ("/query", "/batch", "/metrics", "/health"):
+            path = "other"
+        key = f"{path} {status}"
+        with self._counts_lock:
+            self.request_counts[key] = self.request_counts.get(key, 0) + 1
+
+    def metrics(self):
+        """Server, cache and circuit breaker counters as a dict."""
+        with self._counts_lock:
+            requests_by_endpoint = dict(self.request_counts)
+        metrics = {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "workers": self.workers,
+            "requests": requests_by_endpoint,
+            "cache": self.assistant.cache.stats(),
+            "breaker": self.assistant.breaker.stats(),
+            "coalescing": self.assistant.in_flight.stats(),
+            "assistant": self.assistant.metrics.to_dict(),
+        }
+        if self.assistant.store is not None:
+            metrics["store"] = self.assistant.store.stats()
+        if self.assistant.prefetcher is not None:
+            metrics["prefetch"] = self.assistant.prefetcher.stats()
+        if self.assistant.admission is not None:
+            metrics["admission"] = self.assistant.admission.stats()
+        return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Inventory Assistant as an HTTP/JSON API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=16, help="worker threads")
+    parser.add_argument("--api-url", help="forecast API endpoint (default: the Render deployment)")
+    parser.add_argument("--store", help="SQLite file to persist forecasts in for warm restarts")
+    parser.add_argument("--prefetch", type=int, default=0, metavar="N",
+                        help="keep the N most queried products refreshed in the background")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    parser.add_argument("--query-log", help="append queries with timestamps to this JSON Lines file")
+    parser.add_argument("--rate-limit", type=float, metavar="RPS",
+                        help="maximum forecast API requests per second; chat queries go first, then /batch")
+    args = parser.parse_args()
+
+    assistant = InventoryAssistant(api_url=args.api_url, pool_size=args.workers, store_path=args.store,
+                                   prefetch_top_n=args.prefetch, enable_metrics=True, rate_limit=args.rate_limit)
+    assistant.start_warm_up()
+
+    server = InventoryAPIServer((args.host, args.port), assistant, workers=args.workers, verbose=args.verbose,
+                                query_log=args.query_log)
+    print(f"Inventory Assistant API listening on http://{args.host}:{args.port} ({args.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        assistant.close()
+
+
+if __name__ == "__main__":
+    main()
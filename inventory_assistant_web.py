@@ -1,9 +1,72 @@
 import streamlit as st
 import datetime
+import os
+import time
 from inventory_assistant import InventoryAssistant
 
-# Initialize the Inventory Assistant
-assistant = InventoryAssistant()
+# Messages shown per page of the conversation, newest page first
+PAGE_SIZE = 20
+# Oldest messages are dropped beyond this many, so session state stays bounded
+MAX_HISTORY = 1000
+# Rendered answers are reused for identical queries within the forecast cache TTL
+ANSWER_TTL = 300
+
+
+@st.cache_resource
+def get_assistant():
+    """One Inventory Assistant shared by all sessions (and its cache and connection pool)."""
+    assistant = InventoryAssistant(api_url=os.environ.get("INVENTORY_API_URL"), cache_ttl=ANSWER_TTL)
+    assistant.start_warm_up()
+    return assistant
+
+
+class FallbackAnswer(Exception):
+    """Raised from the cached function so answers built from fallback data aren't cached."""
+
+    def __init__(self, markdown):
+        super().__init__(markdown)
+        self.markdown = markdown
+
+
+@st.cache_data(ttl=ANSWER_TTL, max_entries=1024, show_spinner=False)
+def cached_answer(query):
+    result = get_assistant().handle_query(query, as_result=True)
+    results = getattr(result, "results", [result])
+    if any(r.note or r.stale for r in results):
+        raise FallbackAnswer(result.to_markdown())
+    return result.to_markdown()
+
+
+def answer_query(query):
+    """
+    Markdown answer for a query. Answers from live API data are cached across
+    sessions; mock or stale answers are not, so the API is asked again.
+    """
+    try:
+        return cached_answer(query)
+    except FallbackAnswer as e:
+        return e.markdown
+
+
+def render_message(entry):
+    if entry["role"] == "user":
+        st.markdown(f"**You**: {entry['content']}")
+    else:
+        st.markdown(f"**Assistant**: {entry['content']}")
+
+
+def add_exchange(query):
+    """Answer a query and append both messages to the chat history."""
+    with st.spinner("Processing your query..."):
+        response = answer_query(query.strip())
+
+    history = st.session_state.chat_history
+    # The timestamp lets exported histories be replayed with benchmarks/replay_queries.py
+    history.append({"role": "user", "content": query, "timestamp": time.time()})
+    history.append({"role": "assistant", "content": response})
+    if len(history) > MAX_HISTORY:
+        del history[:len(history) - MAX_HISTORY]
+
 
 # Set page configuration
 st.set_page_config(
@@ -18,7 +81,12 @@ This assistant helps you manage inventory by providing forecasts, stock levels,
 Ask questions about product stock levels, demand forecasts, or when to reorder!
 """)
 
+# Initialize session state for chat history
+if "chat_history" not in st.session_state:
+    st.session_state.chat_history = []
+
 # Add sidebar with sample queries
+pending_query = None
 with st.sidebar:
     st.header("Sample Queries")
     sample_queries = [
@@ -27,58 +95,42 @@ with st.sidebar:
         "Check inventory status for item P002",
         "Do I need to reorder product XYZ tomorrow?"
     ]
-    
+
     # Create buttons for sample queries
     for query in sample_queries:
         if st.button(query):
-            st.session_state.query = query
-            st.session_state.run_query = True
-
-# Initialize session state for chat history
-if "chat_history" not in st.session_state:
-    st.session_state.chat_history = []
+            pending_query = query
 
-if "query" not in st.session_state:
-    st.session_state.query = ""
-    
-if "run_query" not in st.session_state:
-    st.session_state.run_query = False
-
-# Display chat history
+# The conversation is drawn into this container after the input below has been
+# handled, so a new exchange shows up in the same script run (no extra rerun)
 st.subheader("Conversation")
 chat_container = st.container()
 
-with chat_container:
-    for entry in st.session_state.chat_history:
-        if entry["role"] == "user":
-            st.markdown(f"**You**: {entry['content']}")
-        else:
-            st.markdown(f"**Assistant**: {entry['content']}")
-    
-    st.divider()
-
-# Create input form
-query = st.text_input("Your Query:", value=st.session_state.query)
+# Create input form; it clears itself after sending
+with st.form("query_form", clear_on_submit=True):
+    query = st.text_input("Your Query:")
+    if st.form_submit_button("Send") and query.strip():
+        pending_query = query
 
 # Process the query
-if st.button("Send") or st.session_state.run_query:
-    if query:
-        # Add user query to chat history
-        st.session_state.chat_history.append({"role": "user", "content": query})
-        
-        # Get response from assistant
-        with st.spinner("Processing your query..."):
-            response = assistant.handle_query(query)
-        
-        # Add assistant response to chat history
-        st.session_state.chat_history.append({"role": "assistant", "content": response})
-        
-        # Reset the query and run_query flag
-        st.session_state.query = ""
-        st.session_state.run_query = False
-        
-        # Rerun to update the display
-        st.experimental_rerun()
+if pending_query:
+    add_exchange(pending_query)
+
+# Display chat history: only the newest page is rendered on every interaction
+with chat_container:
+    history = st.session_state.chat_history
+    pages = max(1, -(-len(history) // PAGE_SIZE))
+    page = 1
+    if pages > 1:
+        page = st.number_input("Page (1 = newest)", min_value=1, max_value=pages, value=1, step=1,
+                               key="history_page", help=f"{pages} pages of {PAGE_SIZE} messages")
+    # PAGE_SIZE is even and messages come in pairs, so pages never split an exchange
+    end = len(history) - (page - 1) * PAGE_SIZE
+    start = max(0, end - PAGE_SIZE)
+    for entry in history[start:end]:
+        render_message(entry)
+
+    st.divider()
 
 # Add information about the application
 st.sidebar.markdown("---")
@@ -90,4 +142,4 @@ The assistant connects to the Inventory Forecast API to retrieve data and presen
 
 # Display the current date
 current_date = datetime.datetime.now().strftime("%B %d, %Y")
-st.sidebar.markdown(f"**Current Date:** {current_date}")
\ No newline at end of file
+st.sidebar.markdown(f"**Current Date:** {current_date}")
@@ -0,0 +1,206 @@
+import threading
+import time
+from bisect import bisect_left
+
+
+# Upper bounds in seconds, like the Prometheus client defaults plus sub-millisecond buckets
+# and buckets up to a minute for batch requests waiting on the rate limit
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                   2.5, 5.0, 10.0, 30.0, 60.0, float("inf"))
+
+
+class Histogram:
+    """Latency histogram with fixed buckets (not thread-safe on its own)."""
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """
+        Estimate a quantile as the upper bound of the bucket containing it.
+
+        Returns:
+            float: Bucket upper bound (the largest observed value if that bound
+                   is infinite, which JSON can't represent), or None if nothing
+                   was observed
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return self.max if bound == float("inf") else bound
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """
+    Stage timings and counters for the assistant.
+
+    Stages ("parse", "cache", "http", "decode", "render", ...) are timed with
+
+        with metrics.stage("http"):
+            ...
+
+    into latency histograms; events are counted with increment() and current
+    levels (such as a queue depth) are kept with set_gauge(). Hooks are called
+    as hook(kind, name, value) for every observation ("timing"), increment
+    ("counter") and gauge update ("gauge") and must be quick and not raise. When disabled,
+    stage() returns a shared no-op context manager and nothing is recorded.
+    """
+
+    def __init__(self, enabled=True, buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            enabled (bool): Record metrics (default: True)
+            buckets (tuple): Histogram bucket upper bounds in seconds
+        """
+        self.enabled = enabled
+        self.buckets = buckets
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self.hooks = []
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        """Context manager that times a block as stage `name`."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, name)
+
+    def observe(self, name, seconds):
+        """Record a duration for `name`."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.buckets)
+            histogram.observe(seconds)
+        for hook in self.hooks:
+            hook("timing", name, seconds)
+
+    def increment(self, name, amount=1):
+        """Add `amount` to counter `name`."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+        for hook in self.hooks:
+            hook("counter", name, amount)
+
+    def set_gauge(self, name, value):
+        """Set gauge `name` to its current `value`."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.gauges[name] = value
+        for hook in self.hooks:
+            hook("gauge", name, value)
+
+    def add_hook(self, hook):
+        """Register hook(kind, name, value), called on every observation, increment and gauge update."""
+        self.hooks.append(hook)
+
+    def reset(self):
+        """Clear all counters, histograms and gauges."""
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.gauges.clear()
+
+    def to_dict(self):
+        """Counters, gauges and per-stage latency summaries as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "stages": {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+            }
+
+    def to_prometheus(self, prefix="inventory_assistant"):
+        """
+        Render counters, gauges and histograms in the Prometheus text exposition format.
+
+        Returns:
+            str: Metrics text, ending with a newline
+        """
+        lines = []
+        with self._lock:
+            for name in sorted(self.counters):
+                metric = f"{prefix}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {self.counters[name]}")
+
+            for name in sorted(self.gauges):
+                metric = f"{prefix}_{name}"
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {self.gauges[name]}")
+
+            metric = f"{prefix}_stage_seconds"
+            if self.histograms:
+                lines.append(f"# TYPE {metric} histogram")
+            for name in sorted(self.histograms):
+                histogram = self.histograms[name]
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{metric}_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{stage="{name}"}} {histogram.sum}')
+                lines.append(f'{metric}_count{{stage="{name}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,181 @@
+import zlib
+from datetime import date
+
+import numpy as np
+
+from compact_forecast import CompactForecast
+
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def _splitmix64(values):
+    """Vectorized SplitMix64 hash of a uint64 array (wraps silently, unlike NumPy scalars)."""
+    z = values + _GOLDEN
+    z = (z ^ (z >> np.uint64(30))) * _MIX1
+    z = (z ^ (z >> np.uint64(27))) * _MIX2
+    return z ^ (z >> np.uint64(31))
+
+
+def _uniform(keys, stream):
+    """Deterministic uniform [0, 1) values for an array of uint64 keys."""
+    hashed = _splitmix64(keys ^ _splitmix64(np.array([stream], dtype=np.uint64)))
+    return (hashed >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+class MockForecastGenerator:
+    """
+    Seeded, vectorized generator of realistic-looking forecast responses.
+
+    Every product gets its own parameters (stock levels, base demand, trend and
+    weekly seasonality) derived from a hash of the seed and product ID. Daily
+    noise is a hash of the product and the calendar date, so the same product
+    and date always give the same value, whatever the horizon or start date.
+    The whole horizon for many products is computed in bulk with NumPy.
+    """
+
+    # Streams for the independent per-product and per-day random values
+    STREAM_REORDER, STREAM_SAFETY, STREAM_STOCK, STREAM_DEMAND, STREAM_TREND, STREAM_SEASON, STREAM_NOISE = range(7)
+
+    def __init__(self, seed=0):
+        """
+        Args:
+            seed (int): Seed shared by all products (default: 0)
+        """
+        self.seed = seed
+
+    def product_keys(self, product_ids):
+        """Stable uint64 key per product ID (independent of PYTHONHASHSEED)."""
+        seed = (self.seed & 0xFFFFFFFF) << 32
+        return np.fromiter(
+            (seed | zlib.crc32(product_id.encode("utf-8")) for product_id in product_ids),
+            dtype=np.uint64, count=len(product_ids)
+        )
+
+    def generate_arrays(self, product_ids, days, start=None):
+        """
+        Generate mock inventory numbers and forecasts as arrays.
+
+        Args:
+            product_ids (list): Product IDs to generate data for
+            days (int): Number of forecast days
+            start (date): First forecast date (default: today)
+
+        Returns:
+            dict: Arrays "reorder_point", "safety_stock", "current_stock" and
+                  "base_demand" of shape (n,), "forecast", "lower_bound" and
+                  "upper_bound" of shape (n, days), and "dates" of shape (days,)
+        """
+        start = start or date.today()
+        keys = self.product_keys(product_ids)
+
+        reorder_point = 450 + (_uniform(keys, self.STREAM_REORDER) * 101).astype(np.int64)
+        safety_stock = 2 + (_uniform(keys, self.STREAM_SAFETY) * 9).astype(np.int64)
+        current_stock = reorder_point - 50 + (_uniform(keys, self.STREAM_STOCK) * 151).astype(np.int64)
+        base_demand = 80 + (_uniform(keys, self.STREAM_DEMAND) * 41).astype(np.int64)
+
+        # Trend of up to +/-0.3 units per day and weekly seasonality of up to 15%
+        trend = (_uniform(keys, self.STREAM_TREND) - 0.5) * 0.6
+        amplitude = _uniform(keys, self.STREAM_SEASON) * 0.15
+
+        ordinals = np.arange(start.toordinal(), start.toordinal() + days, dtype=np.uint64)
+        weekday = (ordinals % np.uint64(7)).astype(np.float64)
+        season = np.sin(2 * np.pi * weekday / 7)
+
+        # Noise in [-20, 20] keyed by (product, date)
+        day_keys = _splitmix64(keys[:, None] ^ _splitmix64(ordinals)[None, :])
+        noise = np.floor(_uniform(day_keys, self.STREAM_NOISE) * 41) - 20
+
+        steps = np.arange(days, dtype=np.float64)
+        forecast = (base_demand[:, None] * (1 + amplitude[:, None] * season[None, :])
+                    + trend[:, None] * steps[None, :] + noise)
+        forecast = np.maximum(np.rint(forecast), 0).astype(np.int64)
+
+        dates = np.arange(np.datetime64(start, "D"), np.datetime64(start, "D") + days)
+
+        return {
+            "reorder_point": reorder_point,
+            "safety_stock": safety_stock,
+            "current_stock": current_stock,
+            "base_demand": base_demand,
+            "forecast": forecast,
+            "lower_bound": (forecast * 0.8).astype(np.int64),
+            "upper_bound": (forecast * 1.2).astype(np.int64),
+            "dates": dates,
+        }
+
+    def generate_many(self, product_ids, days, start=None, compact=False):
+        """
+        Generate mock API responses for many products at once.
+
+        Args:
+            product_ids (list): Product IDs to generate data for
+            days (int): Number of forecast days
+            start (date): First forecast date (default: today)
+            compact (bool): Return "Forecast" as a CompactForecast instead of the
+                API's dict layout (default: False)
+
+        Returns:
+            dict: Product ID -> mock API response
+        """
+        start = start or date.today()
+        arrays = self.generate_arrays(product_ids, days, start)
+        if compact:
+            forecasts, lower_bounds, upper_bounds = (arrays[field].astype(np.int32)
+                                                     for field in ("forecast", "lower_bound", "upper_bound"))
+        else:
+            date_strings = arrays["dates"].astype(str).tolist()
+
+        responses = {}
+        for index, product_id in enumerate(product_ids):
+            reorder_point = int(arrays["reorder_point"][index])
+            safety_stock = int(arrays["safety_stock"][index])
+            current_stock = int(arrays["current_stock"][index])
+            base_demand = int(arrays["base_demand"][index])
+
+            if compact:
+                forecast = CompactForecast(start, forecasts[index], lower_bounds[index], upper_bounds[index])
+            else:
+                forecast = {
+                    date_str: {"forecast": value, "lower_bound": lower, "upper_bound": upper}
+                    for date_str, value, lower, upper in zip(
+                        date_strings,
+                        arrays["forecast"][index].tolist(),
+                        arrays["lower_bound"][index].tolist(),
+                        arrays["upper_bound"][index].tolist(),
+                    )
+                }
+
+            # Generate warnings based on stock levels
+            warnings = []
+            days_to_reorder = (current_stock - safety_stock) / base_demand
+            if days_to_reorder < days:
+                warnings.append(f"Stock will reach reorder point in approximately {int(days_to_reorder)} days")
+            if current_stock < reorder_point:
+                warnings.append("Current stock is below reorder point")
+
+            responses[product_id] = {
+                "Reorder Point": reorder_point,
+                "Safety Stock": safety_stock,
+                "Current Stock": current_stock,
+                "Forecast": forecast,
+                "Warnings": warnings
+            }
+        return responses
+
+    def generate(self, product_id, days, start=None, compact=False):
+        """
+        Generate a mock API response for one product.
+
+        Args:
+            product_id (str): The product ID for the mock data
+            days (int): Number of forecast days
+            start (date): First forecast date (default: today)
+            compact (bool): Return "Forecast" as a CompactForecast (default: False)
+
+        Returns:
+            dict: Mock API response
+        """
+        return self.generate_many([product_id], days, start, compact)[product_id]
@@ -0,0 +1,316 @@
+"""
+Reorder scan over a whole SKU catalog.
+
+Reads product IDs from a CSV file, fetches their forecasts with bounded
+parallelism, computes reorder and stock-out dates for each chunk with NumPy
+and writes a CSV report ranked by urgency. Memory use depends on the chunk
+size, not on the size of the catalog: every chunk is sorted and written to a
+temporary run file, and the runs are merged into the final report.
+
+    python portfolio_scan.py skus.csv -o reorder_report.csv --days 30
+"""
+import argparse
+import csv
+import heapq
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+
+import numpy as np
+
+from admission import BATCH
+from compact_forecast import CompactForecast
+from forecast_result import reorder_status
+from inventory_assistant import InventoryAssistant
+
+
+REPORT_FIELDS = [
+    "rank", "product_id", "status", "current_stock", "reorder_point", "safety_stock",
+    "days_to_reorder", "reorder_date", "days_to_stockout", "stockout_date", "forecast_demand", "source",
+]
+
+# Report order: most urgent first, products without data last
+STATUS_RANK = {"order_now": 0, "order_soon": 1, "ok": 2, None: 3}
+
+
+def read_skus(path, column="product_id"):
+    """
+    Yield product IDs from a CSV file one at a time.
+
+    Uses the `column` header if the file has one, otherwise the first column
+    of every row. Blank IDs are skipped.
+
+    Args:
+        path (str): CSV file
+        column (str): Header of the product ID column (default: "product_id")
+
+    Yields:
+        str: Upper-cased product ID
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        first = next(reader, None)
+        if first is None:
+            return
+        index = 0
+        if column in first:
+            index = first.index(column)
+        elif first and first[0].strip():
+            yield first[0].strip().upper()
+
+        for row in reader:
+            if len(row) > index and row[index].strip():
+                yield row[index].strip().upper()
+
+
+def chunked(iterable, size):
+    """Yield lists of up to `size` items."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def reorder_metrics(responses, days):
+    """
+    Compute reorder and stock-out estimates for a chunk of responses.
+
+    Stock is projected forward by subtracting the cumulative daily forecast.
+    The reorder day is the first day the projection reaches the reorder
+    point (0 if it already has), the stock-out day the first day it reaches
+    zero. Both are -1 if that doesn't happen within the forecast horizon.
+
+    Args:
+        responses (list): (product_id, response) pairs
+        days (int): Number of forecast days requested
+
+    Returns:
+        list: Report rows (dicts) without rank, in the order given
+    """
+    n = len(responses)
+    current_stock = np.full(n, np.nan)
+    reorder_point = np.full(n, np.nan)
+    demand = np.zeros((n, days))
+    start_dates = []
+
+    for i, (_, response) in enumerate(responses):
+        stock = response.get("Current Stock")
+        point = response.get("Reorder Point")
+        if isinstance(stock, (int, float)) and isinstance(point, (int, float)):
+            current_stock[i] = stock
+            reorder_point[i] = point
+
+        forecast = response.get("Forecast") or {}
+        if isinstance(forecast, CompactForecast):
+            # Copied straight from the array, no per-day lookups
+            values = forecast.forecast[:days]
+            start_dates.append(forecast.start.isoformat() if len(values) else None)
+        else:
+            dates = sorted(forecast)[:days]
+            start_dates.append(dates[0] if dates else None)
+            values = [forecast[date_str].get("forecast") for date_str in dates]
+            values = [v if isinstance(v, (int, float)) else 0 for v in values]
+        demand[i, :len(values)] = values
+
+    projected = current_stock[:, None] - np.cumsum(demand, axis=1)
+    reorder_day = _first_day(np.concatenate([current_stock[:, None], projected], axis=1) <= reorder_point[:, None])
+    stockout_day = _first_day(np.concatenate([current_stock[:, None], projected], axis=1) <= 0)
+    total_demand = demand.sum(axis=1)
+
+    rows = []
+    for i, (product_id, response) in enumerate(responses):
+        known = not np.isnan(current_stock[i])
+        start = date.fromisoformat(start_dates[i]) if start_dates[i] else None
+        rows.append({
+            "product_id": product_id,
+            # Classified on the unrounded numbers, like the chat answer; ints are for the report only
+            "status": reorder_status(current_stock[i].item(), reorder_point[i].item()) if known else None,
+            "current_stock": int(current_stock[i]) if known else "",
+            "reorder_point": int(reorder_point[i]) if known else "",
+            "safety_stock": response.get("Safety Stock", ""),
+            "days_to_reorder": int(reorder_day[i]) if known else -1,
+            "reorder_date": _day_to_date(start, reorder_day[i]) if known else "",
+            "days_to_stockout": int(stockout_day[i]) if known else -1,
+            "stockout_date": _day_to_date(start, stockout_day[i]) if known else "",
+            "forecast_demand": int(round(total_demand[i])),
+            "source": _source(response),
+        })
+    return rows
+
+
+def urgency_key(row):
+    """Sort key: status, then earliest reorder day, earliest stock-out day, product ID."""
+    def day(value):
+        value = int(value)
+        return value if value >= 0 else float("inf")
+
+    status = row["status"] or None
+    return (STATUS_RANK[status], day(row["days_to_reorder"]), day(row["days_to_stockout"]), row["product_id"])
+
+
+class PortfolioScanner:
+    """
+    Scan a SKU catalog for products that need reordering.
+
+    Forecasts are fetched through the assistant's call_api (so caching,
+    circuit breaker and fallbacks apply) with at most `workers` requests in
+    flight at once.
+    """
+
+    def __init__(self, assistant, days=30, workers=16, chunk_size=5000):
+        """
+        Args:
+            assistant (InventoryAssistant): Assistant used to fetch forecasts
+            days (int): Forecast horizon in days (default: 30)
+            workers (int): Maximum concurrent API calls (default: 16)
+            chunk_size (int): Products per sorted run (default: 5000)
+        """
+        self.assistant = assistant
+        self.days = days
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+    def iter_forecasts(self, product_ids):
+        """
+        Fetch forecasts keeping at most `workers` calls in flight.
+
+        Args:
+            product_ids (iterable): Product IDs, consumed lazily
+
+        Yields:
+            tuple: (product_id, response) in completion order
+        """
+        product_ids = iter(product_ids)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = {}
+            for product_id in product_ids:
+                pending[executor.submit(self.assistant.call_api, product_id, self.days, BATCH)] = product_id
+                if len(pending) >= self.workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future.result()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+
+    def scan(self, product_ids, output_path):
+        """
+        Scan products and write the ranked report.
+
+        Args:
+            product_ids (iterable): Product IDs, consumed lazily
+            output_path (str): CSV report to write
+
+        Returns:
+            dict: Summary with product counts per status, source counts and timing
+        """
+        start = time.perf_counter()
+        summary = {"products": 0, "status": {}, "source": {}}
+        run_dir = tempfile.mkdtemp(prefix="portfolio_scan_")
+        try:
+            runs = []
+            for chunk in chunked(self.iter_forecasts(product_ids), self.chunk_size):
+                rows = reorder_metrics(chunk, self.days)
+                rows.sort(key=urgency_key)
+                runs.append(self._write_run(run_dir, len(runs), rows))
+                for row in rows:
+                    status = row["status"] or "unknown"
+                    summary["status"][status] = summary["status"].get(status, 0) + 1
+                    summary["source"][row["source"]] = summary["source"].get(row["source"], 0) + 1
+                summary["products"] += len(rows)
+
+            self._merge_runs(runs, output_path)
+        finally:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+        summary["seconds"] = time.perf_counter() - start
+        summary["products_per_second"] = summary["products"] / summary["seconds"] if summary["seconds"] else 0.0
+        return summary
+
+    def scan_csv(self, input_path, output_path, column="product_id"):
+        """Scan the product IDs listed in a CSV file (see read_skus)."""
+        return self.scan(read_skus(input_path, column), output_path)
+
+    def _write_run(self, run_dir, index, rows):
+        path = os.path.join(run_dir, f"run_{index:05d}.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS[1:])
+            writer.writerows(rows)
+        return path
+
+    def _merge_runs(self, runs, output_path):
+        files = [open(path, newline="", encoding="utf-8") for path in runs]
+        try:
+            readers = [csv.DictReader(f, fieldnames=REPORT_FIELDS[1:]) for f in files]
+            with open(output_path, "w", newline="", encoding="utf-8") as out:
+                writer = csv.DictWriter(out, fieldnames=REPORT_FIELDS)
+                writer.writeheader()
+                for rank, row in enumerate(heapq.merge(*readers, key=urgency_key), start=1):
+                    row["rank"] = rank
+                    writer.writerow(row)
+        finally:
+            for f in files:
+                f.close()
+
+
+def _first_day(mask):
+    """Index of the first True in each row, -1 where there is none."""
+    first = mask.argmax(axis=1)
+    return np.where(mask.any(axis=1), first, -1)
+
+
+def _day_to_date(start, day):
+    # Day 0 is "now"; day k is the end of the k-th forecast day
+    if start is None or day < 0:
+        return ""
+    return (start + timedelta(days=max(int(day) - 1, 0))).isoformat()
+
+
+def _source(response):
+    if "error" in response:
+        return "error"
+    if response.get("Stale"):
+        return "stale"
+    if response.get("Note"):
+        return "mock"
+    return "api"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank a SKU catalog by reorder urgency")
+    parser.add_argument("input", help="CSV file with product IDs")
+    parser.add_argument("-o", "--output", default="reorder_report.csv", help="CSV report to write")
+    parser.add_argument("--column", default="product_id", help="product ID column header")
+    parser.add_argument("--days", type=int, default=30, help="forecast horizon")
+    parser.add_argument("--workers", type=int, default=16, help="concurrent API calls")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="products per sorted run")
+    parser.add_argument("--api-url", help="forecast API endpoint (default: the Render deployment)")
+    parser.add_argument("--rate-limit", type=float, metavar="RPS", help="maximum forecast API requests per second")
+    args = parser.parse_args()
+
+    assistant = InventoryAssistant(api_url=args.api_url, pool_size=args.workers, rate_limit=args.rate_limit)
+    scanner = PortfolioScanner(assistant, days=args.days, workers=args.workers, chunk_size=args.chunk_size)
+    summary = scanner.scan_csv(args.input, args.output, column=args.column)
+    assistant.close()
+
+    print(f"Scanned {summary['products']} products in {summary['seconds']:.1f} s "
+          f"({summary['products_per_second']:.0f} products/s)")
+    for status in ("order_now", "order_soon", "ok", "unknown"):
+        if status in summary["status"]:
+            print(f"  {status}: {summary['status'][status]}")
+    if summary["source"].get("mock") or summary["source"].get("stale"):
+        print(f"  Note: {summary['source'].get('mock', 0)} mock and {summary['source'].get('stale', 0)} "
+              "stale forecasts were used because the API was unavailable")
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from admission import BACKGROUND, AdmissionRejected
+
+
+class PrefetchScheduler:
+    """
+    Background refresh-ahead for the most frequently queried products.
+
+    The assistant reports every forecast lookup with record(). Every
+    `interval` seconds the top-N products by (decaying) query count whose
+    cache entry is missing or due to expire within `refresh_ahead` seconds
+    are refreshed on a small worker pool, at most `rate_limit` requests per
+    second, so users asking about them find a fresh cache entry.
+    """
+
+    def __init__(self, assistant, top_n=20, interval=30, refresh_ahead=None, workers=2,
+                 rate_limit=2, decay=0.5):
+        """
+        Args:
+            assistant (InventoryAssistant): Assistant whose cache is refreshed
+            top_n (int): Number of hottest products kept fresh (default: 20)
+            interval (float): Seconds between scheduling passes (default: 30)
+            refresh_ahead (float): Refresh entries this many seconds before they
+                expire (default: twice the interval)
+            workers (int): Maximum concurrent refresh requests (default: 2)
+            rate_limit (float): Maximum refresh requests per second (default: 2)
+            decay (float): Factor applied to query counts after each pass, so
+                products that stop being asked about cool down (default: 0.5)
+        """
+        self.assistant = assistant
+        self.top_n = top_n
+        self.interval = interval
+        self.refresh_ahead = 2 * interval if refresh_ahead is None else refresh_ahead
+        self.rate_limit = rate_limit
+        self.decay = decay
+
+        self._counts = {}      # product_id -> decayed query count
+        self._horizons = {}    # product_id -> longest requested days
+        self._prefetched = set()  # products whose cached forecast came from a refresh
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.queries = 0
+        self.prefetched_hits = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.refresh_rejections = 0
+        self.refresh_seconds = 0.0
+        self.passes = 0
+
+    def start(self):
+        """Start the scheduling thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="prefetch-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop scheduling and wait for running refreshes to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._executor.shutdown(wait=True)
+
+    def record(self, product_id, days, cache_hit):
+        """
+        Count a forecast lookup.
+
+        Args:
+            product_id (str): The product ID
+            days (int): Number of forecast days requested
+            cache_hit (bool): Whether the lookup was answered from the cache
+        """
+        with self._lock:
+            self.queries += 1
+            self._counts[product_id] = self._counts.get(product_id, 0) + 1
+            if days > self._horizons.get(product_id, 0):
+                self._horizons[product_id] = days
+            if cache_hit and product_id in self._prefetched:
+                self.prefetched_hits += 1
+
+    def forget_prefetched(self, product_id):
+        """Mark a product's cached forecast as fetched by a user query."""
+        with self._lock:
+            self._prefetched.discard(product_id)
+
+    def hot_products(self):
+        """
+        Returns:
+            list: (product_id, days) of the top-N products, hottest first
+        """
+        with self._lock:
+            ranked = sorted(self._counts, key=self._counts.get, reverse=True)[:self.top_n]
+            return [(product_id, self._horizons[product_id]) for product_id in ranked]
+
+    def due(self):
+        """
+        Returns:
+            list: Hot (product_id, days) whose cache entry is missing or expiring soon
+        """
+        cache = self.assistant.cache
+        threshold = cache.ttl - self.refresh_ahead
+        due = []
+        for product_id, days in self.hot_products():
+            age = cache.age(product_id, days)
+            if age is None or age >= threshold:
+                due.append((product_id, days))
+        return due
+
+    def run_pass(self):
+        """Schedule refreshes for due products, paced by the rate limit."""
+        spacing = 1 / self.rate_limit if self.rate_limit else 0
+        for product_id, days in self.due():
+            if self._stop.is_set():
+                break
+            with self._lock:
+                if product_id in self._pending:
+                    continue
+                self._pending.add(product_id)
+            self._executor.submit(self.refresh, product_id, days)
+            if spacing:
+                self._stop.wait(spacing)
+
+        with self._lock:
+            self.passes += 1
+            for product_id in list(self._counts):
+                self._counts[product_id] *= self.decay
+                if self._counts[product_id] < 0.1:
+                    del self._counts[product_id]
+                    del self._horizons[product_id]
+
+    def refresh(self, product_id, days):
+        """Fetch a forecast from the API into the cache, bypassing the cache."""
+        assistant = self.assistant
+        start = time.perf_counter()
+        try:
+            allowed = assistant.breaker.allow_request()
+            if not allowed:
+                return
+            try:
+                data = assistant.fetch_forecast(product_id, days, BACKGROUND)
+            except requests.exceptions.RequestException as e:
+                assistant.record_api_error(e)
+                with self._lock:
+                    self.refresh_failures += 1
+                return
+            except AdmissionRejected:
+                # The rate limit is taken by user queries; try again on a later pass
+                assistant.breaker.release_trial(allowed)
+                with self._lock:
+                    self.refresh_rejections += 1
+                return
+            assistant.store_forecast(product_id, days, data)
+            with self._lock:
+                self.refreshes += 1
+                self._prefetched.add(product_id)
+        finally:
+            with self._lock:
+                self.refresh_seconds += time.perf_counter() - start
+                self._pending.discard(product_id)
+
+    def stats(self):
+        """Return prefetch counters as a dict."""
+        with self._lock:
+            return {
+                "tracked_products": len(self._counts),
+                "queries": self.queries,
+                "prefetched_hits": self.prefetched_hits,
+                "refreshes": self.refreshes,
+                "refresh_failures": self.refresh_failures,
+                "refresh_rejections": self.refresh_rejections,
+                "refresh_seconds": round(self.refresh_seconds, 3),
+                "passes": self.passes,
+            }
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.run_pass()
@@ -0,0 +1,190 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+
+ParsedQuery = namedtuple("ParsedQuery", ["product_id", "product_ids", "days", "intent"])
+ParsedQuery.__doc__ = """
+Structured result of QueryParser.parse.
+
+Attributes:
+    product_id (str): Main product ID, or None if the query names none
+    product_ids (tuple): All product IDs for the query (several for multi-product queries)
+    days (int): Forecast horizon in days
+    intent (str): "reorder", "forecast", "stock" or "general"
+"""
+
+
+class QueryParser:
+    """
+    Extracts product IDs, forecast horizon and intent from user queries.
+
+    All patterns are compiled once and the query is lower-cased once. The
+    product ID patterns are tried in priority order and each stops at its
+    first match; patterns that need a keyword are skipped with a cheap
+    substring check when the keyword is absent. Results are memoized per
+    query string, since load-generating clients repeat the same queries.
+    """
+
+    DEFAULT_DAYS = 7
+
+    # Look for product_id=X pattern first (most explicit)
+    EXPLICIT_PATTERN = re.compile(r'product_id[=\s:]+([a-zA-Z0-9]+)')
+
+    # Match product IDs that follow patterns like P001, SKU123, etc. in natural language,
+    # in priority order. The first pattern with a match wins.
+    PRODUCT_PATTERNS = (
+        # Product followed by ID - e.g., "product P001", "for P001", "of P001"
+        re.compile(r'(?:for|product|item|sku|of|on|about)\s+([A-Za-z][A-Za-z0-9]{2,})'),
+        # IDs with prefixes - e.g., "P-001", "SKU-123"
+        re.compile(r'(?:[A-Za-z]+[-:]([0-9]{3,}))'),
+        # Standard product IDs - e.g., "P001", "SKU123"
+        re.compile(r'\b([A-Za-z][0-9]{3,})\b'),
+        # Any alphanumeric string that looks like a product ID
+        re.compile(r'\b([A-Za-z][A-Za-z0-9]{2,})\b'),
+    )
+
+    # A query that is just a product ID (e.g., "P001")
+    BARE_ID_PATTERN = re.compile(r'[a-zA-Z0-9]+')
+
+    # Product IDs made of letters followed by digits (P001, SKU123) for multi-product queries
+    MULTI_PRODUCT_PATTERN = re.compile(r'\b([A-Za-z]+[0-9]{3,}[A-Za-z0-9]*)\b')
+
+    # Time periods; when several appear, the one listed first wins
+    TIME_PERIODS = {
+        'day': 1,
+        'tomorrow': 1,
+        'week': 7,
+        'month': 30,
+        'quarter': 90
+    }
+
+    # Intent keywords; the first one found in this order wins
+    INTENT_KEYWORDS = (
+        ('reorder', 'reorder'),
+        ('restock', 'reorder'),
+        ('order', 'reorder'),
+        ('forecast', 'forecast'),
+        ('demand', 'forecast'),
+        ('predict', 'forecast'),
+        ('stock', 'stock'),
+        ('inventory', 'stock'),
+    )
+
+    # Check for specific number of days
+    DAYS_PATTERN = re.compile(r'(\d+)[\s-]*(?:day|days)')
+
+    def __init__(self, cache_size=4096):
+        """
+        Args:
+            cache_size (int): Number of distinct queries to memoize (0 disables memoization)
+        """
+        self._parse_cached = lru_cache(maxsize=cache_size)(self._parse) if cache_size else self._parse
+
+    def parse(self, query):
+        """
+        Parse a user query.
+
+        Args:
+            query (str): User query about inventory
+
+        Returns:
+            ParsedQuery: Extracted product IDs, days and intent
+        """
+        return self._parse_cached(query)
+
+    def _parse(self, query):
+        """
+        Parse a user query without memoization.
+
+        Args:
+            query (str): User query about inventory
+
+        Returns:
+            ParsedQuery: Extracted product IDs, days and intent
+        """
+        product_id = self.find_product_id(query)
+        lowered = query.lower()
+        days = self.find_days(lowered)
+        intent = self.find_intent(lowered)
+
+        product_ids = self.find_product_ids(query)
+        if len(product_ids) < 2:
+            product_ids = (product_id,) if product_id else ()
+
+        return ParsedQuery(product_id, product_ids, days, intent)
+
+    def find_product_id(self, query):
+        """
+        Find the main product ID in a query.
+
+        Args:
+            query (str): User query about inventory
+
+        Returns:
+            str: Upper-cased product ID, or None if not found
+        """
+        if 'product_id' in query:
+            match = self.EXPLICIT_PATTERN.search(query)
+            if match:
+                return match.group(1).upper()
+
+        for pattern in self.PRODUCT_PATTERNS:
+            match = pattern.search(query)
+            if match:
+                # Take the first match
+                return match.group(1).upper()
+
+        # If still not found, check if query itself is just a product ID (e.g., "P001")
+        stripped = query.strip()
+        if self.BARE_ID_PATTERN.fullmatch(stripped):
+            return stripped.upper()
+        return None
+
+    def find_product_ids(self, query):
+        """
+        Find all product IDs mentioned in a query.
+
+        Args:
+            query (str): User query about inventory
+
+        Returns:
+            tuple: Distinct upper-cased product IDs in order of appearance
+        """
+        return tuple(dict.fromkeys(match.upper() for match in self.MULTI_PRODUCT_PATTERN.findall(query)))
+
+    def find_days(self, lowered):
+        """
+        Find the forecast horizon in a lower-cased query.
+
+        Args:
+            lowered (str): Lower-cased user query
+
+        Returns:
+            int: Number of days to forecast
+        """
+        # A specific number of days overrides any time period
+        if 'day' in lowered:
+            match = self.DAYS_PATTERN.search(lowered)
+            if match:
+                return int(match.group(1))
+
+        for period, days in self.TIME_PERIODS.items():
+            if period in lowered:
+                return days
+        return self.DEFAULT_DAYS
+
+    def find_intent(self, lowered):
+        """
+        Classify what the user is asking about.
+
+        Args:
+            lowered (str): Lower-cased user query
+
+        Returns:
+            str: "reorder", "forecast", "stock" or "general"
+        """
+        for keyword, intent in self.INTENT_KEYWORDS:
+            if keyword in lowered:
+                return intent
+        return "general"
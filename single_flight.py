@@ -0,0 +1,111 @@
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls that share a key.
+
+    The first caller for a key runs the function; callers that arrive while it
+    is still running wait for it and receive the same result (or exception).
+    Nothing is remembered once the call finishes, so this is not a cache.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args):
+        """
+        Run func(*args), or wait for the in-flight call with the same key.
+
+        Args:
+            key: Hashable key identifying identical calls
+            func (callable): Function to run if no call is in flight
+
+        Returns:
+            The value returned by the call that ran
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._in_flight.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._in_flight[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """Call counters as a dict."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+            }
+
+
+class AsyncSingleFlight(SingleFlight):
+    """SingleFlight for coroutines running on one event loop."""
+
+    async def do(self, key, func, *args):
+        """
+        Await func(*args), or the in-flight call with the same key.
+
+        Args:
+            key: Hashable key identifying identical calls
+            func (callable): Coroutine function to run if no call is in flight
+
+        Returns:
+            The value returned by the call that ran
+        """
+        # Only async users pay for importing asyncio
+        import asyncio
+
+        self.calls += 1
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # shield: a cancelled waiter must not cancel the shared call
+            return await asyncio.shield(future)
+
+        self.executions += 1
+        future = self._in_flight[key] = asyncio.ensure_future(func(*args))
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self._in_flight.pop(key, None)
+            else:
+                future.add_done_callback(lambda _: self._in_flight.pop(key, None))